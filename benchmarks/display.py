@@ -0,0 +1,100 @@
+"""
+Display boot time and memory: the full app vs the /display/{code} page.
+
+Creates a session, then opens a display both ways under CPU throttling
+(to approximate a cheap smart-TV browser):
+
+- full: index.html -> enter code -> "Display Screen" (Alpine + whole app)
+- light: /display/{code}
+
+"Ready" is the moment the display shows the connected indicator. Memory is
+the JS heap reported by the DevTools protocol after the display has joined.
+
+    python benchmarks/display.py --cpu-slowdown 6 --runs 5
+
+Requires the dev extras and `playwright install chromium`.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+
+import httpx
+from playwright.sync_api import sync_playwright
+
+from tti import PROFILES, start_server
+
+
+def open_display(browser, url: str, code: str, variant: str, cpu_slowdown: float, network: dict) -> dict:
+    context = browser.new_context(locale="en-US")
+    page = context.new_page()
+    cdp = context.new_cdp_session(page)
+    cdp.send("Network.enable")
+    cdp.send("Network.emulateNetworkConditions", {"offline": False, **network})
+    cdp.send("Emulation.setCPUThrottlingRate", {"rate": cpu_slowdown})
+    cdp.send("Performance.enable")
+
+    if variant == "full":
+        page.goto(url)
+        page.locator('[x-model="joinCode"]').fill(code)
+        page.get_by_role("button", name="Join Session").click()
+        page.locator(".role-btn", has_text="Display Screen").click()
+        page.locator(".display-full .conn-dot.connected").wait_for(state="attached", timeout=60_000)
+    else:
+        page.goto(f"{url}/display/{code}")
+        page.locator("#conn-dot.connected").wait_for(state="attached", timeout=60_000)
+    ready_ms = page.evaluate("performance.now()")
+
+    metrics = {m["name"]: m["value"] for m in cdp.send("Performance.getMetrics")["metrics"]}
+    transferred = page.evaluate(
+        "performance.getEntriesByType('resource').reduce((n, r) => n + r.transferSize,"
+        " performance.getEntriesByType('navigation')[0].transferSize)"
+    )
+    context.close()
+    return {
+        "ready_ms": ready_ms,
+        "js_heap_bytes": metrics.get("JSHeapUsedSize"),
+        "dom_nodes": metrics.get("Nodes"),
+        "transferred_bytes": transferred,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="Measure a running server instead of starting one")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="fast")
+    parser.add_argument("--cpu-slowdown", type=float, default=6.0)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", dest="json_path", help="Also write raw results to this file")
+    args = parser.parse_args()
+
+    url = args.url or start_server()
+    code = httpx.post(f"{url}/api/sessions", json={"name": "Display benchmark"}).json()["session_code"]
+
+    results = {"full": [], "light": []}
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        for _ in range(args.runs):
+            for variant in results:
+                results[variant].append(
+                    open_display(browser, url, code, variant, args.cpu_slowdown, PROFILES[args.profile])
+                )
+        browser.close()
+
+    print(f"{args.runs} runs, {args.profile} network, {args.cpu_slowdown:g}x CPU slowdown")
+    for variant, runs in results.items():
+        print(
+            f"  {variant:<5} ready {statistics.median(r['ready_ms'] for r in runs):7.0f} ms"
+            f"  heap {statistics.median(r['js_heap_bytes'] for r in runs) / 1024 / 1024:5.1f} MiB"
+            f"  {statistics.median(r['dom_nodes'] for r in runs):5.0f} nodes"
+            f"  {runs[-1]['transferred_bytes'] / 1024:6.1f} KiB"
+        )
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"profile": args.profile, "cpu_slowdown": args.cpu_slowdown, "runs": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+Micro-benchmarks for the SessionManager and ConnectionManager hot paths.
+
+Each benchmark sets up its own state and times only the operation under
+test; it is repeated and the median time per operation is reported.
+Snapshot and expiry scans are whole-table operations, so they are
+reported per session in the table.
+Results are written as JSON with the commit they were measured on, and
+--compare flags operations that got slower than a baseline file.
+
+    python benchmarks/hotpaths.py --json before.json
+    git checkout my-branch
+    python benchmarks/hotpaths.py --json after.json --compare before.json
+    python benchmarks/hotpaths.py --compare before.json after.json   # no new run
+
+--compare exits with status 1 when a regression beyond --threshold is found.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from functools import partial
+
+from iron_verdict.connection import ConnectionManager
+from iron_verdict.session import SessionManager
+
+
+class Timer:
+    """Accumulates the time spent inside `with timer:` blocks."""
+
+    def __init__(self):
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed += time.perf_counter() - self._start
+        return False
+
+
+class NullSocket:
+    """Stands in for a WebSocket; sending costs nothing, so only the manager is measured."""
+
+    async def send_json(self, message):
+        pass
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+async def populated(n: int) -> SessionManager:
+    manager = SessionManager()
+    for i in range(n):
+        await manager.create_session(f"Platform {i}")
+    return manager
+
+
+async def bench_create_session(timer: Timer, existing: int, n: int = 2000) -> int:
+    manager = await populated(existing)
+    with timer:
+        for i in range(n):
+            await manager.create_session("Platform")
+    return n
+
+
+async def bench_generate_code(timer: Timer, existing: int, n: int = 20000) -> int:
+    manager = await populated(existing)
+    with timer:
+        for _ in range(n):
+            manager.generate_session_code()
+    return n
+
+
+async def bench_vote_cycle(timer: Timer, existing: int = 10_000, n: int = 5000) -> int:
+    """Three lock_votes and a reset_for_next_lift per cycle."""
+    manager = await populated(existing)
+    code = next(iter(manager.sessions))
+    for role in ("left_judge", "center_judge", "right_judge"):
+        manager.join_session(code, role)
+    with timer:
+        for _ in range(n):
+            await manager.lock_vote(code, "left", "white")
+            await manager.lock_vote(code, "center", "red")
+            await manager.lock_vote(code, "right", "white")
+            await manager.reset_for_next_lift(code)
+    return n
+
+
+async def bench_join(timer: Timer, existing: int = 10_000, n: int = 5000) -> int:
+    """join_session plus building the join_success state, as the WebSocket handler does."""
+    from iron_verdict import main
+
+    manager = await populated(existing)
+    saved = main.session_manager
+    main.session_manager = manager
+    try:
+        code = next(iter(manager.sessions))
+        judge = manager.sessions[code]["judges"]["left"]
+        with timer:
+            for _ in range(n):
+                manager.join_session(code, "left_judge")
+                main.join_state(code)
+                judge["connected"] = False
+    finally:
+        main.session_manager = saved
+    return n
+
+
+async def bench_save_snapshot(timer: Timer, existing: int) -> int:
+    manager = await populated(existing)
+    with tempfile.TemporaryDirectory() as directory:
+        with timer:
+            manager.save_snapshot(os.path.join(directory, "sessions.json"))
+    return existing
+
+
+async def bench_load_snapshot(timer: Timer, existing: int) -> int:
+    manager = await populated(existing)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sessions.json")
+        manager.save_snapshot(path)
+        fresh = SessionManager()
+        with timer:
+            fresh.load_snapshot(path)
+    return existing
+
+
+async def bench_expired_sessions(timer: Timer, existing: int) -> int:
+    manager = await populated(existing)
+    stale = datetime.now() - timedelta(hours=5)
+    for i, session in enumerate(manager.sessions.values()):
+        if i % 10 == 0:
+            session["last_activity"] = stale
+    with timer:
+        manager.get_expired_sessions(4)
+    return existing
+
+
+async def bench_broadcast(timer: Timer, helper: str, displays: int, n: int = 5000) -> int:
+    manager = ConnectionManager()
+    judges = {role: NullSocket() for role in ("left_judge", "center_judge", "right_judge")}
+    for role, ws in judges.items():
+        await manager.add_connection("BENCH", role, ws)
+    for i in range(displays):
+        await manager.add_connection("BENCH", f"display_{i}", NullSocket())
+    message = {"type": "judge_voted", "position": "left"}
+    if helper == "broadcast_to_session":
+        send = partial(manager.broadcast_to_session, "BENCH", message)
+    elif helper == "send_to_displays":
+        send = partial(manager.send_to_displays, "BENCH", message)
+    elif helper == "broadcast_to_others":
+        send = partial(manager.broadcast_to_others, "BENCH", judges["left_judge"], message)
+    else:
+        send = partial(manager.send_to_role, "BENCH", "center_judge", message)
+    with timer:
+        for _ in range(n):
+            await send()
+    return n
+
+
+BENCHMARKS = {
+    "create_session[10k]": partial(bench_create_session, existing=10_000),
+    "create_session[100k]": partial(bench_create_session, existing=100_000),
+    "generate_session_code[10k]": partial(bench_generate_code, existing=10_000),
+    "generate_session_code[100k]": partial(bench_generate_code, existing=100_000),
+    "lock_vote+reset_for_next_lift": bench_vote_cycle,
+    "join_session+join_state": bench_join,
+    "save_snapshot[10k]": partial(bench_save_snapshot, existing=10_000),
+    "save_snapshot[100k]": partial(bench_save_snapshot, existing=100_000),
+    "load_snapshot[10k]": partial(bench_load_snapshot, existing=10_000),
+    "load_snapshot[100k]": partial(bench_load_snapshot, existing=100_000),
+    "get_expired_sessions[100k]": partial(bench_expired_sessions, existing=100_000),
+    "broadcast_to_session[3+4]": partial(bench_broadcast, helper="broadcast_to_session", displays=4),
+    "broadcast_to_session[3+20]": partial(bench_broadcast, helper="broadcast_to_session", displays=20),
+    "send_to_displays[20]": partial(bench_broadcast, helper="send_to_displays", displays=20),
+    "broadcast_to_others[3+4]": partial(bench_broadcast, helper="broadcast_to_others", displays=4),
+    "send_to_role": partial(bench_broadcast, helper="send_to_role", displays=4),
+}
+
+
+def run(names, repeat: int) -> dict:
+    results = {}
+    for name in names:
+        per_op = []
+        for _ in range(repeat):
+            timer = Timer()
+            ops = asyncio.run(BENCHMARKS[name](timer))
+            per_op.append(timer.elapsed / ops)
+        median = statistics.median(per_op)
+        results[name] = {
+            "us_per_op": round(median * 1e6, 3),
+            "min_us_per_op": round(min(per_op) * 1e6, 3),
+            "ops_per_s": round(1 / median) if median else None,
+            "repeat": repeat,
+        }
+        print(f"{name:<32} {results[name]['us_per_op']:>12.3f} µs/op  {results[name]['ops_per_s']:>12,} ops/s")
+    return results
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> bool:
+    """Print a comparison table. True if any benchmark is slower than baseline by more than `threshold`."""
+    regressed = False
+    print(f"\n{'benchmark':<32} {'baseline':>12} {'current':>12} {'change':>9}")
+    print(f"{'':<32} {baseline.get('commit') or '?':>12} {current.get('commit') or '?':>12}")
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<32} {'-':>12} {result['us_per_op']:>12.3f} {'new':>9}")
+            continue
+        change = result["us_per_op"] / before["us_per_op"] - 1
+        flag = ""
+        if change > threshold:
+            flag, regressed = "  REGRESSION", True
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{name:<32} {before['us_per_op']:>12.3f} {result['us_per_op']:>12.3f} {change:>+8.1%}{flag}")
+    return regressed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for session and connection hot paths")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark; the median is reported")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument(
+        "--compare", nargs="+", metavar="FILE",
+        help="Baseline results, optionally followed by results to compare instead of running",
+    )
+    parser.add_argument("--threshold", type=float, default=0.15, help="Slowdown counted as a regression (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare takes a baseline and at most one results file")
+    if args.compare and len(args.compare) == 2:
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+    else:
+        names = [name for name in BENCHMARKS if args.filter in name]
+        current = {
+            "commit": _commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": run(names, args.repeat),
+        }
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(current, f, indent=2)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        if compare(baseline, current, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,388 @@
+"""
+Memory footprint per session and per connection, and a leak soak.
+
+Clients talk to the app in-process over the ASGI interface, and
+tracemalloc measures what the server side keeps. The footprint run
+reports retained bytes for an idle session, a session that has been
+through lifts and votes, a judge connection and a display connection.
+"app" counts only allocations made by iron_verdict code. "total" also
+includes the ASGI and WebSocket objects behind each connection, which
+both ends of an in-process connection share, so it overstates them.
+
+The soak runs simulated hours of meets. Each hour new sessions run lifts
+with judges reconnecting and displays dropping, every client goes away,
+and the clock advances an hour for the expiry sweep. The hours are
+simulated by backdating session activity, so a day takes seconds. The
+run fails if connection bookkeeping outlives its connections, if
+sessions outlive SESSION_TIMEOUT_HOURS, or if traced memory keeps
+growing once the session count has levelled off.
+
+    python benchmarks/memory.py footprint --count 200
+    python benchmarks/memory.py soak --hours 24 --sessions 20 --json soak.json
+"""
+
+import os
+import tempfile
+
+# Settings are read at import; these must be in place before the app loads
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("LOOP_LAG_INTERVAL_MS", "0")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("DISPLAY_CAP", "1000")
+# A fixed origin, so join-link QR codes go through the shared cache the soak watches
+os.environ.setdefault("ALLOWED_ORIGIN", "http://test")
+os.environ.setdefault("SNAPSHOT_PATH", os.path.join(tempfile.mkdtemp(prefix="iron-verdict-memory-"), "sessions.json"))
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import gc  # noqa: E402
+import json  # noqa: E402
+import random  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+import tracemalloc  # noqa: E402
+from datetime import timedelta  # noqa: E402
+
+import httpx  # noqa: E402
+import httpx_ws  # noqa: E402
+from httpx_ws.transport import ASGIWebSocketTransport  # noqa: E402
+
+from iron_verdict import main  # noqa: E402
+from iron_verdict.config import settings  # noqa: E402
+
+JUDGE_ROLES = ("left_judge", "center_judge", "right_judge")
+SEND_INTERVAL = 1 / 15
+_APP_FILES = tracemalloc.Filter(True, os.path.join(os.path.dirname(main.__file__), "*"))
+
+
+class Client:
+    """
+    One WebSocket client; a reader discards messages and wakes waiters by type.
+
+    Each client runs in its own task, so clients can close in any order.
+    """
+
+    def __init__(self, http: httpx.AsyncClient, code: str, role: str):
+        self.http = http
+        self.code = code
+        self.role = role
+        self.token: str | None = None
+        self._ws = None
+        self._task: asyncio.Task | None = None
+        self._waiting: dict = {}
+        self._last_send = 0.0
+
+    async def connect(self) -> "Client":
+        joined = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run(joined))
+        await joined
+        return self
+
+    async def _run(self, joined: asyncio.Future) -> None:
+        try:
+            async with httpx_ws.aconnect_ws("ws://test/ws", self.http, headers={"origin": settings.ALLOWED_ORIGIN}) as ws:
+                self._ws = ws
+                join = {"type": "join", "session_code": self.code, "role": self.role}
+                if self.token:
+                    join["reconnect_token"] = self.token
+                await ws.send_json(join)
+                while True:
+                    message = await ws.receive_json()
+                    if message["type"] == "join_success":
+                        break
+                    if message["type"] == "join_error":
+                        raise RuntimeError(f"{self.role} could not join {self.code}: {message['message']}")
+                self.token = message.get("reconnect_token") or self.token
+                # Answer join_success as the first clock-sync ping, as real clients do
+                now = time.time() * 1000
+                await ws.send_json({"type": "pong", "t0": message["server_time_ms"], "t1": now, "t2": now})
+                joined.set_result(None)
+                while True:
+                    frame = await ws.receive_json()
+                    for message in frame["messages"] if frame.get("type") == "batch" else [frame]:
+                        waiter = self._waiting.pop(message.get("type"), None)
+                        if waiter is not None:
+                            waiter.set()
+        except (httpx_ws.WebSocketDisconnect, httpx_ws.WebSocketNetworkError):
+            pass
+        except Exception as exc:
+            if joined.done():
+                raise
+            joined.set_exception(exc)
+
+    def expect(self, message_type: str) -> asyncio.Event:
+        """An event set when the next message of `message_type` arrives. Call before triggering it."""
+        return self._waiting.setdefault(message_type, asyncio.Event())
+
+    async def send(self, message: dict) -> None:
+        # Stay under the server's limit of 20 messages per second per connection
+        wait = self._last_send + SEND_INTERVAL - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._last_send = time.monotonic()
+        await self._ws.send_json(message)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+async def create_session(http: httpx.AsyncClient, name: str = "Platform") -> str:
+    response = await http.post("/api/sessions", json={"name": name})
+    response.raise_for_status()
+    return response.json()["session_code"]
+
+
+async def run_lift(judges: dict, display: Client, rng: random.Random) -> None:
+    head = judges["center_judge"]
+    started = head.expect("timer_start")
+    await head.send({"type": "timer_start"})
+    await asyncio.wait_for(started.wait(), 5)
+    results = display.expect("show_results")
+    for judge in judges.values():
+        await judge.send({"type": "vote_lock", "color": "white" if rng.random() < 0.8 else "red"})
+    await asyncio.wait_for(results.wait(), 5)
+    reset = head.expect("reset_for_next_lift")
+    await head.send({"type": "next_lift"})
+    await asyncio.wait_for(reset.wait(), 5)
+
+
+def retained() -> tuple:
+    """(total, app) bytes currently traced, after a full collection."""
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot()
+    total = sum(stat.size for stat in snapshot.statistics("filename"))
+    app = sum(stat.size for stat in snapshot.filter_traces([_APP_FILES]).statistics("filename"))
+    return total, app
+
+
+def bookkeeping() -> dict:
+    """Sizes of every per-session and per-connection table in the running app."""
+    connections = main.connection_manager
+    hub = main.spectator_hub
+    return {
+        "sessions": len(main.session_manager.sessions),
+        "active_connections": sum(len(roles) for roles in connections.active_connections.values()),
+        "connection_sessions": len(connections.active_connections),
+        "last_pong": len(connections._last_pong),
+        "clocks": len(connections._clocks),
+        "pending": sum(len(queued) for queued in connections._pending.values()),
+        "flush_tasks": len(connections._flush_tasks),
+        "subscriptions": len(connections._subscriptions),
+        "subscribed_sessions": len(connections._subscribers),
+        "evicted": len(connections._evicted),
+        "timers": len(main.timer_wheel),
+        "spectator_versions": len(hub._versions),
+        "spectator_buffers": len(hub._buffers),
+        "spectator_renders": len(hub._rendered),
+        "qr_sessions": len(main.qr_cache._entries),
+    }
+
+
+# Tables that must be empty once every client has disconnected
+CONNECTION_TABLES = (
+    "active_connections", "connection_sessions", "last_pong", "clocks", "pending",
+    "subscriptions", "subscribed_sessions", "evicted",
+)
+# Tables keyed by session code, which must not outnumber live sessions
+SESSION_TABLES = ("timers", "spectator_versions", "spectator_buffers", "spectator_renders", "qr_sessions")
+
+
+def asgi_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=ASGIWebSocketTransport(app=main.app), base_url="http://test")
+
+
+async def play(http: httpx.AsyncClient, code: str, lifts: int, rng: random.Random) -> None:
+    """Judges and a display join, run `lifts` lifts and leave."""
+    judges = {role: await Client(http, code, role).connect() for role in JUDGE_ROLES}
+    display = await Client(http, code, "display").connect()
+    for _ in range(lifts):
+        await run_lift(judges, display, rng)
+    await http.get(f"/api/sessions/{code}/state")
+    for client in (*judges.values(), display):
+        await client.close()
+
+
+async def footprint(count: int) -> dict:
+    """Retained bytes per idle session, active session, judge connection and display connection."""
+    rng = random.Random(0)
+    results = {}
+    # The test transport holds every stream it opened until it closes, so
+    # phases whose connections are gone before measuring get their own
+    async with asgi_client() as http:
+        # Warm up lazily built caches so they are not charged to the first measurement
+        await play(http, await create_session(http), 1, rng)
+
+    before = retained()
+    async with asgi_client() as http:
+        idle = [await create_session(http) for _ in range(count)]
+    after = retained()
+    results["idle_session"] = (after, before, count)
+
+    before = after
+    async with asgi_client() as http:
+        codes = [await create_session(http) for _ in range(count)]
+        await asyncio.gather(*(play(http, code, 3, rng) for code in codes))
+    after = retained()
+    results["active_session"] = (after, before, count)
+
+    async with asgi_client() as http:
+        before = retained()
+        judges = []
+        for code in idle[: max(1, count // 3)]:
+            judges.extend([await Client(http, code, role).connect() for role in JUDGE_ROLES])
+        after = retained()
+        results["judge_connection"] = (after, before, len(judges))
+
+        before = after
+        displays = [await Client(http, idle[i % len(idle)], "display").connect() for i in range(count)]
+        after = retained()
+        results["display_connection"] = (after, before, len(displays))
+
+        for client in (*judges, *displays):
+            await client.close()
+
+    return {
+        name: {
+            "app_bytes": round((after[1] - before[1]) / n),
+            "total_bytes": round((after[0] - before[0]) / n),
+            "samples": n,
+        }
+        for name, (after, before, n) in results.items()
+    }
+
+
+async def run_meet(http: httpx.AsyncClient, code: str, displays: int, lifts: int, end: bool, rng: random.Random) -> None:
+    judges = {role: await Client(http, code, role).connect() for role in JUDGE_ROLES}
+    screens = [await Client(http, code, "display").connect() for _ in range(displays)]
+    stale = []
+    await http.get(f"/api/sessions/{code}/qr.svg")
+    await http.get(f"/api/sessions/{code}/results")
+    for lift in range(lifts):
+        await run_lift(judges, screens[0], rng)
+        if lift == lifts // 2:
+            # A judge's phone reconnects with its token while the old socket is still open
+            role = rng.choice(JUDGE_ROLES)
+            old = judges[role]
+            replacement = Client(http, code, role)
+            replacement.token = old.token
+            judges[role] = await replacement.connect()
+            stale.append(old)
+            # A display drops and comes back
+            await screens[-1].close()
+            screens[-1] = await Client(http, code, "display").connect()
+    if end:
+        await judges["center_judge"].send({"type": "end_session_confirmed"})
+    for client in (*judges.values(), *screens, *stale):
+        await client.close()
+
+
+async def soak_hour(http: httpx.AsyncClient, sessions: int, displays: int, lifts: int, rng: random.Random) -> None:
+    """One simulated hour: new meets run side by side and finish, and every client disconnects."""
+    codes = [await create_session(http, f"Soak {i}") for i in range(sessions)]
+    # One scoreboard watching all of this hour's platforms
+    async with httpx_ws.aconnect_ws("ws://test/ws", http, headers={"origin": settings.ALLOWED_ORIGIN}) as scoreboard:
+        await scoreboard.send_json({"type": "subscribe", "session_codes": codes})
+        await scoreboard.receive_json()
+        await asyncio.gather(*(
+            # Some meets are ended by the head judge; the rest are left to expire
+            run_meet(http, code, displays, lifts, index % 4 == 0, random.Random(rng.random()))
+            for index, code in enumerate(codes)
+        ))
+
+
+async def soak(hours: int, sessions: int, displays: int, lifts: int, tolerance: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    samples = []
+    started = time.perf_counter()
+    for hour in range(1, hours + 1):
+        # A client per hour, since the test transport keeps its streams until closed
+        async with asgi_client() as http:
+            await soak_hour(http, sessions, displays, lifts, rng)
+        # Let the server-side handlers finish their disconnect bookkeeping
+        await asyncio.sleep(0.05)
+        # Advance the simulated clock one hour and run the expiry sweep
+        for session in main.session_manager.sessions.values():
+            session["last_activity"] -= timedelta(hours=1)
+        await main.expire_sessions()
+        total, app = retained()
+        samples.append({"hour": hour, "traced_bytes": total, "app_bytes": app, **bookkeeping()})
+        print(
+            f"hour {hour:>3}  sessions {samples[-1]['sessions']:>5}  "
+            f"traced {total / 1024:>9.1f} KiB  app {app / 1024:>9.1f} KiB",
+            file=sys.stderr,
+        )
+
+    problems = []
+    for sample in samples:
+        leftovers = {table: sample[table] for table in CONNECTION_TABLES if sample[table]}
+        if leftovers:
+            problems.append(f"hour {sample['hour']}: connection state left after all clients closed: {leftovers}")
+        oversized = {table: sample[table] for table in SESSION_TABLES if sample[table] > sample["sessions"]}
+        if oversized:
+            problems.append(f"hour {sample['hour']}: per-session state for deleted sessions: {oversized}")
+    # Sessions live SESSION_TIMEOUT_HOURS plus up to one sweep; after that the population is flat
+    ceiling = sessions * (settings.SESSION_TIMEOUT_HOURS + 1)
+    if any(sample["sessions"] > ceiling for sample in samples):
+        problems.append(f"sessions outlive SESSION_TIMEOUT_HOURS: more than {ceiling} held")
+    steady = samples[settings.SESSION_TIMEOUT_HOURS + 1:]
+    growth = None
+    if len(steady) >= 2:
+        first, last = steady[0]["traced_bytes"], steady[-1]["traced_bytes"]
+        growth = (last - first) / first
+        if growth > tolerance:
+            problems.append(
+                f"traced memory grew {growth:.1%} from hour {steady[0]['hour']} to {steady[-1]['hour']} "
+                f"with a steady session count (tolerance {tolerance:.0%})"
+            )
+
+    return {
+        "hours": hours,
+        "sessions_per_hour": sessions,
+        "displays_per_session": displays,
+        "lifts_per_session": lifts,
+        "elapsed_s": round(time.perf_counter() - started, 1),
+        "steady_state_growth": round(growth, 4) if growth is not None else None,
+        "samples": samples,
+        "problems": problems,
+    }
+
+
+def main_cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Memory footprint and leak soak for the Iron Verdict server")
+    commands = parser.add_subparsers(dest="command", required=True)
+    size = commands.add_parser("footprint", help="Retained bytes per session and per connection")
+    size.add_argument("--count", type=int, default=200, help="Sessions or connections per measurement")
+    run = commands.add_parser("soak", help="Simulated hours of meets; fails on unbounded growth")
+    run.add_argument("--hours", type=int, default=24, help="Simulated hours")
+    run.add_argument("--sessions", type=int, default=20, help="New sessions per simulated hour")
+    run.add_argument("--displays", type=int, default=3, help="Displays per session")
+    run.add_argument("--lifts", type=int, default=9, help="Lifts per session")
+    run.add_argument("--tolerance", type=float, default=0.05, help="Allowed steady-state growth (0.05 = 5%%)")
+    run.add_argument("--seed", type=int, default=0)
+    for command in (size, run):
+        command.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    tracemalloc.start()
+    if args.command == "footprint":
+        report = asyncio.run(footprint(args.count))
+        for name, result in report.items():
+            print(f"{name:<20} app {result['app_bytes']:>8,} B   total {result['total_bytes']:>8,} B")
+    else:
+        if args.hours <= settings.SESSION_TIMEOUT_HOURS + 2:
+            parser.error(f"--hours must exceed SESSION_TIMEOUT_HOURS + 2 ({settings.SESSION_TIMEOUT_HOURS + 2})")
+        report = asyncio.run(soak(args.hours, args.sessions, args.displays, args.lifts, args.tolerance, args.seed))
+        for problem in report["problems"]:
+            print(f"FAIL {problem}")
+        if not report["problems"]:
+            print(f"OK   {args.hours} simulated hours, steady-state growth {report['steady_state_growth']:+.1%}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report.get("problems") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
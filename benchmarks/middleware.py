@@ -0,0 +1,108 @@
+"""
+Request throughput of the app with the pure-ASGI SecurityHeadersMiddleware
+versus the previous BaseHTTPMiddleware implementation.
+
+Requests are driven straight through the ASGI interface (no sockets, no
+HTTP client) so the numbers reflect the app and its middleware only.
+
+    python benchmarks/middleware.py --requests 20000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from iron_verdict.main import _CSP, SecurityHeadersMiddleware, app, static_assets
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    """The implementation SecurityHeadersMiddleware replaced."""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        response.headers["Content-Security-Policy"] = _CSP
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["Referrer-Policy"] = "no-referrer"
+        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+        return response
+
+
+def use_middleware(cls) -> None:
+    ours = (SecurityHeadersMiddleware, LegacySecurityHeadersMiddleware)
+    app.user_middleware = [m for m in app.user_middleware if m.cls not in ours]
+    app.user_middleware.insert(0, Middleware(cls))
+    app.middleware_stack = None  # rebuilt on the next request
+
+
+async def request(path: str) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"accept-encoding", b"br, gzip")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    status = 0
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def throughput(path: str, total: int, concurrency: int) -> float:
+    async def worker(n: int) -> None:
+        for _ in range(n):
+            assert await request(path) == 200, path
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(total // concurrency) for _ in range(concurrency)))
+    return (total // concurrency * concurrency) / (time.perf_counter() - start)
+
+
+async def run(args) -> None:
+    paths = ["/health", "/", static_assets.url_for("/static/css/components.css")]
+    variants = {"BaseHTTPMiddleware": LegacySecurityHeadersMiddleware, "pure ASGI": SecurityHeadersMiddleware}
+    print(f"{args.requests} requests per path, concurrency {args.concurrency}, best of {args.repeat}")
+    for path in paths:
+        results = {}
+        for name, cls in variants.items():
+            use_middleware(cls)
+            await throughput(path, args.concurrency * 10, args.concurrency)  # warm up
+            results[name] = max([await throughput(path, args.requests, args.concurrency) for _ in range(args.repeat)])
+        before, after = results["BaseHTTPMiddleware"], results["pure ASGI"]
+        print(f"  {path:<45} {before:9.0f} -> {after:9.0f} req/s  ({(after / before - 1) * 100:+.0f}%)")
+    use_middleware(SecurityHeadersMiddleware)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
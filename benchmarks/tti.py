@@ -0,0 +1,125 @@
+"""
+Time to interactive of the landing page over a throttled link.
+
+Starts the app on a random port (or uses --url), then loads the page in
+Chromium with network throttling applied through the DevTools protocol.
+"Interactive" is the moment Alpine fires `alpine:initialized`, i.e. the
+landing page buttons respond. Each run records a cold load (fresh browser
+context, empty cache) and a warm reload (same context).
+
+    python benchmarks/tti.py --profile slow-wifi --runs 5
+    python benchmarks/tti.py --url http://localhost:8000 --json results.json
+
+Requires the dev extras and `playwright install chromium`.
+"""
+
+import argparse
+import json
+import socket
+import statistics
+import sys
+import threading
+import time
+
+import httpx
+import uvicorn
+from playwright.sync_api import sync_playwright
+
+# Download/upload in bytes per second, latency in ms
+PROFILES = {
+    "slow-wifi": {"latency": 150, "downloadThroughput": 750_000 / 8, "uploadThroughput": 250_000 / 8},
+    "3g": {"latency": 300, "downloadThroughput": 1_600_000 / 8, "uploadThroughput": 750_000 / 8},
+    "fast": {"latency": 20, "downloadThroughput": 10_000_000 / 8, "uploadThroughput": 5_000_000 / 8},
+}
+
+_MARK_INTERACTIVE = """
+document.addEventListener('alpine:initialized', () => {
+    window.__interactiveAt = performance.now();
+});
+"""
+
+_COLLECT = """
+() => {
+    const resources = performance.getEntriesByType('resource');
+    const nav = performance.getEntriesByType('navigation')[0];
+    const local = resources.filter(r => r.name.startsWith(location.origin));
+    return {
+        interactive_ms: window.__interactiveAt,
+        requests: local.length + 1,
+        transferred_bytes: local.reduce((n, r) => n + r.transferSize, nav.transferSize),
+        from_cache: local.filter(r => r.transferSize === 0).length,
+    };
+}
+"""
+
+
+def start_server() -> str:
+    from iron_verdict.main import app, limiter
+
+    limiter.enabled = False
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app=app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    for _ in range(50):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health", timeout=1.0)
+            return f"http://127.0.0.1:{port}"
+        except Exception:
+            time.sleep(0.1)
+    raise RuntimeError("Benchmark server failed to start")
+
+
+def measure(browser, url: str, profile: dict) -> dict:
+    context = browser.new_context()
+    context.add_init_script(_MARK_INTERACTIVE)
+    page = context.new_page()
+    cdp = context.new_cdp_session(page)
+    cdp.send("Network.enable")
+    cdp.send("Network.emulateNetworkConditions", {"offline": False, **profile})
+
+    result = {}
+    for phase in ("cold", "warm"):
+        if phase == "cold":
+            page.goto(url)
+        else:
+            page.reload()
+        page.wait_for_function("window.__interactiveAt !== undefined", timeout=60_000)
+        result[phase] = page.evaluate(_COLLECT)
+    context.close()
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="Measure a running server instead of starting one")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="slow-wifi")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", dest="json_path", help="Also write raw results to this file")
+    args = parser.parse_args()
+
+    url = args.url or start_server()
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        runs = [measure(browser, url, PROFILES[args.profile]) for _ in range(args.runs)]
+        browser.close()
+
+    print(f"{args.profile}: {args.runs} runs against {url}")
+    for phase in ("cold", "warm"):
+        tti = [r[phase]["interactive_ms"] for r in runs]
+        last = runs[-1][phase]
+        print(
+            f"  {phase:<5} median TTI {statistics.median(tti):7.0f} ms"
+            f"  (min {min(tti):.0f}, max {max(tti):.0f})"
+            f"  {last['requests']} requests, {last['from_cache']} from cache,"
+            f" {last['transferred_bytes'] / 1024:.1f} KiB"
+        )
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"profile": args.profile, "url": url, "runs": runs}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
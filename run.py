@@ -18,6 +18,10 @@ if __name__ == "__main__":
         )
     else:
         import asyncio
+        if settings.PROFILE_STARTUP:
+            # Written out by the lifespan once startup is done; covers the imports below
+            from iron_verdict import profiler
+            profiler.start_startup_profile()
         from iron_verdict.main import app
         config = uvicorn.Config(
             app,
@@ -0,0 +1,296 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from typing import Dict, List, Set, Tuple
+
+import brotli
+from fastapi import Request
+from fastapi.responses import Response
+
+# Preferred order when the client accepts several encodings equally
+ENCODINGS = ("br", "gzip")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# Relative ES module specifiers: `import ... from './x.js'` and `import './x.js'`
+_IMPORT_RE = re.compile(r"""(\bfrom\s*|\bimport\s*)(['"])(\.{1,2}/[^'"]+\.js)\2""")
+_MODULE_SCRIPT_RE = re.compile(r"""<script\s+type="module"\s+src="([^"]+)"></script>""")
+
+
+def negotiate_encoding(accept_encoding: str, available: Tuple[str, ...] = ENCODINGS) -> str | None:
+    """
+    Pick the best of `available` content codings for an Accept-Encoding header.
+
+    Returns None for the identity encoding. Honours q-values, including
+    ``q=0`` to refuse an encoding and ``*`` as a wildcard.
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def negotiate_language(accept_language: str, supported: Tuple[str, ...], default: str) -> str:
+    """
+    Pick a supported language for an Accept-Language header.
+
+    Matches on the primary subtag (``de-AT`` selects ``de``) and honours
+    q-values; falls back to `default`.
+    """
+    best, best_q = default, 0.0
+    for part in accept_language.split(","):
+        tag, _, params = part.strip().partition(";")
+        lang = tag.strip().split("-")[0].lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if lang in supported and q > best_q:
+            best, best_q = lang, q
+    return best
+
+
+class CompressedAsset:
+    """
+    A response body rendered once and kept in memory with its gzip and brotli
+    variants.
+
+    Each variant has its own strong ETag (a content coding changes the bytes),
+    and matching ``If-None-Match`` requests are answered with 304.
+    """
+
+    def __init__(
+        self,
+        body: bytes,
+        media_type: str,
+        cache_control: str = "no-cache",
+        vary: str = "Accept-Encoding",
+    ):
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.vary = vary
+        digest = hashlib.sha256(body).hexdigest()[:16]
+        self.digest = digest
+        # {encoding or None: (body, etag)}
+        self.variants: Dict[str | None, Tuple[bytes, str]] = {None: (body, f'"{digest}"')}
+        compressed = {
+            "br": brotli.compress(body, quality=11),
+            "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+        }
+        for encoding, data in compressed.items():
+            # Tiny bodies can grow when compressed; serve those as-is
+            if len(data) < len(body):
+                self.variants[encoding] = (data, f'"{digest}-{encoding}"')
+
+    @classmethod
+    def from_template(cls, path: str, replacements: Dict[str, str], media_type: str) -> "CompressedAsset":
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+        for placeholder, value in replacements.items():
+            content = content.replace(placeholder, value)
+        return cls(content.encode("utf-8"), media_type)
+
+    def response(self, request: Request, cache_control: str | None = None) -> Response:
+        available = tuple(e for e in ENCODINGS if e in self.variants)
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""), available)
+        body, etag = self.variants[encoding]
+        headers = {
+            "ETag": etag,
+            "Cache-Control": cache_control or self.cache_control,
+            "Vary": self.vary,
+        }
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type=self.media_type, headers=headers)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags: List[str] = [t.strip() for t in if_none_match.split(",")]
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def _media_type(path: str) -> str:
+    if path.endswith(".js"):
+        return "text/javascript"
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+def _fingerprint(path: str, body: bytes) -> str:
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{hashlib.sha256(body).hexdigest()[:10]}{ext}"
+
+
+class StaticAssets:
+    """
+    ASGI app serving the static directory from memory with content-hashed URLs.
+
+    At construction every file is read, ES module imports are rewritten to
+    their dependencies' hashed names (leaves first, so a change anywhere
+    changes the hash of every module that imports it), and each file is
+    precompressed. ``url_for`` maps an original URL to its hashed one for
+    rewriting HTML. Hashed URLs are served as immutable; the original paths
+    keep working with ``no-cache`` and an ETag, for URLs that can't be
+    rewritten (such as the locale files fetched by language).
+    """
+
+    def __init__(self, directory: str, prefix: str = "/static", exclude: Tuple[str, ...] = ("index.html",)):
+        self.directory = directory
+        self.prefix = prefix
+        # {"/static/js/app.js": "/static/js/app.1a2b3c4d5e.js"}
+        self.urls: Dict[str, str] = {}
+        # {"js/app.js": [relative imports, as original paths]}
+        self.imports: Dict[str, List[str]] = {}
+        # {route path: (asset, cache_control)}
+        self._routes: Dict[str, Tuple[CompressedAsset, str]] = {}
+
+        sources: Dict[str, bytes] = {}
+        for root, _, files in os.walk(directory):
+            for name in files:
+                full = os.path.join(root, name)
+                path = os.path.relpath(full, directory).replace(os.sep, "/")
+                if path in exclude:
+                    continue
+                with open(full, "rb") as f:
+                    sources[path] = f.read()
+
+        for path in sources:
+            if path.endswith(".js"):
+                self.imports[path] = sorted(self._module_imports(path, sources[path].decode("utf-8")))
+        for path in self._dependency_order(sources):
+            body = sources[path]
+            if path in self.imports:
+                body = _IMPORT_RE.sub(
+                    lambda m, p=path: m.group(1) + m.group(2) + self._hashed_relative(p, m.group(3)) + m.group(2),
+                    body.decode("utf-8"),
+                ).encode("utf-8")
+            hashed = _fingerprint(path, body)
+            asset = CompressedAsset(body, _media_type(path))
+            self._routes[path] = (asset, "no-cache")
+            self._routes[hashed] = (asset, IMMUTABLE)
+            self.urls[f"{prefix}/{path}"] = f"{prefix}/{hashed}"
+
+    @staticmethod
+    def _resolve(importer: str, specifier: str) -> str:
+        return os.path.normpath(os.path.join(os.path.dirname(importer), specifier)).replace(os.sep, "/")
+
+    def _module_imports(self, path: str, source: str) -> Set[str]:
+        found = {self._resolve(path, m.group(3)) for m in _IMPORT_RE.finditer(source)}
+        found.discard(path)  # usage examples in a module's own doc comment
+        return found
+
+    def _hashed_relative(self, importer: str, specifier: str) -> str:
+        target = self._resolve(importer, specifier)
+        hashed = self.urls.get(f"{self.prefix}/{target}")
+        if hashed is None:
+            return specifier  # self-reference or missing file: leave untouched
+        # Fingerprinting keeps a file in its directory, so only the basename changes
+        return f"{specifier.rsplit('/', 1)[0]}/{hashed.rsplit('/', 1)[1]}"
+
+    def _dependency_order(self, sources: Dict[str, bytes]) -> List[str]:
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(path: str, chain: Tuple[str, ...]) -> None:
+            if state.get(path) == 2:
+                return
+            if state.get(path) == 1:
+                raise ValueError(f"Circular import between static modules: {' -> '.join(chain + (path,))}")
+            state[path] = 1
+            for dep in self.imports.get(path, ()):
+                if dep in sources:
+                    visit(dep, chain + (path,))
+            state[path] = 2
+            order.append(path)
+
+        for path in sorted(sources):
+            visit(path, ())
+        return order
+
+    def url_for(self, url: str) -> str:
+        return self.urls.get(url, url)
+
+    def module_graph(self, url: str) -> List[str]:
+        """Hashed URLs of a module and everything it imports, dependencies first."""
+        seen: List[str] = []
+
+        def walk(path: str) -> None:
+            for dep in self.imports.get(path, ()):
+                walk(dep)
+            hashed = self.url_for(f"{self.prefix}/{path}")
+            if hashed not in seen:
+                seen.append(hashed)
+
+        walk(url[len(self.prefix) + 1:])
+        return seen
+
+    def render_page(
+        self, path: str, replacements: Dict[str, str], media_type: str, vary: str = "Accept-Encoding"
+    ) -> CompressedAsset:
+        """
+        Render an HTML template with its static references fingerprinted.
+
+        Module entry points also get ``<link rel="modulepreload">`` tags for
+        their whole import graph, so the browser fetches every module in
+        parallel instead of discovering them one import at a time.
+        """
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+        for placeholder, value in replacements.items():
+            content = content.replace(placeholder, value)
+
+        def preload(match: re.Match) -> str:
+            graph = self.module_graph(match.group(1))
+            links = "".join(f'<link rel="modulepreload" href="{url}">\n    ' for url in graph[:-1])
+            return f'{links}<script type="module" src="{self.url_for(match.group(1))}"></script>'
+
+        content = _MODULE_SCRIPT_RE.sub(preload, content)
+        # Longest first, so no URL is rewritten inside a longer one
+        for url in sorted(self.urls, key=len, reverse=True):
+            content = re.sub(rf'(["\'])({re.escape(url)})\1', rf"\g<1>{self.urls[url]}\1", content)
+        return CompressedAsset(content.encode("utf-8"), media_type, vary=vary)
+
+    def _route_path(self, scope) -> str:
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        return path.lstrip("/")
+
+    async def __call__(self, scope, receive, send) -> None:
+        assert scope["type"] == "http"
+        if scope["method"] not in ("GET", "HEAD"):
+            response = Response("Method Not Allowed", status_code=405, headers={"Allow": "GET, HEAD"})
+        else:
+            route = self._routes.get(self._route_path(scope))
+            if route is None:
+                response = Response("Not Found", status_code=404, media_type="text/plain")
+            else:
+                asset, cache_control = route
+                response = asset.response(Request(scope), cache_control)
+        await response(scope, receive, send)
@@ -12,7 +12,28 @@ class Settings:
     ALLOWED_ORIGIN: str = os.getenv("ALLOWED_ORIGIN", "*")
     APP_VERSION: str = os.getenv("APP_VERSION", "dev")
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    LOG_RATE_LIMITS: str = os.getenv("LOG_RATE_LIMITS", "heartbeat_*=20,*_send_failed=20")
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+    OFFLINE_ASSETS: bool = os.getenv("OFFLINE_ASSETS", "false").lower() in ("1", "true", "yes")
     SNAPSHOT_PATH: str = os.getenv("SNAPSHOT_PATH", "/data/sessions.json")
+    SUBSCRIBE_MAX_SESSIONS: int = int(os.getenv("SUBSCRIBE_MAX_SESSIONS", "32"))
+    SPECTATOR_CAP: int = int(os.getenv("SPECTATOR_CAP", "5000"))
+    SPECTATOR_BUFFER_SIZE: int = int(os.getenv("SPECTATOR_BUFFER_SIZE", "256"))
+    LONG_POLL_TIMEOUT_SECONDS: float = float(os.getenv("LONG_POLL_TIMEOUT_SECONDS", "25"))
+    BATCH_WINDOW_MS: float = float(os.getenv("BATCH_WINDOW_MS", "0"))
+    BATCH_MAX_MESSAGES: int = int(os.getenv("BATCH_MAX_MESSAGES", "32"))
+    SEND_FAILURE_SUMMARY_SECONDS: float = float(os.getenv("SEND_FAILURE_SUMMARY_SECONDS", "10"))
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+    LOOP_LAG_INTERVAL_MS: float = float(os.getenv("LOOP_LAG_INTERVAL_MS", "250"))
+    SLOW_CALLBACK_MS: float = float(os.getenv("SLOW_CALLBACK_MS", "100"))
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "false").lower() in ("1", "true", "yes")
+    TRACE_BUFFER_SIZE: int = int(os.getenv("TRACE_BUFFER_SIZE", "200"))
+    TRACE_EXPORT_PATH: str = os.getenv("TRACE_EXPORT_PATH", "")
+    PROFILE_STARTUP: str = os.getenv("PROFILE_STARTUP", "")
+    RECORD_PATH: str = os.getenv("RECORD_PATH", "")
+    TIMER_TICK_SECONDS: int = int(os.getenv("TIMER_TICK_SECONDS", "10"))
 
 
 settings = Settings()
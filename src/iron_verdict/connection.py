@@ -1,18 +1,101 @@
 import asyncio
 import time
 import logging
-from typing import Dict, Any
+from collections import deque
+from typing import Any, Callable, Dict, List, Set, Tuple
 from fastapi import WebSocket
+from iron_verdict import metrics, tracing
+from iron_verdict.spectator import SpectatorHub
 
 logger = logging.getLogger("iron_verdict")
 
 
-class ConnectionManager:
+class ClockEstimate:
+    """
+    NTP-style estimate of one client's clock relative to the server.
+
+    Each sample is a ping/pong exchange: t0 server send, t1 client receive,
+    t2 client send, t3 server receive (all epoch milliseconds). The estimate
+    trusts the lowest-RTT sample in a short window, since queueing delay
+    only ever adds asymmetry.
+    """
+
+    def __init__(self, window: int = 8):
+        self._samples: deque = deque(maxlen=window)
+
+    def add_sample(self, t0: float, t1: float, t2: float, t3: float) -> float:
+        """Add an exchange and return its round-trip time in milliseconds."""
+        rtt = max(0.0, (t3 - t0) - (t2 - t1))
+        offset = ((t1 - t0) + (t2 - t3)) / 2
+        self._samples.append((rtt, offset))
+        return rtt
+
+    @property
+    def rtt_ms(self) -> float | None:
+        if not self._samples:
+            return None
+        return min(self._samples)[0]
+
+    @property
+    def offset_ms(self) -> float | None:
+        """Client clock minus server clock, in milliseconds."""
+        if not self._samples:
+            return None
+        return min(self._samples)[1]
+
+
+def _batch_frame(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """One frame for a recipient's queued messages: a lone message as is, else a batch."""
+    if len(messages) == 1:
+        return messages[0]
+    return {"type": "batch", "messages": messages}
+
+
+class _Outbox:
+    """Frames waiting to go out on one socket, sent in order by one sender at a time."""
+
     def __init__(self):
+        self.frames: deque = deque()
+        self.lock = asyncio.Lock()
+
+
+class ConnectionManager:
+    def __init__(
+        self,
+        batch_window_ms: float = 0,
+        batch_max_messages: int = 32,
+        spectators: SpectatorHub | None = None,
+        failure_summary_seconds: float = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         # Structure: {session_code: {role: websocket}}
         self.active_connections: Dict[str, Dict[str, WebSocket]] = {}
         self._lock = asyncio.Lock()
         self._last_pong: Dict[WebSocket, float] = {}
+        # Stamps pongs for the heartbeat check; the protocol tests substitute a fake one
+        self._clock = clock
+        self._clocks: Dict[WebSocket, ClockEstimate] = {}
+        # Micro-batching: outbound messages queued per session and recipient,
+        # flushed as one frame per recipient at most batch_window_ms later.
+        self._batch_window = batch_window_ms / 1000
+        self._batch_max_messages = batch_max_messages
+        self._pending: Dict[str, Dict[WebSocket, List[Dict[str, Any]]]] = {}
+        self._flush_tasks: Dict[str, asyncio.Task] = {}
+        # Frames taken out of a batch or sent directly, per recipient; keeps
+        # per-socket order across concurrent flushes and direct replies
+        self._outboxes: Dict[WebSocket, _Outbox] = {}
+        # Multiplexed read-only subscribers: one socket watching many sessions
+        self._subscribers: Dict[str, Set[WebSocket]] = {}
+        self._subscriptions: Dict[WebSocket, Set[str]] = {}
+        # Passive spectator tier fed from the same public events
+        self.spectators = spectators
+        # Sockets dropped after a failed send: {websocket: (session_code, role)}.
+        # Their endpoint handler still owns the disconnect bookkeeping.
+        self._evicted: Dict[WebSocket, Tuple[str, str]] = {}
+        # Send failures since the last summary: {(session_code, role, error class): repeats}
+        self._failures: Dict[Tuple[str, str, str], int] = {}
+        self._failure_summary_seconds = failure_summary_seconds
+        self._summary_task: asyncio.Task | None = None
 
     async def add_connection(self, session_code: str, role: str, websocket: WebSocket):
         """Add a WebSocket connection to a session."""
@@ -20,7 +103,7 @@ class ConnectionManager:
             if session_code not in self.active_connections:
                 self.active_connections[session_code] = {}
             self.active_connections[session_code][role] = websocket
-            self._last_pong[websocket] = time.monotonic()
+            self._last_pong[websocket] = self._clock()
 
     async def remove_connection(self, session_code: str, role: str):
         """Remove a WebSocket connection from a session."""
@@ -29,6 +112,9 @@ class ConnectionManager:
                 ws = self.active_connections[session_code].pop(role, None)
                 if ws is not None:
                     self._last_pong.pop(ws, None)
+                    self._clocks.pop(ws, None)
+                    self._pending.get(session_code, {}).pop(ws, None)
+                    self._outboxes.pop(ws, None)
                 if not self.active_connections[session_code]:
                     del self.active_connections[session_code]
 
@@ -41,17 +127,13 @@ class ConnectionManager:
         """Broadcast a message to all connections in a session."""
         # Get connections under lock to avoid race conditions
         async with self._lock:
-            if session_code not in self.active_connections:
-                return
             # Create a copy of connections to iterate outside the lock
-            connections = list(self.active_connections[session_code].values())
+            connections = list(self.active_connections.get(session_code, {}).values())
+            watchers = list(self._subscribers.get(session_code, ()))
 
         # Send outside lock to avoid blocking other operations
-        for websocket in connections:
-            try:
-                await websocket.send_json(message)
-            except Exception as exc:
-                logger.warning("broadcast_send_failed", extra={"reason": str(exc)}, exc_info=True)
+        await self._deliver(session_code, connections, message, "broadcast_send_failed")
+        await self._deliver_to_subscribers(session_code, watchers, message)
 
     async def send_to_role(self, session_code: str, role: str, message: Dict[str, Any]):
         """Send a message to a specific role in a session."""
@@ -63,10 +145,7 @@ class ConnectionManager:
 
         # Send outside lock
         if websocket:
-            try:
-                await websocket.send_json(message)
-            except Exception as exc:
-                logger.warning("send_to_role_failed", extra={"role": role, "reason": str(exc)}, exc_info=True)
+            await self._deliver(session_code, [websocket], message, "send_to_role_failed", role=role)
 
     async def count_displays(self, session_code: str) -> int:
         """Count active display connections in a session."""
@@ -78,21 +157,32 @@ class ConnectionManager:
                 if role.startswith("display_")
             )
 
+    def count_by_role(self) -> Dict[str, int]:
+        """Connections per role across all sessions, for metrics; display_* roles count as "display".
+
+        Reads without the lock: it runs on the event loop thread and never awaits.
+        """
+        counts = {
+            "left_judge": 0, "center_judge": 0, "right_judge": 0, "display": 0,
+            "subscriber": len(self._subscriptions),
+        }
+        for roles in self.active_connections.values():
+            for role in roles:
+                key = "display" if role.startswith("display_") else role
+                counts[key] = counts.get(key, 0) + 1
+        return counts
+
     async def send_to_displays(self, session_code: str, message: Dict[str, Any]):
         """Send a message to all display connections in a session."""
         async with self._lock:
-            if session_code not in self.active_connections:
-                return
             websockets = [
-                ws for role, ws in self.active_connections[session_code].items()
+                ws for role, ws in self.active_connections.get(session_code, {}).items()
                 if role.startswith("display_")
             ]
+            watchers = list(self._subscribers.get(session_code, ()))
 
-        for websocket in websockets:
-            try:
-                await websocket.send_json(message)
-            except Exception as exc:
-                logger.warning("send_to_display_failed", extra={"reason": str(exc)}, exc_info=True)
+        await self._deliver(session_code, websockets, message, "send_to_display_failed")
+        await self._deliver_to_subscribers(session_code, watchers, message)
 
     async def broadcast_to_others(
         self,
@@ -102,32 +192,272 @@ class ConnectionManager:
     ):
         """Broadcast to all connections in a session except exclude_ws."""
         async with self._lock:
-            if session_code not in self.active_connections:
-                return
             targets = [
-                ws for ws in self.active_connections[session_code].values()
+                ws for ws in self.active_connections.get(session_code, {}).values()
                 if ws is not exclude_ws
             ]
-        for ws in targets:
-            try:
-                await ws.send_json(message)
-            except Exception as exc:
-                logger.warning("broadcast_to_others_send_failed", extra={"reason": str(exc)}, exc_info=True)
+            watchers = list(self._subscribers.get(session_code, ()))
+        await self._deliver(session_code, targets, message, "broadcast_to_others_send_failed")
+        await self._deliver_to_subscribers(session_code, watchers, message)
+
+    async def _deliver_to_subscribers(self, session_code: str, watchers: List[WebSocket], message: Dict[str, Any]):
+        """Publish a public session event to spectators and tagged to multiplexed subscribers."""
+        if self.spectators is not None:
+            self.spectators.publish(session_code, message)
+        if watchers:
+            tagged = {**message, "session_code": session_code}
+            await self._deliver(session_code, watchers, tagged, "subscriber_send_failed")
+
+    async def _deliver(
+        self,
+        session_code: str,
+        targets: List[WebSocket],
+        message: Dict[str, Any],
+        failure_event: str,
+        **log_extra,
+    ):
+        """Send to each target now, or queue it for the session's batch window."""
+        if self._batch_window <= 0:
+            with metrics.BROADCAST_SECONDS.time(), tracing.tracer.span(
+                "deliver", message_type=message.get("type"), targets=len(targets), kind=failure_event
+            ):
+                for websocket in targets:
+                    await self._send(websocket, message, failure_event, **log_extra)
+            return
+
+        pending = self._pending.setdefault(session_code, {})
+        full = False
+        for websocket in targets:
+            queue = pending.setdefault(websocket, [])
+            queue.append(message)
+            full = full or len(queue) >= self._batch_max_messages
+        if full:
+            await self.flush(session_code)
+        elif session_code not in self._flush_tasks:
+            self._flush_tasks[session_code] = asyncio.create_task(self._flush_after_window(session_code))
+
+    async def _send(self, websocket: WebSocket, message: Dict[str, Any], failure_event: str, **log_extra):
+        if websocket in self._evicted:
+            return  # already failed; sends queued before the eviction are dropped
+        try:
+            with tracing.tracer.span("ws.send", message_type=message.get("type")):
+                await websocket.send_json(message)
+        except Exception as exc:
+            metrics.SEND_FAILURES.inc(failure_event)
+            await self._record_failure(websocket, failure_event, exc, log_extra)
+
+    async def _record_failure(self, websocket: WebSocket, failure_event: str, exc: Exception, log_extra):
+        """
+        Evict a socket whose send failed, and log the failure.
+
+        Only the first failure per connection and error class within a summary
+        period is logged, without a traceback; repeats are counted and reported
+        in one ``send_failures_summary`` record at the end of the period.
+        """
+        where = self._evicted.get(websocket)
+        if where is None:
+            where = await self._evict(websocket)
+        session_code, role = where
+        key = (session_code, role, type(exc).__name__)
+        if key in self._failures:
+            self._failures[key] += 1
+            return
+        self._failures[key] = 0
+        logger.warning(failure_event, extra={
+            **log_extra,
+            "session_code": session_code,
+            "role": "display" if role.startswith("display_") else role,
+            "reason": f"{type(exc).__name__}: {exc}",
+        })
+        if self._summary_task is None:
+            self._summary_task = asyncio.create_task(self._summarize_failures_after_period())
+
+    async def _summarize_failures_after_period(self):
+        await asyncio.sleep(self._failure_summary_seconds)
+        self._summary_task = None
+        self.summarize_failures()
+
+    def summarize_failures(self) -> None:
+        """Log one record per connection and error class that failed again since its first log line."""
+        failures, self._failures = self._failures, {}
+        for (session_code, role, error), repeats in failures.items():
+            if repeats:
+                logger.warning("send_failures_summary", extra={
+                    "session_code": session_code,
+                    "role": "display" if role.startswith("display_") else role,
+                    "error": error,
+                    "count": repeats,
+                })
+
+    async def _evict(self, websocket: WebSocket) -> Tuple[str, str]:
+        """Stop delivering to a socket and close it. Returns its (session_code, role)."""
+        async with self._lock:
+            where = ("*", "subscriber") if websocket in self._subscriptions else ("", "")
+            for code, roles in self.active_connections.items():
+                for role, ws in roles.items():
+                    if ws is websocket:
+                        where = (code, role)
+            code, role = where
+            if code in self.active_connections:
+                del self.active_connections[code][role]
+                if not self.active_connections[code]:
+                    del self.active_connections[code]
+            for subscribed in self._subscriptions.pop(websocket, ()):
+                watchers = self._subscribers.get(subscribed)
+                if watchers is not None:
+                    watchers.discard(websocket)
+                    if not watchers:
+                        del self._subscribers[subscribed]
+            self._last_pong.pop(websocket, None)
+            self._clocks.pop(websocket, None)
+            for pending in self._pending.values():
+                pending.pop(websocket, None)
+            self._outboxes.pop(websocket, None)
+            # Only a registered socket has a handler left to pop_evicted() it
+            if where != ("", ""):
+                self._evicted[websocket] = where
+        try:
+            await websocket.close(code=1011)
+        except Exception:
+            pass  # usually already gone
+        return where
+
+    async def pop_evicted(self, websocket: WebSocket) -> bool:
+        """Forget an evicted socket once its endpoint has seen the disconnect. True if it was evicted."""
+        async with self._lock:
+            return self._evicted.pop(websocket, None) is not None
+
+    async def _flush_after_window(self, session_code: str):
+        await asyncio.sleep(self._batch_window)
+        # Deregister before sending so an explicit flush() can't cancel us mid-send
+        self._flush_tasks.pop(session_code, None)
+        await self._send_pending(session_code)
+
+    async def flush(self, session_code: str):
+        """Send everything queued for a session immediately. No-op when batching is off."""
+        task = self._flush_tasks.pop(session_code, None)
+        if task is not None:
+            task.cancel()
+        await self._send_pending(session_code)
+
+    async def _send_pending(self, session_code: str):
+        pending = self._pending.pop(session_code, None)
+        if not pending:
+            return
+        with metrics.BROADCAST_SECONDS.time(), tracing.tracer.span("batch_flush", targets=len(pending)):
+            # Claim every recipient's place in line before the first await, so a
+            # flush started later can't get its frame out ahead of this one
+            for websocket, messages in pending.items():
+                self._enqueue(websocket, _batch_frame(messages), "batch_send_failed")
+            for websocket in pending:
+                await self._drain(websocket)
+
+    async def send_personal(self, websocket: WebSocket, message: Dict[str, Any]):
+        """
+        Send a reply to one socket.
+
+        With batching on, whatever is still queued for the socket goes out
+        first, so a reply never overtakes an event broadcast before it.
+        """
+        if self._batch_window <= 0:
+            await self._send(websocket, message, "reply_send_failed")
+            return
+        for pending in self._pending.values():
+            messages = pending.pop(websocket, None)
+            if messages:
+                self._enqueue(websocket, _batch_frame(messages), "batch_send_failed")
+        self._enqueue(websocket, message, "reply_send_failed")
+        await self._drain(websocket)
+
+    def _enqueue(self, websocket: WebSocket, frame: Dict[str, Any], failure_event: str):
+        outbox = self._outboxes.get(websocket)
+        if outbox is None:
+            outbox = self._outboxes[websocket] = _Outbox()
+        outbox.frames.append((frame, failure_event))
+
+    async def _drain(self, websocket: WebSocket):
+        """Send a socket's outbox in order; concurrent callers wait their turn."""
+        outbox = self._outboxes.get(websocket)
+        if outbox is None:
+            return  # evicted or removed meanwhile
+        async with outbox.lock:
+            while outbox.frames:
+                frame, failure_event = outbox.frames.popleft()
+                await self._send(websocket, frame, failure_event)
+        if not outbox.frames and self._outboxes.get(websocket) is outbox:
+            del self._outboxes[websocket]
 
     async def mark_pong(self, websocket: WebSocket) -> None:
         async with self._lock:
             if websocket in self._last_pong:
-                self._last_pong[websocket] = time.monotonic()
+                self._last_pong[websocket] = self._clock()
 
     async def get_last_pong(self, websocket: WebSocket) -> float | None:
         async with self._lock:
             return self._last_pong.get(websocket)
 
+    async def record_clock_sample(
+        self, websocket: WebSocket, t0: float, t1: float, t2: float, t3: float, role: str | None = None
+    ) -> ClockEstimate | None:
+        """Fold a ping/pong exchange into the connection's clock estimate and the RTT histogram."""
+        async with self._lock:
+            if websocket not in self._last_pong:
+                return None
+            estimate = self._clocks.get(websocket)
+            if estimate is None:
+                estimate = self._clocks[websocket] = ClockEstimate()
+            rtt_ms = estimate.add_sample(t0, t1, t2, t3)
+        metrics.WS_RTT_SECONDS.observe(rtt_ms / 1000, metrics.role_label(role))
+        return estimate
+
+    async def get_clock_estimate(self, websocket: WebSocket) -> ClockEstimate | None:
+        async with self._lock:
+            return self._clocks.get(websocket)
+
+    async def subscribe(self, websocket: WebSocket, session_codes: List[str]) -> Set[str]:
+        """Add session codes to a multiplexed subscriber. Returns its full subscription set."""
+        async with self._lock:
+            codes = self._subscriptions.setdefault(websocket, set())
+            self._last_pong.setdefault(websocket, self._clock())
+            for code in session_codes:
+                codes.add(code)
+                self._subscribers.setdefault(code, set()).add(websocket)
+            return set(codes)
+
+    async def unsubscribe(self, websocket: WebSocket, session_codes: List[str] | None = None) -> Set[str]:
+        """Remove session codes (all of them if None) from a subscriber. Returns what remains."""
+        async with self._lock:
+            codes = self._subscriptions.get(websocket, set())
+            for code in list(codes if session_codes is None else session_codes):
+                codes.discard(code)
+                watchers = self._subscribers.get(code)
+                if watchers is not None:
+                    watchers.discard(websocket)
+                    if not watchers:
+                        del self._subscribers[code]
+            if session_codes is None:
+                self._subscriptions.pop(websocket, None)
+                self._last_pong.pop(websocket, None)
+                self._clocks.pop(websocket, None)
+                for pending in self._pending.values():
+                    pending.pop(websocket, None)
+                self._outboxes.pop(websocket, None)
+            return set(codes)
+
+    async def drop_subscribers(self, session_code: str):
+        """Forget every subscription to a session that no longer exists."""
+        async with self._lock:
+            for websocket in self._subscribers.pop(session_code, set()):
+                self._subscriptions.get(websocket, set()).discard(session_code)
+
     async def get_all_connections(self) -> list[tuple[str, str, WebSocket]]:
-        """Return (session_code, role, websocket) for every active connection."""
+        """Return (session_code, role, websocket) for every active connection.
+
+        Multiplexed subscribers appear once, with session code "*" and role "subscriber".
+        """
         async with self._lock:
             return [
                 (code, role, ws)
                 for code, roles in self.active_connections.items()
                 for role, ws in roles.items()
-            ]
+            ] + [("*", "subscriber", ws) for ws in self._subscriptions]
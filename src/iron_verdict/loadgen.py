@@ -0,0 +1,305 @@
+"""
+Load generator: simulated meets over real WebSockets.
+
+Each simulated session has three judge bots and a number of display bots
+going through full lifts: the head judge starts the clock, the judges lock
+their votes with a random stagger, every display waits for ``show_results``
+and the head judge moves on with ``next_lift``. Optional churn drops and
+reconnects a random bot between lifts, judges with their reconnect token.
+
+Latency is measured per display, from the sending of the deciding vote to
+that display receiving ``show_results``. Bots and server share a clock, so
+run them on the same machine.
+
+    python -m iron_verdict.loadgen --sessions 50 --displays 4 --lifts 10
+    python -m iron_verdict.loadgen --url http://localhost:8000 --churn 0.1 --json load.json
+
+Without ``--url`` a server is started in a subprocess with rate limiting
+off. A server given with ``--url`` needs ``RATE_LIMIT_ENABLED=false`` too,
+since every simulated session is created from one address.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Any, Dict, List
+
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed
+
+JUDGE_ROLES = ("left_judge", "center_judge", "right_judge")
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.messages = 0
+        self.lifts = 0
+        self.timeouts = 0
+        self.reconnects = 0
+        self.errors: List[str] = []
+
+
+def percentile(sorted_values: List[float], p: float) -> float | None:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = math.ceil(p / 100 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+class Bot:
+    """One client connection: joins a role, answers heartbeats and hands messages to `inbox`."""
+
+    def __init__(self, ws_url: str, session_code: str, role: str, stats: Stats, origin: str | None = None):
+        self.ws_url = ws_url
+        self.session_code = session_code
+        self.role = role
+        self.stats = stats
+        self.origin = origin
+        self.reconnect_token: str | None = None
+        self.inbox = lambda message, received_at: None
+        self._ws = None
+        self._reader: asyncio.Task | None = None
+
+    async def connect(self) -> None:
+        self._ws = await connect(self.ws_url, origin=self.origin, open_timeout=30)
+        join = {"type": "join", "session_code": self.session_code, "role": self.role}
+        if self.reconnect_token:
+            join["reconnect_token"] = self.reconnect_token
+        await self.send(join)
+        while True:
+            message = json.loads(await self._ws.recv())
+            if message["type"] == "join_success":
+                self.reconnect_token = message.get("reconnect_token") or self.reconnect_token
+                break
+            if message["type"] == "join_error":
+                raise RuntimeError(f"{self.role} could not join {self.session_code}: {message['message']}")
+        self._reader = asyncio.create_task(self._read())
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        await self._ws.send(json.dumps(message))
+
+    async def _read(self) -> None:
+        try:
+            async for raw in self._ws:
+                received_at = time.perf_counter()
+                frame = json.loads(raw)
+                for message in frame["messages"] if frame.get("type") == "batch" else [frame]:
+                    self.stats.messages += 1
+                    if message.get("type") == "ping":
+                        now = time.time() * 1000
+                        await self.send({"type": "pong", "t0": message["t0"], "t1": now, "t2": now})
+                    else:
+                        self.inbox(message, received_at)
+        except ConnectionClosed:
+            pass
+
+    async def close(self) -> None:
+        if self._ws is not None:
+            await self._ws.close()
+        if self._reader is not None:
+            await self._reader
+
+    async def reconnect(self) -> None:
+        await self.close()
+        await self.connect()
+        self.stats.reconnects += 1
+
+
+def _create_session(base_url: str, name: str) -> str:
+    request = urllib.request.Request(
+        f"{base_url}/api/sessions",
+        data=json.dumps({"name": name}).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.loads(response.read())["session_code"]
+
+
+async def run_session(
+    base_url: str,
+    index: int,
+    displays: int,
+    lifts: int,
+    stagger: float,
+    churn: float,
+    timeout: float,
+    stats: Stats,
+    rng: random.Random,
+    origin: str | None = None,
+) -> None:
+    code = await asyncio.to_thread(_create_session, base_url, f"Load test {index}")
+    ws_url = base_url.replace("http", "ws", 1) + "/ws"
+    judges = {role: Bot(ws_url, code, role, stats, origin) for role in JUDGE_ROLES}
+    screens = [Bot(ws_url, code, "display", stats, origin) for _ in range(displays)]
+    head = judges["center_judge"]
+
+    # Per-lift state the inbox callbacks read
+    lift: Dict[str, Any] = {"decided_at": None, "waiting": set(), "done": asyncio.Event(), "reset": asyncio.Event()}
+
+    def display_inbox(bot: Bot):
+        def inbox(message, received_at):
+            if message["type"] == "show_results" and bot in lift["waiting"] and lift["decided_at"] is not None:
+                stats.latencies.append(received_at - lift["decided_at"])
+                lift["waiting"].discard(bot)
+                if not lift["waiting"]:
+                    lift["done"].set()
+        return inbox
+
+    def head_inbox(message, received_at):
+        if message["type"] == "reset_for_next_lift":
+            lift["reset"].set()
+
+    for bot in screens:
+        bot.inbox = display_inbox(bot)
+    head.inbox = head_inbox
+
+    await asyncio.gather(*(bot.connect() for bot in (*judges.values(), *screens)))
+    try:
+        for _ in range(lifts):
+            lift.update(decided_at=None, waiting=set(screens), done=asyncio.Event(), reset=asyncio.Event())
+            await head.send({"type": "timer_start"})
+
+            async def vote(bot: Bot) -> None:
+                await asyncio.sleep(rng.uniform(0, stagger))
+                # The last vote sent is the deciding one
+                lift["decided_at"] = time.perf_counter()
+                await bot.send({"type": "vote_lock", "color": "white" if rng.random() < 0.8 else "red"})
+
+            await asyncio.gather(*(vote(bot) for bot in judges.values()))
+            if screens:
+                try:
+                    await asyncio.wait_for(lift["done"].wait(), timeout)
+                except asyncio.TimeoutError:
+                    stats.timeouts += len(lift["waiting"])
+
+            if churn and rng.random() < churn:
+                await rng.choice([*judges.values(), *screens]).reconnect()
+
+            await head.send({"type": "next_lift"})
+            try:
+                await asyncio.wait_for(lift["reset"].wait(), timeout)
+            except asyncio.TimeoutError:
+                stats.errors.append(f"{code}: no reset_for_next_lift")
+                return
+            stats.lifts += 1
+    finally:
+        await asyncio.gather(*(bot.close() for bot in (*judges.values(), *screens)), return_exceptions=True)
+
+
+async def run(args: argparse.Namespace, base_url: str) -> Dict[str, Any]:
+    stats = Stats()
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(
+            run_session(
+                base_url, i, args.displays, args.lifts, args.stagger_ms / 1000, args.churn,
+                args.timeout, stats, random.Random(rng.random()), args.origin,
+            )
+            for i in range(args.sessions)
+        ),
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - started
+    stats.errors.extend(f"{type(r).__name__}: {r}" for r in results if isinstance(r, BaseException))
+    latencies = sorted(stats.latencies)
+    ms = lambda value: round(value * 1000, 2) if value is not None else None  # noqa: E731
+    return {
+        "sessions": args.sessions,
+        "displays_per_session": args.displays,
+        "lifts_completed": stats.lifts,
+        "elapsed_s": round(elapsed, 2),
+        "lifts_per_s": round(stats.lifts / elapsed, 2),
+        "messages_received_per_s": round(stats.messages / elapsed, 1),
+        "results_latency_ms": {
+            "samples": len(latencies),
+            "p50": ms(percentile(latencies, 50)),
+            "p99": ms(percentile(latencies, 99)),
+            "p999": ms(percentile(latencies, 99.9)),
+            "max": ms(latencies[-1] if latencies else None),
+        },
+        "display_timeouts": stats.timeouts,
+        "reconnects": stats.reconnects,
+        "errors": stats.errors[:20],
+    }
+
+
+def start_server(display_cap: int) -> tuple:
+    """Start the app with uvicorn in a subprocess on a free port. Returns (process, base URL)."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    env = {
+        **os.environ,
+        "RATE_LIMIT_ENABLED": "false",
+        "DISPLAY_CAP": str(max(display_cap, 20)),
+        "LOG_LEVEL": "WARNING",
+        "SNAPSHOT_PATH": os.path.join(tempfile.mkdtemp(prefix="iron-verdict-load-"), "sessions.json"),
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "iron_verdict.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        # The app logs JSON to stdout; keep it out of the report
+        stdout=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        if process.poll() is not None:
+            raise RuntimeError("Load test server exited during startup")
+        try:
+            urllib.request.urlopen(f"{base_url}/health", timeout=1)
+            return process, base_url
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Load test server failed to start")
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate full meets against an Iron Verdict server")
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent sessions (platforms)")
+    parser.add_argument("--displays", type=int, default=3, help="Display bots per session")
+    parser.add_argument("--lifts", type=int, default=10, help="Lifts per session")
+    parser.add_argument("--stagger-ms", type=float, default=500, help="Judges vote at random within this window")
+    parser.add_argument("--churn", type=float, default=0.0, help="Chance per lift that a random bot reconnects")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Seconds to wait for results or a reset")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--url", help="Use a running server instead of starting one")
+    parser.add_argument("--origin", help="Origin header, for servers with ALLOWED_ORIGIN set")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    process = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        process, base_url = start_server(args.displays)
+    try:
+        report = asyncio.run(run(args, base_url))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["errors"] or report["display_timeouts"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,37 @@
+import atexit
+import fnmatch
 import json
 import logging
+import queue
 import sys
+import time
 from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict
+
+from iron_verdict import metrics
 
 _EXTRA_FIELDS = (
     "session_code", "role", "client_ip", "color",
     "position", "all_locked", "reason", "origin", "conn_id",
+    "rtt_ms", "offset_ms", "duration_ms", "handler", "stack",
+    "error", "count", "path",
 )
 
+LOG_RECORDS_DROPPED = metrics.REGISTRY.register(metrics.Counter(
+    "iron_verdict_log_records_dropped_total",
+    "Log records discarded before being written",
+    label="reason",
+    values=("queue_full", "rate_limited", "shutdown"),
+))
+
+# Seconds shutdown waits on the writer thread before abandoning what it hasn't written
+STOP_TIMEOUT = 5
+
+_listener: QueueListener | None = None
+_handler: logging.Handler | None = None
+
+
 class JsonFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         log_obj = {
@@ -21,11 +45,126 @@ class JsonFormatter(logging.Formatter):
         return json.dumps(log_obj)
 
 
-def setup_logging(log_level: str = "INFO") -> None:
-    """Configure root 'iron_verdict' logger with JSON output to stdout."""
+def parse_rate_limits(spec: str) -> Dict[str, float]:
+    """Parse ``"heartbeat_*=10,vote_locked=50"`` into {event pattern: records per second}."""
+    limits = {}
+    for part in spec.split(","):
+        pattern, _, rate = part.partition("=")
+        if pattern.strip() and rate.strip():
+            limits[pattern.strip()] = float(rate)
+    return limits
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let at most N records per second through for each event matching a pattern.
+
+    Events are the log message (``heartbeat_send_failed``); patterns are
+    globs. Warnings and errors are limited too: a reconnect storm produces
+    them by the hundred, and the drop counter keeps the total visible.
+    """
+
+    def __init__(self, limits: Dict[str, float], clock=time.monotonic):
+        super().__init__()
+        self.limits = limits
+        self._clock = clock
+        # {event: (window start, records let through in the window)}
+        self._windows: Dict[str, tuple] = {}
+        self._resolved: Dict[str, float | None] = {}
+
+    def _limit(self, event: str) -> float | None:
+        if event not in self._resolved:
+            self._resolved[event] = next(
+                (rate for pattern, rate in self.limits.items() if fnmatch.fnmatchcase(event, pattern)),
+                None,
+            )
+        return self._resolved[event]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        event = record.msg if isinstance(record.msg, str) else str(record.msg)
+        limit = self._limit(event)
+        if limit is None:
+            return True
+        now = self._clock()
+        start, count = self._windows.get(event, (now, 0))
+        if now - start >= 1.0:
+            start, count = now, 0
+        if count >= limit:
+            LOG_RECORDS_DROPPED.inc("rate_limited")
+            return False
+        self._windows[event] = (start, count + 1)
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Hand records to the writer thread without ever blocking the caller.
+
+    Formatting happens on the writer thread; here the record is only detached
+    from its arguments and traceback. When the queue is full the record is
+    dropped and counted.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc("queue_full")
+
+
+class _Listener(QueueListener):
+    def stop(self) -> None:
+        # The queue may be full; the writer thread is draining it, so wait for room
+        try:
+            self.queue.put(self._sentinel, timeout=STOP_TIMEOUT)
+        except queue.Full:
+            pass
+        else:
+            self._thread.join(timeout=STOP_TIMEOUT)
+        if self._thread.is_alive():
+            # The writer is blocked, e.g. on a stalled stdout; don't hold up shutdown for it
+            dropped = self.queue.qsize()
+            LOG_RECORDS_DROPPED.inc("shutdown", amount=dropped)
+            print(f"iron_verdict: log writer stuck at shutdown, {dropped} records dropped", file=sys.stderr)
+        self._thread = None
+
+
+def setup_logging(log_level: str = "INFO", queue_size: int = 10000, rate_limits: str = "") -> None:
+    """Configure root 'iron_verdict' logger with JSON output to stdout, written by a background thread."""
+    global _listener, _handler
     logger = logging.getLogger("iron_verdict")
     if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setFormatter(JsonFormatter())
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(JsonFormatter())
+        records: queue.Queue = queue.Queue(maxsize=queue_size)
+        handler = DroppingQueueHandler(records)
+        limits = parse_rate_limits(rate_limits)
+        if limits:
+            handler.addFilter(RateLimitFilter(limits))
         logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
         logger.addHandler(handler)
+        _handler = handler
+        _listener = _Listener(records, output)
+        _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Write out everything still queued and stop the writer thread."""
+    global _listener, _handler
+    if _handler is not None:
+        logging.getLogger("iron_verdict").removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        listener, _listener = _listener, None
+        listener.stop()
+
+
+atexit.register(shutdown_logging)
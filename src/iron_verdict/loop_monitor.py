@@ -0,0 +1,113 @@
+"""
+Event-loop lag sampling and slow-callback attribution.
+
+A coroutine on the loop sleeps for a fixed interval and measures how late it
+wakes up; any lateness is time some other callback held the loop. A watchdog
+thread watches the same heartbeat, and when the loop has been stuck past the
+threshold it samples the loop thread's stack, so the stall can be attributed
+to the handler or background loop that caused it.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List
+
+from iron_verdict import metrics
+
+logger = logging.getLogger("iron_verdict")
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _package_stack(frame, limit: int = 6) -> List[str]:
+    """``module.function:line`` for the package's own frames, outermost first."""
+    stack: List[str] = []
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(_PACKAGE_DIR) and filename != os.path.abspath(__file__):
+            module = os.path.splitext(os.path.basename(filename))[0]
+            stack.append(f"{module}.{frame.f_code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    stack.reverse()
+    return stack[-limit:]
+
+
+class LoopMonitor:
+    """
+    Samples event-loop lag every `interval` seconds and records stalls longer
+    than `slow_threshold` seconds with the stack that caused them.
+
+    Start ``run()`` as a task on the loop being watched.
+    """
+
+    def __init__(self, interval: float = 0.25, slow_threshold: float = 0.1, history: int = 20):
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.lag_last = 0.0
+        self.lag_max = 0.0
+        self.slow_callbacks: deque = deque(maxlen=history)
+        self._beat = time.monotonic()
+        self._loop_thread: int | None = None
+        # Written by the watchdog thread, consumed by the loop once it wakes up
+        self._stall_stack: List[str] | None = None
+
+    async def run(self) -> None:
+        self._loop_thread = threading.get_ident()
+        stop = threading.Event()
+        watchdog = threading.Thread(target=self._watch, args=(stop,), name="loop-watchdog", daemon=True)
+        watchdog.start()
+        try:
+            while True:
+                self._beat = expected = time.monotonic()
+                await asyncio.sleep(self.interval)
+                woke = time.monotonic()
+                self._beat = woke
+                self.record(max(0.0, woke - expected - self.interval))
+        finally:
+            stop.set()
+
+    def record(self, lag: float) -> None:
+        """Account one lag sample; stalls past the threshold are logged with their stack."""
+        self.lag_last = lag
+        self.lag_max = max(self.lag_max, lag)
+        metrics.LOOP_LAG_SECONDS.observe(lag)
+        stack, self._stall_stack = self._stall_stack, None
+        if lag < self.slow_threshold:
+            return
+        handler = stack[0].split(":")[0] if stack else "unknown"
+        metrics.SLOW_CALLBACKS.inc(handler)
+        entry = {
+            "at": time.time(),
+            "duration_ms": round(lag * 1000, 1),
+            "handler": handler,
+            "stack": stack or [],
+        }
+        self.slow_callbacks.append(entry)
+        logger.warning("slow_callback", extra={k: v for k, v in entry.items() if k != "at"})
+
+    def _watch(self, stop: threading.Event) -> None:
+        poll = max(self.slow_threshold / 2, 0.005)
+        sampled_beat = None
+        while not stop.wait(poll):
+            beat = self._beat
+            if beat == sampled_beat:
+                continue  # already sampled this stall
+            if time.monotonic() - beat < self.interval + self.slow_threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is not None:
+                self._stall_stack = _package_stack(frame)
+            sampled_beat = beat
+
+    def details(self) -> Dict[str, Any]:
+        return {
+            "lag_ms": round(self.lag_last * 1000, 1),
+            "lag_max_ms": round(self.lag_max * 1000, 1),
+            "slow_threshold_ms": round(self.slow_threshold * 1000, 1),
+            "slow_callbacks": list(self.slow_callbacks),
+        }
@@ -1,10 +1,17 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
 from pydantic import BaseModel, field_validator
-from fastapi.responses import HTMLResponse, JSONResponse, Response
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+from starlette.websockets import WebSocketState
+from iron_verdict import metrics, profiler, tracing, vendor
+from iron_verdict.assets import CompressedAsset, StaticAssets, negotiate_language
 from iron_verdict.config import settings
-from iron_verdict.session import SessionManager
+from iron_verdict.session import SessionManager, TIMER_DURATION_MS
 from iron_verdict.connection import ConnectionManager
+from iron_verdict.timer_wheel import TimerWheel
+from iron_verdict.spectator import SpectatorHub
+from iron_verdict.qr import FORMATS as QR_FORMATS, QrCache, render_uncached
+from iron_verdict.loop_monitor import LoopMonitor
+from iron_verdict.recorder import RecordingMiddleware, recorder
 import asyncio
 import signal
 from contextlib import asynccontextmanager
@@ -13,20 +20,31 @@ import copy
 import time
 import os
 import secrets
+import hashlib
+import threading
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-from starlette.middleware.base import BaseHTTPMiddleware
 import logging
-from iron_verdict.logging_config import setup_logging
+from iron_verdict.logging_config import setup_logging, shutdown_logging
 
 logger = logging.getLogger("iron_verdict")
 
 VALID_COLORS = {"white", "red", "blue", "yellow"}
+# Distinguishes ETags across restarts, when per-session versions start over
+_BOOT_ID = secrets.token_hex(4)
 HEARTBEAT_INTERVAL_SECONDS = 30
 PONG_STALE_SECONDS = 70
 
 
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _is_timestamp(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
 def _get_http_client_ip(request: Request) -> str:
     fwd = request.headers.get("x-forwarded-for")
     return fwd.split(",")[0].strip() if fwd else (request.client.host if request.client else "unknown")
@@ -48,7 +66,7 @@ class CreateSessionRequest(BaseModel):
         return v.strip()
 
 
-_CSP = (
+_CSP_ONLINE = (
     "default-src 'self'; "
     "script-src 'self' https://cdn.jsdelivr.net https://umami-production-ca4a.up.railway.app 'unsafe-inline' 'unsafe-eval'; "
     "connect-src 'self' ws: wss: https://api.web3forms.com https://umami-production-ca4a.up.railway.app; "
@@ -57,26 +75,176 @@ _CSP = (
     "font-src 'self' https://fonts.gstatic.com"
 )
 
+# OFFLINE_ASSETS: Alpine and fonts are served from /static/vendor
+# and analytics is dropped, so no third-party host is on the page load path
+_CSP_OFFLINE = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+    "connect-src 'self' ws: wss: https://api.web3forms.com; "
+    "style-src 'self' 'unsafe-inline'; "
+    "img-src 'self' data:; "
+    "font-src 'self'"
+)
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        response = await call_next(request)
-        response.headers["Content-Security-Policy"] = _CSP
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["Referrer-Policy"] = "no-referrer"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        return response
+_CSP = _CSP_OFFLINE if settings.OFFLINE_ASSETS else _CSP_ONLINE
+
+_ANALYTICS_TAG = (
+    '<script defer src="https://umami-production-ca4a.up.railway.app/script.js" '
+    'data-website-id="aca70c7a-7634-4ae5-bffa-cc83d8764bd0"></script>'
+)
 
 
-limiter = Limiter(key_func=get_remote_address)
+class SecurityHeadersMiddleware:
+    """
+    Adds the security headers to every HTTP response.
+
+    Plain ASGI rather than BaseHTTPMiddleware: the header block is encoded
+    once and appended to ``http.response.start``, with no per-request task
+    or response stream wrapping.
+    """
+
+    def __init__(self, app, csp: str = _CSP):
+        self.app = app
+        self.headers = [
+            (b"content-security-policy", csp.encode("latin-1")),
+            (b"x-content-type-options", b"nosniff"),
+            (b"x-frame-options", b"DENY"),
+            (b"referrer-policy", b"no-referrer"),
+            (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+        ]
+        self._names = frozenset(name for name, _ in self.headers)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                # Ours replace any the route set itself, as before
+                headers = [h for h in message.get("headers", ()) if h[0].lower() not in self._names]
+                headers.extend(self.headers)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+limiter = Limiter(key_func=get_remote_address, enabled=settings.RATE_LIMIT_ENABLED)
 session_manager = SessionManager()
-connection_manager = ConnectionManager()
+spectator_hub = SpectatorHub(
+    buffer_size=settings.SPECTATOR_BUFFER_SIZE,
+    max_subscribers=settings.SPECTATOR_CAP,
+)
+qr_cache = QrCache()
+tracing.tracer.configure(settings.TRACING_ENABLED, settings.TRACE_BUFFER_SIZE, settings.TRACE_EXPORT_PATH)
+loop_monitor = LoopMonitor(
+    interval=settings.LOOP_LAG_INTERVAL_MS / 1000,
+    slow_threshold=settings.SLOW_CALLBACK_MS / 1000,
+)
+connection_manager = ConnectionManager(
+    batch_window_ms=settings.BATCH_WINDOW_MS,
+    batch_max_messages=settings.BATCH_MAX_MESSAGES,
+    spectators=spectator_hub,
+    failure_summary_seconds=settings.SEND_FAILURE_SUMMARY_SECONDS,
+)
+
+metrics.REGISTRY.register(metrics.Gauge(
+    "iron_verdict_sessions_active",
+    "Sessions currently held in memory",
+    lambda: len(session_manager.sessions),
+))
+metrics.REGISTRY.register(metrics.Gauge(
+    "iron_verdict_connections",
+    "Open connections by role; spectators are SSE streams",
+    lambda: {**connection_manager.count_by_role(), "spectator": spectator_hub.total_subscribers()},
+    label="role",
+))
+
+
+async def _on_timer_expired(session_code: str) -> None:
+    if session_code not in session_manager.sessions:
+        return
+    logger.info("timer_expired", extra={"session_code": session_code})
+    await connection_manager.broadcast_to_session(session_code, {"type": "timer_expired"})
+
+
+async def _on_timer_tick(session_code: str, time_remaining_ms: int) -> None:
+    if session_code not in session_manager.sessions:
+        return
+    deadline = session_manager.timer_deadline(session_code)
+    await connection_manager.broadcast_to_session(
+        session_code,
+        {
+            "type": "timer_tick",
+            "time_remaining_ms": time_remaining_ms,
+            "deadline_ms": int(deadline * 1000) if deadline is not None else None,
+        },
+    )
+
+
+timer_wheel = TimerWheel(
+    on_expire=_on_timer_expired,
+    on_tick=_on_timer_tick,
+    tick_interval=settings.TIMER_TICK_SECONDS,
+)
+
+async def expire_sessions() -> list[str]:
+    """Delete sessions past SESSION_TIMEOUT_HOURS along with their clocks, streams, subscriptions and QR codes."""
+    expired = session_manager.cleanup_expired(settings.SESSION_TIMEOUT_HOURS)
+    for code in expired:
+        timer_wheel.cancel(code)
+        spectator_hub.close(code)
+        await connection_manager.drop_subscribers(code)
+        qr_cache.evict(code)
+    return expired
+
+
+async def check_heartbeats(now: float | None = None) -> None:
+    """Close connections silent for over PONG_STALE_SECONDS and ping the rest."""
+    now = time.monotonic() if now is None else now
+    for session_code, role, ws in await connection_manager.get_all_connections():
+        last_pong = await connection_manager.get_last_pong(ws)
+        if last_pong is not None and now - last_pong > PONG_STALE_SECONDS:
+            metrics.HEARTBEAT_STALE_CLOSES.inc()
+            logger.info("heartbeat_stale_close", extra={
+                "session_code": session_code,
+                "role": "display" if role.startswith("display_") else role,
+                "seconds_since_pong": round(now - last_pong, 1),
+            })
+            try:
+                await ws.close(code=1001)
+            except Exception as exc:
+                logger.warning("heartbeat_close_failed", extra={"reason": str(exc)})
+            continue
+        try:
+            await ws.send_json({"type": "ping", "t0": _now_ms()})
+        except Exception as exc:
+            logger.warning("heartbeat_send_failed", extra={
+                "session_code": session_code,
+                "role": "display" if role.startswith("display_") else role,
+                "reason": str(exc),
+            })
+
+
+def _save_snapshot() -> None:
+    with metrics.SNAPSHOT_SAVE_SECONDS.time():
+        session_manager.save_snapshot(settings.SNAPSHOT_PATH)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    setup_logging(settings.LOG_LEVEL)
-    session_manager.load_snapshot(settings.SNAPSHOT_PATH)
+    setup_logging(settings.LOG_LEVEL, settings.LOG_QUEUE_SIZE, settings.LOG_RATE_LIMITS)
+    if settings.RECORD_PATH:
+        recorder.start(settings.RECORD_PATH)
+        logger.info("recording_started", extra={"path": settings.RECORD_PATH})
+    with metrics.SNAPSHOT_LOAD_SECONDS.time():
+        session_manager.load_snapshot(settings.SNAPSHOT_PATH)
+    # Resume clocks that were running when the snapshot was taken
+    for code, deadline in session_manager.running_timers().items():
+        timer_wheel.schedule(code, deadline)
+    if settings.PROFILE_STARTUP and profiler.finish_startup_profile(settings.PROFILE_STARTUP):
+        logger.info("startup_profile_written", extra={"path": settings.PROFILE_STARTUP})
 
     loop = asyncio.get_running_loop()
     uvicorn_server = getattr(app.state, "uvicorn_server", None)
@@ -84,12 +252,13 @@ async def lifespan(app: FastAPI):
     if uvicorn_server:
         async def _handle_shutdown():
             logger.info("server_shutdown_started")
-            session_manager.save_snapshot(settings.SNAPSHOT_PATH)
+            _save_snapshot()
             for session_code in list(connection_manager.active_connections.keys()):
                 await connection_manager.broadcast_to_session(
                     session_code,
                     {"type": "server_restarting"}
                 )
+                await connection_manager.flush(session_code)
             uvicorn_server.should_exit = True
 
         _shutdown_triggered = False
@@ -112,41 +281,33 @@ async def lifespan(app: FastAPI):
         while True:
             await asyncio.sleep(60)
             elapsed += 60
-            session_manager.save_snapshot(settings.SNAPSHOT_PATH)
+            _save_snapshot()
             if elapsed >= 30 * 60:
                 elapsed = 0
-                session_manager.cleanup_expired(settings.SESSION_TIMEOUT_HOURS)
+                await expire_sessions()
 
     task = asyncio.create_task(_cleanup_loop())
 
     async def _heartbeat_loop():
         while True:
             await asyncio.sleep(HEARTBEAT_INTERVAL_SECONDS)
-            now = time.monotonic()
-            for session_code, role, ws in await connection_manager.get_all_connections():
-                last_pong = await connection_manager.get_last_pong(ws)
-                if last_pong is not None and now - last_pong > PONG_STALE_SECONDS:
-                    logger.info("heartbeat_stale_close", extra={
-                        "session_code": session_code,
-                        "role": "display" if role.startswith("display_") else role,
-                        "seconds_since_pong": round(now - last_pong, 1),
-                    })
-                    try:
-                        await ws.close(code=1001)
-                    except Exception as exc:
-                        logger.warning("heartbeat_close_failed", extra={"reason": str(exc)})
-                    continue
-                try:
-                    await ws.send_json({"type": "ping"})
-                except Exception as exc:
-                    logger.warning("heartbeat_send_failed", extra={
-                        "session_code": session_code,
-                        "role": "display" if role.startswith("display_") else role,
-                        "reason": str(exc),
-                    })
+            await check_heartbeats()
 
     heartbeat_task = asyncio.create_task(_heartbeat_loop())
+    timer_task = asyncio.create_task(timer_wheel.run())
+    monitor_task = asyncio.create_task(loop_monitor.run()) if settings.LOOP_LAG_INTERVAL_MS > 0 else None
     yield
+    if monitor_task is not None:
+        monitor_task.cancel()
+        try:
+            await monitor_task
+        except asyncio.CancelledError:
+            pass
+    timer_task.cancel()
+    try:
+        await timer_task
+    except asyncio.CancelledError:
+        pass
     task.cancel()
     try:
         await task
@@ -159,10 +320,13 @@ async def lifespan(app: FastAPI):
         pass
 
     # Fallback snapshot save for shutdowns not triggered via signal handler
-    session_manager.save_snapshot(settings.SNAPSHOT_PATH)
+    _save_snapshot()
+    recorder.stop()
+    shutdown_logging()
 
 app = FastAPI(title="Iron Verdict", lifespan=lifespan)
 app.add_middleware(SecurityHeadersMiddleware)
+app.add_middleware(RecordingMiddleware, recorder=recorder)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
@@ -174,24 +338,176 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 # Serve static files
 static_dir = os.path.join(os.path.dirname(__file__), "static")
-app.mount("/static", StaticFiles(directory=static_dir), name="static")
+if settings.OFFLINE_ASSETS and (missing := vendor.missing_files()):
+    raise RuntimeError(
+        f"OFFLINE_ASSETS is enabled but vendored files are missing or corrupt: {', '.join(missing)}. "
+        "Run `python -m iron_verdict.vendor` first."
+    )
+static_assets = StaticAssets(static_dir, exclude=("index.html", "display.html", "sw.js"))
+app.mount("/static", static_assets, name="static")
 
 
 @app.get("/health")
-async def health():
-    return {"status": "ok"}
+async def health(request: Request, details: bool = False):
+    if not details:
+        return {"status": "ok"}
+    # Stall stacks show code layout, so the details are admin-only; the plain probe stays public
+    if (denied := _admin_denied(request)) is not None:
+        return denied
+    return {"status": "ok", "event_loop": loop_monitor.details()}
+
+
+def _admin_denied(request: Request) -> Response | None:
+    """The error response for an admin-only request without the admin token, or None if allowed."""
+    # Without ADMIN_TOKEN the admin-only endpoints don't exist
+    if not settings.ADMIN_TOKEN:
+        return JSONResponse(status_code=404, content={"detail": "Not Found"})
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), settings.ADMIN_TOKEN.encode()):
+        return JSONResponse(status_code=401, content={"detail": "Unauthorized"}, headers={"WWW-Authenticate": "Bearer"})
+    return None
+
+
+@app.get("/debug/traces")
+async def debug_traces(request: Request, limit: int = 20, format: str = "json"):
+    if (denied := _admin_denied(request)) is not None:
+        return denied
+    if format == "otlp":
+        return tracing.tracer.to_otlp(limit)
+    return {"enabled": tracing.tracer.enabled, "traces": tracing.tracer.recent(limit)}
+
+
+_profile_lock = asyncio.Lock()
+
+
+@app.get("/debug/profile")
+async def debug_profile(request: Request, seconds: float = 10, format: str = "collapsed", interval_ms: float = 5):
+    """
+    Profile the event loop for `seconds` and return the result.
+
+    ``collapsed`` (default) samples the loop's stack from another thread and
+    returns flame-graph input; ``pstats`` runs cProfile on the loop and
+    returns a file for ``python -m pstats``.
+    """
+    if (denied := _admin_denied(request)) is not None:
+        return denied
+    if not 0 < seconds <= 60 or not 1 <= interval_ms <= 1000:
+        return JSONResponse(status_code=422, content={"detail": "seconds must be in (0, 60], interval_ms in [1, 1000]"})
+    if format not in ("collapsed", "pstats"):
+        return JSONResponse(status_code=422, content={"detail": "format must be collapsed or pstats"})
+    if _profile_lock.locked():
+        return JSONResponse(status_code=409, content={"detail": "A profile is already running"})
+    async with _profile_lock:
+        logger.info("profile_started", extra={"duration_ms": seconds * 1000})
+        if format == "pstats":
+            with profiler.ProfileSession() as session:
+                await asyncio.sleep(seconds)
+            return Response(
+                session.pstats_bytes(),
+                media_type="application/octet-stream",
+                headers={"Content-Disposition": 'attachment; filename="iron-verdict.pstats"'},
+            )
+        counts = await asyncio.to_thread(profiler.sample, threading.get_ident(), seconds, interval_ms / 1000)
+        return Response(profiler.collapsed(counts), media_type="text/plain")
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics")
+    async def prometheus_metrics():
+        return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+LOCALES = ("en", "de")
+DEFAULT_LOCALE = "en"
+# Mirrors the client's localStorage preference so the server can pick the page variant
+LOCALE_COOKIE = "iron-verdict-lang"
+
+
+def _locale_data(lang: str) -> str:
+    """The locale to inline in a page, plus every locale's URL for switching later."""
+    with open(os.path.join(static_dir, "locales", f"{lang}.json"), encoding="utf-8") as f:
+        messages = json.load(f)
+    data = {
+        "lang": lang,
+        "messages": messages,
+        "urls": {code: f"/static/locales/{code}.json" for code in LOCALES},
+    }
+    # Keep "</script>" in a translation from closing the inline block
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+
+
+def render_page(name: str, offline: bool, lang: str = DEFAULT_LOCALE):
+    """Render an HTML page for this deploy; `offline` points third-party assets at /static/vendor."""
+    replacements = {
+        "__APP_VERSION__": settings.APP_VERSION,
+        "__LANG__": lang,
+        "__LOCALE_DATA__": _locale_data(lang),
+    }
+    if offline:
+        replacements.update(vendor.local_urls())
+        replacements[_ANALYTICS_TAG] = ""
+    return static_assets.render_page(
+        os.path.join(static_dir, name),
+        replacements,
+        media_type="text/html; charset=utf-8",
+        vary="Accept-Encoding, Accept-Language, Cookie",
+    )
 
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    """Serve the main HTML page."""
-    with open(os.path.join(static_dir, "index.html"), encoding="utf-8") as f:
-        content = f.read().replace("__APP_VERSION__", settings.APP_VERSION)
-    return Response(
-        content=content,
-        media_type="text/html",
-        headers={"Cache-Control": "no-cache"},
+def pick_locale(request: Request) -> str:
+    """The stored preference cookie wins over Accept-Language."""
+    preferred = request.cookies.get(LOCALE_COOKIE)
+    if preferred in LOCALES:
+        return preferred
+    return negotiate_language(request.headers.get("accept-language", ""), LOCALES, DEFAULT_LOCALE)
+
+
+# Rendered once per process and locale; APP_VERSION is fixed for the lifetime of a deploy
+index_pages = {lang: render_page("index.html", settings.OFFLINE_ASSETS, lang) for lang in LOCALES}
+display_pages = {lang: render_page("display.html", settings.OFFLINE_ASSETS, lang) for lang in LOCALES}
+
+
+# Cached once by the service worker and served for every /display/{code}
+DISPLAY_SHELL = "/display/shell"
+
+
+def render_service_worker() -> CompressedAsset:
+    """Fill in sw.js with this deploy's shell and a cache name that changes whenever the shell does."""
+    shell = ["/", DISPLAY_SHELL] + sorted(static_assets.urls.values())
+    fingerprint = hashlib.sha256()
+    for url in shell:
+        fingerprint.update(url.encode())
+    for page in (*index_pages.values(), *display_pages.values()):
+        fingerprint.update(page.digest.encode())
+    with open(os.path.join(static_dir, "sw.js"), encoding="utf-8") as f:
+        content = f.read()
+    content = (
+        content.replace("__CACHE_NAME__", f"iron-verdict-{settings.APP_VERSION}-{fingerprint.hexdigest()[:8]}")
+        .replace("__PRECACHE__", json.dumps(shell))
+        .replace("__DISPLAY_SHELL__", DISPLAY_SHELL)
     )
+    return CompressedAsset(content.encode("utf-8"), "text/javascript")
+
+
+service_worker = render_service_worker()
+
+
+@app.get("/sw.js")
+async def sw(request: Request):
+    """App-shell service worker; must live at the root to control `/` and `/display/`."""
+    return service_worker.response(request)
+
+
+@app.get("/", response_class=HTMLResponse)
+async def root(request: Request):
+    """Serve the main HTML page, with the visitor's locale inlined."""
+    return index_pages[pick_locale(request)].response(request)
+
+
+@app.get("/display/{code}", response_class=HTMLResponse)
+async def display(code: str, request: Request):
+    """Display-only page for TVs. The session code is read client-side, so one cached page serves every session."""
+    return display_pages[pick_locale(request)].response(request)
 
 
 @app.post("/api/sessions")
@@ -199,10 +515,177 @@ async def root():
 async def create_session(request: Request, body: CreateSessionRequest):
     """Create a new judging session."""
     code = await session_manager.create_session(body.name)
+    # Lets a recording map this code to the one a replay gets
+    request.state.created_session = code
     logger.info("session_created", extra={"session_code": code, "client_ip": _get_http_client_ip(request)})
     return {"session_code": code}
 
 
+def _results_view(code: str):
+    state = session_manager.public_state(code)
+    if state is None:
+        return None
+    in_results = state["phase"] == "results"
+    return {
+        "phase": state["phase"],
+        "liftType": state["settings"]["lift_type"],
+        "showExplanations": state["settings"]["show_explanations"],
+        "votes": {pos: j["vote"] for pos, j in state["judges"].items()} if in_results else None,
+        "reasons": {pos: j["reason"] for pos, j in state["judges"].items()} if in_results else None,
+        "timer_frozen_ms": state["timer_frozen_ms"],
+    }
+
+
+async def _versioned_view(request: Request, code: str, view: str, build) -> Response:
+    """Serve a cached session view with a strong ETag, 304 revalidation and long-poll."""
+    code = code.upper()
+    if code not in session_manager.sessions:
+        return JSONResponse(status_code=404, content={"detail": "Session not found"})
+
+    wait_for = request.query_params.get("wait_for_version")
+    if wait_for is not None:
+        try:
+            target = int(wait_for)
+        except ValueError:
+            return JSONResponse(status_code=422, content={"detail": "wait_for_version must be an integer"})
+        await spectator_hub.wait_for_version(code, target, settings.LONG_POLL_TIMEOUT_SECONDS)
+
+    version, body = spectator_hub.render(code, view, build)
+    if body is None:
+        return JSONResponse(status_code=404, content={"detail": "Session not found"})
+    etag = f'"{_BOOT_ID}-{version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Session-Version": str(version)}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/api/sessions/{code}/state")
+async def session_state_view(code: str, request: Request):
+    """Public session view for polling integrations. Supports If-None-Match and ?wait_for_version=."""
+    return await _versioned_view(
+        request, code, "state", lambda: session_manager.public_state(code.upper())
+    )
+
+
+@app.get("/api/sessions/{code}/results")
+async def session_results_view(code: str, request: Request):
+    """Current lift's results (votes are null until all judges have locked)."""
+    return await _versioned_view(request, code, "results", lambda: _results_view(code.upper()))
+
+
+QR_ROLES = {"left_judge", "center_judge", "right_judge", "display"}
+
+
+def _public_origin(request: Request) -> str:
+    """The origin join links point at: ALLOWED_ORIGIN when set, else the request's own."""
+    # The Host header is client-controlled and, behind a proxy, the internal one
+    if settings.ALLOWED_ORIGIN != "*":
+        return settings.ALLOWED_ORIGIN.rstrip("/")
+    return str(request.base_url).rstrip("/")
+
+
+@app.get("/api/sessions/{code}/qr.{fmt}")
+async def session_qr(code: str, fmt: str, request: Request, role: str | None = None):
+    """Join-link QR code as SVG or PNG. With `role`, scanning joins directly in that role."""
+    code = code.upper()
+    if fmt not in QR_FORMATS:
+        return JSONResponse(status_code=404, content={"detail": "Unsupported format"})
+    if role is not None and role not in QR_ROLES:
+        return JSONResponse(status_code=422, content={"detail": "Invalid role"})
+    if code not in session_manager.sessions:
+        return JSONResponse(status_code=404, content={"detail": "Session not found"})
+
+    base = _public_origin(request)
+    if role == "display":
+        url = f"{base}/display/{code}"
+    elif role:
+        url = f"{base}/?session={code}&role={role}"
+    else:
+        url = f"{base}/?session={code}"
+    if settings.ALLOWED_ORIGIN == "*":
+        # Built from this request's Host header: right for this client only, so
+        # neither shared through the cache nor cacheable downstream
+        return (await render_uncached(url, fmt)).response(request)
+    return (await qr_cache.get(code, url, fmt)).response(request)
+
+
+@app.get("/api/sessions/{code}/events")
+async def session_events(code: str, request: Request):
+    """Server-Sent Events stream of a session's public events for passive spectators."""
+    code = code.upper()
+    if code not in session_manager.sessions:
+        return JSONResponse(status_code=404, content={"detail": "Session not found"})
+    if not spectator_hub.has_capacity(code):
+        return JSONResponse(status_code=503, content={"detail": "Spectator cap reached"})
+    try:
+        last_event_id = int(request.headers.get("last-event-id", ""))
+    except ValueError:
+        last_event_id = None
+    return StreamingResponse(
+        spectator_hub.stream(
+            code,
+            snapshot=lambda: session_manager.public_state(code),
+            is_alive=lambda: code in session_manager.sessions,
+            last_event_id=last_event_id,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def join_state(session_code: str) -> dict:
+    """The session state sent with join_success."""
+    # Issue 3: Use deep copy for nested dicts
+    session_state = copy.deepcopy(session_manager.sessions[session_code])
+    session_state["last_activity"] = session_state["last_activity"].isoformat()
+    # Do not expose other judges' reconnect tokens to clients
+    for judge in session_state["judges"].values():
+        judge.pop("reconnect_token", None)
+
+    # Compute time_remaining_ms for late-joining clients
+    if session_state.get("timer_started_at"):
+        session_state["time_remaining_ms"] = session_manager.time_remaining_ms(session_code)
+        session_state["timer_deadline_ms"] = int(session_manager.timer_deadline(session_code) * 1000)
+    else:
+        session_state["time_remaining_ms"] = None
+        session_state["timer_deadline_ms"] = None
+    return session_state
+
+
+async def _release_role(websocket: WebSocket, conn_id: str, session_code: str | None, role: str | None, evicted: bool) -> None:
+    """Free a disconnected socket's role and tell the session, unless a reconnect already took it."""
+    if not (session_code and role):
+        return
+    current_ws = await connection_manager.get_connection(session_code, role)
+    # A socket evicted after a failed send no longer holds its role, but
+    # unless a reconnect has taken the role since, it was still the active one
+    if current_ws is websocket or (current_ws is None and evicted):
+        # This is still the active connection — clean up normally
+        await connection_manager.remove_connection(session_code, role)
+        logger.info("role_disconnected", extra={
+            "conn_id": conn_id,
+            "session_code": session_code,
+            "role": "display" if role.startswith("display_") else role,
+        })
+        if role.endswith("_judge"):
+            position = role.replace("_judge", "")
+            if session_code in session_manager.sessions:
+                session_manager.sessions[session_code]["judges"][position]["connected"] = False
+                await connection_manager.broadcast_to_session(
+                    session_code,
+                    {"type": "judge_status_update", "position": position, "connected": False},
+                )
+    else:
+        # Connection was replaced by a reconnect — ignore stale disconnect
+        logger.info("stale_disconnect_ignored", extra={
+            "conn_id": conn_id,
+            "session_code": session_code,
+            "role": "display" if role.startswith("display_") else role,
+        })
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time communication."""
@@ -217,9 +700,13 @@ async def websocket_endpoint(websocket: WebSocket):
         await websocket.close(code=1008)
         return
     await websocket.accept()
+    recorder.ws_open(conn_id, origin)
 
     session_code = None
     role = None
+    # Session codes this socket watches in read-only multiplexed mode
+    subscriptions: set[str] = set()
+    is_subscriber = False
 
     msg_count = 0
     window_start = time.monotonic()
@@ -227,6 +714,8 @@ async def websocket_endpoint(websocket: WebSocket):
     try:
         while True:
             data = await websocket.receive_text()
+            received_at = time.perf_counter()
+            recorder.ws_message(conn_id, data)
 
             now = time.monotonic()
             if now - window_start >= 1.0:
@@ -234,7 +723,7 @@ async def websocket_endpoint(websocket: WebSocket):
                 msg_count = 1
             else:
                 msg_count += 1
-            if msg_count > 20:
+            if msg_count > 20 and settings.RATE_LIMIT_ENABLED:
                 logger.warning("message_flood_disconnect", extra={"conn_id": conn_id, "client_ip": _get_ws_client_ip(websocket)})
                 await websocket.close(code=1008)
                 return
@@ -243,7 +732,8 @@ async def websocket_endpoint(websocket: WebSocket):
             try:
                 message = json.loads(data)
             except json.JSONDecodeError:
-                await websocket.send_json({
+                metrics.MESSAGES_RECEIVED.inc("invalid_json")
+                await connection_manager.send_personal(websocket, {
                     "type": "error",
                     "message": "Invalid JSON format"
                 })
@@ -251,12 +741,64 @@ async def websocket_endpoint(websocket: WebSocket):
 
             # Issue 2: Use .get() method with validation
             message_type = message.get("type")
+            metrics.MESSAGES_RECEIVED.inc(metrics.message_type_label(message_type))
+            if message_type in ("subscribe", "unsubscribe"):
+                if session_code:
+                    await connection_manager.send_personal(websocket, {
+                        "type": "error",
+                        "message": "Cannot subscribe after joining a session"
+                    })
+                    continue
+                codes = message.get("session_codes")
+                if not isinstance(codes, list) or not all(isinstance(c, str) for c in codes):
+                    await connection_manager.send_personal(websocket, {
+                        "type": "error",
+                        "message": "Invalid session codes"
+                    })
+                    continue
+                codes = {c.upper() for c in codes}
+
+                if message_type == "unsubscribe":
+                    subscriptions = await connection_manager.unsubscribe(websocket, list(codes))
+                    await connection_manager.send_personal(websocket, {
+                        "type": "unsubscribe_success",
+                        "session_codes": sorted(subscriptions),
+                    })
+                    continue
+
+                known = {c for c in codes if c in session_manager.sessions}
+                if len(subscriptions | known) > settings.SUBSCRIBE_MAX_SESSIONS:
+                    await connection_manager.send_personal(websocket, {
+                        "type": "error",
+                        "message": "Too many subscriptions"
+                    })
+                    continue
+                subscriptions = await connection_manager.subscribe(websocket, sorted(known))
+                is_subscriber = True
+                logger.info("subscriber_joined", extra={
+                    "conn_id": conn_id,
+                    "client_ip": _get_ws_client_ip(websocket),
+                })
+                await connection_manager.send_personal(websocket, {
+                    "type": "subscribe_success",
+                    "sessions": {c: session_manager.public_state(c) for c in sorted(known)},
+                    "unknown": sorted(codes - known),
+                    "server_time_ms": _now_ms(),
+                })
+                continue
+
             if message_type == "join":
+                if is_subscriber:
+                    await connection_manager.send_personal(websocket, {
+                        "type": "error",
+                        "message": "Subscribers are read-only"
+                    })
+                    continue
                 session_code = (message.get("session_code") or "").upper()
                 role = message.get("role")
 
                 if not session_code or not role:
-                    await websocket.send_json({
+                    await connection_manager.send_personal(websocket, {
                         "type": "error",
                         "message": "Missing required fields"
                     })
@@ -290,7 +832,7 @@ async def websocket_endpoint(websocket: WebSocket):
                             "reason": result["error"],
                             "client_ip": _get_ws_client_ip(websocket),
                         })
-                        await websocket.send_json({
+                        await connection_manager.send_personal(websocket, {
                             "type": "join_error",
                             "message": result["error"]
                         })
@@ -299,7 +841,7 @@ async def websocket_endpoint(websocket: WebSocket):
 
                 if role == "display":
                     if await connection_manager.count_displays(session_code) >= settings.DISPLAY_CAP:
-                        await websocket.send_json({
+                        await connection_manager.send_personal(websocket, {
                             "type": "join_error",
                             "message": "Display cap reached"
                         })
@@ -316,26 +858,16 @@ async def websocket_endpoint(websocket: WebSocket):
                     "client_ip": _get_ws_client_ip(websocket),
                 })
 
-                # Issue 3: Use deep copy for nested dicts
-                session_state = copy.deepcopy(session_manager.sessions[session_code])
-                session_state["last_activity"] = session_state["last_activity"].isoformat()
-                # Do not expose other judges' reconnect tokens to clients
-                for judge in session_state["judges"].values():
-                    judge.pop("reconnect_token", None)
-
-                # Compute time_remaining_ms for late-joining clients
-                if session_state.get("timer_started_at"):
-                    elapsed_ms = (time.time() - session_state["timer_started_at"]) * 1000
-                    session_state["time_remaining_ms"] = max(0, 60000 - elapsed_ms)
-                else:
-                    session_state["time_remaining_ms"] = None
+                session_state = join_state(session_code)
 
-                await websocket.send_json({
+                await connection_manager.send_personal(websocket, {
                     "type": "join_success",
                     "role": "display" if role.startswith("display_") else role,
                     "is_head": result["is_head"],
                     "session_state": session_state,
                     "reconnect_token": result.get("reconnect_token"),
+                    # Doubles as the first clock-sync ping; the client echoes it in a pong
+                    "server_time_ms": _now_ms(),
                 })
                 # If session is in results phase, replay show_results to the rejoining client
                 rejoined_session = session_manager.sessions.get(session_code)
@@ -352,7 +884,7 @@ async def websocket_endpoint(websocket: WebSocket):
                         if j["locked"]
                     }
                     r_settings = rejoined_session["settings"]
-                    await websocket.send_json({
+                    await connection_manager.send_personal(websocket, {
                         "type": "show_results",
                         "votes": r_votes,
                         "reasons": r_reasons,
@@ -375,7 +907,7 @@ async def websocket_endpoint(websocket: WebSocket):
                 color = message.get("color")
 
                 if color not in VALID_COLORS:
-                    await websocket.send_json({
+                    await connection_manager.send_personal(websocket, {
                         "type": "error",
                         "message": "Invalid vote color"
                     })
@@ -383,7 +915,7 @@ async def websocket_endpoint(websocket: WebSocket):
 
                 reason = message.get("reason")
                 if reason is not None and (not isinstance(reason, str) or len(reason) > 200):
-                    await websocket.send_json({
+                    await connection_manager.send_personal(websocket, {
                         "type": "error",
                         "message": "Invalid reason"
                     })
@@ -392,72 +924,82 @@ async def websocket_endpoint(websocket: WebSocket):
                 require_reasons = session["settings"].get("require_reasons", False) if session else False
 
                 if require_reasons and color != "white" and not reason:
-                    await websocket.send_json({
+                    await connection_manager.send_personal(websocket, {
                         "type": "error",
                         "message": "Reason required before locking in"
                     })
                     continue
 
-                result = await session_manager.lock_vote(session_code, position, color, reason=reason)
+                with tracing.tracer.trace(
+                    "vote_lock", started_at=received_at, session_code=session_code, position=position, color=color
+                ) as trace:
+                    with tracing.tracer.span("session.lock_vote"):
+                        result = await session_manager.lock_vote(session_code, position, color, reason=reason)
+                    trace.set("all_locked", bool(result.get("all_locked")))
 
-                if result["success"]:
-                    logger.info("vote_locked", extra={
-                        "conn_id": conn_id,
-                        "session_code": session_code,
-                        "position": position,
-                        "color": color,
-                        "all_locked": result.get("all_locked", False),
-                    })
-                    # Notify display that a judge voted (no color)
-                    await connection_manager.send_to_displays(
-                        session_code,
-                        {"type": "judge_voted", "position": position}
-                    )
-
-                    # If all locked, broadcast results
-                    if result.get("all_locked"):
-                        judges = session_manager.sessions[session_code]["judges"]
-                        votes = {
-                            pos: judge["current_vote"]
-                            for pos, judge in judges.items()
-                            if judge["connected"]
-                        }
-                        reasons = {
-                            pos: judge["current_reason"]
-                            for pos, judge in judges.items()
-                            if judge["connected"]
-                        }
-                        session_settings = session_manager.sessions[session_code]["settings"]
-                        await connection_manager.broadcast_to_session(
+                    if result["success"]:
+                        logger.info("vote_locked", extra={
+                            "conn_id": conn_id,
+                            "session_code": session_code,
+                            "position": position,
+                            "color": color,
+                            "all_locked": result.get("all_locked", False),
+                        })
+                        # Notify display that a judge voted (no color)
+                        await connection_manager.send_to_displays(
                             session_code,
-                            {
-                                "type": "show_results",
-                                "votes": votes,
-                                "reasons": reasons,
-                                "showExplanations": session_settings["show_explanations"],
-                                "liftType": session_settings["lift_type"],
-                                "timer_frozen_ms": session_manager.sessions[session_code].get("timer_frozen_ms"),
-                            }
+                            {"type": "judge_voted", "position": position}
                         )
+
+                        # If all locked, freeze the clock and broadcast results
+                        if result.get("all_locked"):
+                            timer_wheel.cancel(session_code)
+                            judges = session_manager.sessions[session_code]["judges"]
+                            votes = {
+                                pos: judge["current_vote"]
+                                for pos, judge in judges.items()
+                                if judge["connected"]
+                            }
+                            reasons = {
+                                pos: judge["current_reason"]
+                                for pos, judge in judges.items()
+                                if judge["connected"]
+                            }
+                            session_settings = session_manager.sessions[session_code]["settings"]
+                            await connection_manager.broadcast_to_session(
+                                session_code,
+                                {
+                                    "type": "show_results",
+                                    "votes": votes,
+                                    "reasons": reasons,
+                                    "showExplanations": session_settings["show_explanations"],
+                                    "liftType": session_settings["lift_type"],
+                                    "timer_frozen_ms": session_manager.sessions[session_code].get("timer_frozen_ms"),
+                                }
+                            )
+                            metrics.VOTE_TO_RESULTS_SECONDS.observe(time.perf_counter() - received_at)
             elif message_type == "timer_start":
                 if not session_code or not role:
                     continue
 
                 # Only head judge can control timer
                 if role != "center_judge":
-                    await websocket.send_json({
+                    await connection_manager.send_personal(websocket, {
                         "type": "error",
                         "message": "Only head judge can control timer"
                     })
                     continue
 
                 logger.info("timer_start", extra={"conn_id": conn_id, "session_code": session_code})
-                session_manager.sessions[session_code]["timer_started_at"] = time.time()
+                deadline = session_manager.start_timer(session_code)
+                timer_wheel.schedule(session_code, deadline)
                 await connection_manager.broadcast_to_session(
                     session_code,
                     {
                         "type": "timer_start",
-                        "time_remaining_ms": 60000
+                        "time_remaining_ms": TIMER_DURATION_MS,
+                        # Absolute server deadline; clients convert it with their clock offset
+                        "deadline_ms": int(deadline * 1000),
                     }
                 )
 
@@ -467,7 +1009,7 @@ async def websocket_endpoint(websocket: WebSocket):
 
                 # Only head judge can control timer
                 if role != "center_judge":
-                    await websocket.send_json({
+                    await connection_manager.send_personal(websocket, {
                         "type": "error",
                         "message": "Only head judge can control timer"
                     })
@@ -475,6 +1017,7 @@ async def websocket_endpoint(websocket: WebSocket):
 
                 logger.info("timer_reset", extra={"conn_id": conn_id, "session_code": session_code})
                 session_manager.sessions[session_code]["timer_started_at"] = None
+                timer_wheel.cancel(session_code)
                 session_manager.sessions[session_code]["phase"] = "voting"
                 session_manager.sessions[session_code]["timer_frozen_ms"] = None
                 await connection_manager.broadcast_to_session(
@@ -488,7 +1031,7 @@ async def websocket_endpoint(websocket: WebSocket):
 
                 # Only head judge can advance to next lift
                 if role != "center_judge":
-                    await websocket.send_json({
+                    await connection_manager.send_personal(websocket, {
                         "type": "error",
                         "message": "Only head judge can advance to next lift"
                     })
@@ -496,6 +1039,7 @@ async def websocket_endpoint(websocket: WebSocket):
 
                 logger.info("next_lift", extra={"conn_id": conn_id, "session_code": session_code})
                 await session_manager.reset_for_next_lift(session_code)
+                timer_wheel.cancel(session_code)
                 await connection_manager.broadcast_to_session(
                     session_code,
                     {"type": "reset_for_next_lift"}
@@ -507,7 +1051,7 @@ async def websocket_endpoint(websocket: WebSocket):
 
                 # Only head judge can end session
                 if role != "center_judge":
-                    await websocket.send_json({
+                    await connection_manager.send_personal(websocket, {
                         "type": "error",
                         "message": "Only head judge can end session"
                     })
@@ -518,6 +1062,8 @@ async def websocket_endpoint(websocket: WebSocket):
                     session_code,
                     {"type": "session_ended", "reason": "head_judge"}
                 )
+                await connection_manager.flush(session_code)
+                await connection_manager.drop_subscribers(session_code)
 
                 # Close all connections first (with proper cleanup)
                 if session_code in connection_manager.active_connections:
@@ -534,13 +1080,16 @@ async def websocket_endpoint(websocket: WebSocket):
                 # Finally, delete session data and exit — the websocket was
                 # closed above; returning prevents receive_text() from being
                 # called on a dead connection, which would raise RuntimeError.
+                timer_wheel.cancel(session_code)
+                spectator_hub.close(session_code)
+                qr_cache.evict(session_code)
                 session_manager.delete_session(session_code)
                 return
             elif message_type == "settings_update":
                 if not session_code or not role:
                     continue
                 if role != "center_judge":
-                    await websocket.send_json({
+                    await connection_manager.send_personal(websocket, {
                         "type": "error",
                         "message": "Only head judge can update settings"
                     })
@@ -552,7 +1101,7 @@ async def websocket_endpoint(websocket: WebSocket):
                     require_reasons=message.get("requireReasons", False),
                 )
                 if not result["success"]:
-                    await websocket.send_json({
+                    await connection_manager.send_personal(websocket, {
                         "type": "error",
                         "message": result["error"]
                     })
@@ -570,6 +1119,23 @@ async def websocket_endpoint(websocket: WebSocket):
                     )
             elif message_type == "pong":
                 await connection_manager.mark_pong(websocket)
+                t0, t1, t2 = message.get("t0"), message.get("t1"), message.get("t2")
+                if _is_timestamp(t0) and _is_timestamp(t1) and _is_timestamp(t2):
+                    estimate = await connection_manager.record_clock_sample(
+                        websocket, t0, t1, t2, _now_ms(), role="subscriber" if is_subscriber else role
+                    )
+                    if estimate is not None:
+                        logger.debug("clock_sample", extra={
+                            "conn_id": conn_id,
+                            "session_code": session_code,
+                            "rtt_ms": round(estimate.rtt_ms, 1),
+                            "offset_ms": round(estimate.offset_ms, 1),
+                        })
+                        await connection_manager.send_personal(websocket, {
+                            "type": "clock_sync",
+                            "offset_ms": round(estimate.offset_ms),
+                            "rtt_ms": round(estimate.rtt_ms),
+                        })
                 continue
             else:
                 # Issue 4: Handle post-join messages
@@ -577,28 +1143,17 @@ async def websocket_endpoint(websocket: WebSocket):
                 pass
 
     except WebSocketDisconnect:
-        if session_code and role:
-            current_ws = await connection_manager.get_connection(session_code, role)
-            if current_ws is websocket:
-                # This is still the active connection — clean up normally
-                await connection_manager.remove_connection(session_code, role)
-                logger.info("role_disconnected", extra={
-                    "conn_id": conn_id,
-                    "session_code": session_code,
-                    "role": "display" if role.startswith("display_") else role,
-                })
-                if role.endswith("_judge"):
-                    position = role.replace("_judge", "")
-                    if session_code in session_manager.sessions:
-                        session_manager.sessions[session_code]["judges"][position]["connected"] = False
-                        await connection_manager.broadcast_to_session(
-                            session_code,
-                            {"type": "judge_status_update", "position": position, "connected": False},
-                        )
-            else:
-                # Connection was replaced by a reconnect — ignore stale disconnect
-                logger.info("stale_disconnect_ignored", extra={
-                    "conn_id": conn_id,
-                    "session_code": session_code,
-                    "role": "display" if role.startswith("display_") else role,
-                })
+        evicted = await connection_manager.pop_evicted(websocket)
+        await _release_role(websocket, conn_id, session_code, role, evicted)
+    except RuntimeError:
+        # A socket evicted after a failed send is already closed on our side, so
+        # receive raises RuntimeError rather than WebSocketDisconnect
+        if websocket.application_state != WebSocketState.DISCONNECTED:
+            raise
+        evicted = await connection_manager.pop_evicted(websocket)
+        await _release_role(websocket, conn_id, session_code, role, evicted)
+    finally:
+        recorder.ws_close(conn_id)
+        if is_subscriber:
+            await connection_manager.unsubscribe(websocket)
+        await connection_manager.pop_evicted(websocket)
@@ -0,0 +1,246 @@
+"""
+Prometheus text-format metrics.
+
+Everything is recorded from the event loop thread, so counters are plain
+integer increments and histograms index into preallocated bucket lists; no
+locks are taken on the hot path. Gauges are read from callbacks at scrape
+time, so nothing needs updating when sessions or connections change.
+"""
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; tuned for in-process work from ~100µs to a few seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with an optional single label whose values are bounded."""
+
+    def __init__(self, name: str, help: str, label: str | None = None, values: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.label = label
+        self._values: Dict[str, int] = {v: 0 for v in values}
+
+    def inc(self, label_value: str = "", amount: int = 1) -> None:
+        self._values[label_value] = self._values.get(label_value, 0) + amount
+
+    def value(self, label_value: str = "") -> int:
+        return self._values.get(label_value, 0)
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        if self.label is None:
+            lines.append(f"{self.name} {self._values.get('', 0)}")
+        else:
+            for value, count in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels({self.label: value})} {count}")
+        return lines
+
+
+class Gauge:
+    """Gauge read from a callback at scrape time; returns {label value: number} when labelled."""
+
+    def __init__(self, name: str, help: str, read: Callable[[], float | Dict[str, float]], label: str | None = None):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.read = read
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        value = self.read()
+        if self.label is None:
+            lines.append(f"{self.name} {_format_value(value)}")
+        else:
+            for label_value, v in sorted(value.items()):
+                lines.append(f"{self.name}{_format_labels({self.label: label_value})} {_format_value(v)}")
+        return lines
+
+
+class Histogram:
+    """Histogram with fixed buckets; `observe` is a bisect and two additions.
+
+    With `label`, each label value gets its own bucket set; values must be bounded.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+        label: str | None = None,
+        values: Iterable[str] = (),
+    ):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self.label = label
+        # One slot per bucket plus +Inf; counts are per-bucket, made cumulative at scrape time
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._children: Dict[str, "Histogram"] = {}
+        for value in values:
+            self._child(value)
+
+    def _child(self, label_value: str) -> "Histogram":
+        child = self._children.get(label_value)
+        if child is None:
+            child = self._children[label_value] = Histogram(self.name, self.help, self.buckets)
+        return child
+
+    def observe(self, value: float, label_value: str = "") -> None:
+        if self.label is not None:
+            self._child(label_value).observe(value)
+            return
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self._sum += value
+        self._count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    @property
+    def count(self) -> int:
+        if self.label is not None:
+            return sum(child.count for child in self._children.values())
+        return self._count
+
+    def value_count(self, label_value: str) -> int:
+        child = self._children.get(label_value)
+        return child.count if child is not None else 0
+
+    def _series(self, labels: Dict[str, str]) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self._counts):
+            cumulative += count
+            bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+            lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {self._sum!r}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {self._count}")
+        return lines
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        if self.label is None:
+            lines.extend(self._series({}))
+        else:
+            for value, child in sorted(self._children.items()):
+                lines.extend(child._series({self.label: value}))
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def unregister(self, name: str) -> None:
+        self._metrics = [m for m in self._metrics if m.name != name]
+
+    def render(self) -> bytes:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+REGISTRY = Registry()
+
+# Client message types the server understands; anything else is counted as "other"
+# so a misbehaving client can't create unbounded label values.
+MESSAGE_TYPES = (
+    "join", "vote_lock", "timer_start", "timer_reset", "next_lift", "end_session_confirmed",
+    "settings_update", "pong", "subscribe", "unsubscribe",
+)
+
+MESSAGES_RECEIVED = REGISTRY.register(Counter(
+    "iron_verdict_messages_received_total",
+    "WebSocket messages received, by message type",
+    label="message_type",
+    values=MESSAGE_TYPES + ("other", "invalid_json"),
+))
+VOTE_TO_RESULTS_SECONDS = REGISTRY.register(Histogram(
+    "iron_verdict_vote_to_results_seconds",
+    "Time from receiving the deciding vote_lock to show_results being sent (or queued, when batching)",
+))
+BROADCAST_SECONDS = REGISTRY.register(Histogram(
+    "iron_verdict_broadcast_seconds",
+    "Time to fan one message (or one batch flush) out to a session's connections",
+))
+SNAPSHOT_SAVE_SECONDS = REGISTRY.register(Histogram(
+    "iron_verdict_snapshot_save_seconds",
+    "Duration of session snapshot saves",
+))
+SNAPSHOT_LOAD_SECONDS = REGISTRY.register(Histogram(
+    "iron_verdict_snapshot_load_seconds",
+    "Duration of session snapshot loads",
+))
+HEARTBEAT_STALE_CLOSES = REGISTRY.register(Counter(
+    "iron_verdict_heartbeat_stale_closes_total",
+    "Connections closed for missing heartbeat pongs",
+))
+SEND_FAILURES = REGISTRY.register(Counter(
+    "iron_verdict_send_failures_total",
+    "Failed WebSocket sends, by the event logged for them",
+    label="event",
+))
+LOOP_LAG_SECONDS = REGISTRY.register(Histogram(
+    "iron_verdict_event_loop_lag_seconds",
+    "How late the event loop woke a sampling sleep; time other callbacks held the loop",
+))
+# Roles a connection can hold; per-display roles are folded into "display"
+ROLES = ("left_judge", "center_judge", "right_judge", "display", "subscriber", "other")
+
+WS_RTT_SECONDS = REGISTRY.register(Histogram(
+    "iron_verdict_ws_rtt_seconds",
+    "Heartbeat round-trip time per ping/pong exchange, by connection role",
+    label="role",
+    values=ROLES,
+))
+SLOW_CALLBACKS = REGISTRY.register(Counter(
+    "iron_verdict_slow_callbacks_total",
+    "Event-loop stalls over SLOW_CALLBACK_MS, by the handler or background loop that held it",
+    label="handler",
+))
+
+
+def message_type_label(message_type) -> str:
+    return message_type if message_type in MESSAGE_TYPES else "other"
+
+
+def role_label(role: str | None) -> str:
+    if role and role.startswith("display_"):
+        return "display"
+    return role if role in ROLES else "other"
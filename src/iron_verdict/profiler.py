@@ -0,0 +1,92 @@
+"""
+On-demand profiling of the running server.
+
+``sample`` is a sampling profiler: a separate thread reads the event-loop
+thread's current stack at a fixed interval and counts identical stacks,
+producing the collapsed format flame graph tools read (``a;b;c 42``). The
+loop itself runs untouched, so it is safe under load. ``ProfileSession``
+wraps cProfile for when exact call counts are worth its overhead.
+
+The startup profile covers imports, snapshot loading and the rest of the
+lifespan startup path; ``run.py`` starts it and the lifespan writes it out.
+"""
+
+import cProfile
+import marshal
+import os
+import sys
+import time
+from collections import Counter
+from typing import Dict
+
+_startup_profile: cProfile.Profile | None = None
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def sample(thread_id: int, seconds: float, interval: float = 0.005) -> Dict[str, int]:
+    """Sample `thread_id`'s stack every `interval` for `seconds`. Returns {collapsed stack: samples}.
+
+    Blocks the calling thread, so run it from a worker thread.
+    """
+    counts: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            break
+        stack = []
+        while frame is not None:
+            stack.append(_frame_label(frame))
+            frame = frame.f_back
+        counts[";".join(reversed(stack))] += 1
+        del frame
+        time.sleep(interval)
+    return dict(counts)
+
+
+def collapsed(counts: Dict[str, int]) -> str:
+    """Collapsed-stack text, heaviest stacks first."""
+    return "".join(f"{stack} {n}\n" for stack, n in sorted(counts.items(), key=lambda item: -item[1]))
+
+
+class ProfileSession:
+    """cProfile of the thread that enables it; only calls made on that thread are seen."""
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def __enter__(self) -> "ProfileSession":
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self._profile.disable()
+        return False
+
+    def pstats_bytes(self) -> bytes:
+        """Marshalled stats, loadable with ``pstats.Stats(path)`` once written to a file."""
+        self._profile.create_stats()
+        return marshal.dumps(self._profile.stats)
+
+
+def start_startup_profile() -> None:
+    global _startup_profile
+    if _startup_profile is None:
+        _startup_profile = cProfile.Profile()
+        _startup_profile.enable()
+
+
+def finish_startup_profile(path: str) -> bool:
+    """Stop the startup profile and write it to `path` as pstats. False if none was running."""
+    global _startup_profile
+    profile, _startup_profile = _startup_profile, None
+    if profile is None:
+        return False
+    profile.disable()
+    profile.dump_stats(path)
+    return True
+
@@ -0,0 +1,69 @@
+import asyncio
+import io
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import segno
+
+from iron_verdict.assets import IMMUTABLE, CompressedAsset
+
+FORMATS = {"svg": "image/svg+xml", "png": "image/png"}
+
+# Variants kept per session: 4 roles + generic, 2 formats, with headroom
+MAX_VARIANTS_PER_SESSION = 32
+
+
+def render_qr(url: str, fmt: str) -> bytes:
+    """Encode `url` as a QR code image (pure Python, no browser work)."""
+    qr = segno.make(url, error="m")
+    out = io.BytesIO()
+    if fmt == "svg":
+        # No width/height: the page sizes it, and it stays sharp when printed
+        qr.save(out, kind="svg", border=2, xmldecl=False, omitsize=True, dark="#000", light="#fff")
+    else:
+        qr.save(out, kind="png", scale=8, border=2)
+    return out.getvalue()
+
+
+def _render_asset(url: str, fmt: str, cache_control: str = IMMUTABLE) -> CompressedAsset:
+    return CompressedAsset(render_qr(url, fmt), FORMATS[fmt], cache_control=cache_control)
+
+
+async def render_uncached(url: str, fmt: str) -> CompressedAsset:
+    """Render a QR code for one response only, e.g. from a URL the client chose; served no-store."""
+    return await asyncio.to_thread(_render_asset, url, fmt, "no-store")
+
+
+class QrCache:
+    """
+    Rendered join-link QR codes, keyed by session code.
+
+    A session's entries are dropped with ``evict()`` when the session is
+    deleted. The image for a given URL never changes, so entries are served
+    as immutable.
+    """
+
+    def __init__(self, max_variants_per_session: int = MAX_VARIANTS_PER_SESSION):
+        self._max_variants = max_variants_per_session
+        # {session_code: {(url, fmt): asset}}, oldest variant first
+        self._entries: Dict[str, "OrderedDict[Tuple[str, str], CompressedAsset]"] = {}
+
+    async def get(self, session_code: str, url: str, fmt: str) -> CompressedAsset:
+        variants = self._entries.setdefault(session_code, OrderedDict())
+        key = (url, fmt)
+        asset = variants.get(key)
+        if asset is None:
+            # Rendering and compressing takes milliseconds; keep it off the event loop.
+            # If the session is evicted meanwhile, the variant lands in a dict nobody holds.
+            asset = await asyncio.to_thread(_render_asset, url, fmt)
+            variants[key] = asset
+            # Whatever URLs callers pass, a session's entry stays bounded
+            while len(variants) > self._max_variants:
+                variants.popitem(last=False)
+        return asset
+
+    def evict(self, session_code: str) -> None:
+        self._entries.pop(session_code, None)
+
+    def __contains__(self, session_code: str) -> bool:
+        return session_code in self._entries
@@ -0,0 +1,371 @@
+"""
+Replay a recording (see ``recorder``) into the app in-process.
+
+Requests and WebSocket messages are fed straight through the ASGI
+interface, without sockets or an HTTP client, so the timings are the
+app's own. Session codes and reconnect tokens differ from the recorded
+run; recorded ones are mapped to the ones the replay receives.
+
+By default events are replayed as fast as possible and strictly in order:
+each message is handled to completion, broadcasts included, before the
+next one is delivered, which makes the run deterministic and its
+per-message handling times comparable between commits. That needs
+micro-batching off, since a batch is flushed by a task of its own after
+the handler returns, so the CLI replays with ``BATCH_WINDOW_MS=0``. ``--speed 1``
+replays in real time instead (``--speed 2`` at double speed), with clocks
+running, for behaviour that depends on timing.
+
+    python -m iron_verdict.replay meet.jsonl --json before.json
+    python -m iron_verdict.replay meet.jsonl --speed 1
+    git bisect run python -m iron_verdict.replay meet.jsonl --fail-above-ms 5
+
+Sessions that existed before the recording started are not recreated;
+record from a fresh server for a faithful replay.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+from iron_verdict.loadgen import percentile
+from iron_verdict.recorder import FORMAT_VERSION
+
+# How long a fast replay waits for an HTTP response to start. Long polls and
+# event streams start late or never finish; the replay moves on without them.
+HTTP_START_TIMEOUT = 1.0
+
+
+def load(path: str) -> List[list]:
+    """The events of the first recording in `path`."""
+    events = []
+    with open(path, encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != "iron-verdict-recording":
+            raise ValueError(f"{path} is not an Iron Verdict recording")
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path} has recording format {header.get('version')}, expected {FORMAT_VERSION}")
+        for line in f:
+            event = json.loads(line)
+            if isinstance(event, dict):
+                # The server restarted and appended a new recording; its clock starts over
+                print(f"{path}: stopping at a second recording", file=sys.stderr)
+                break
+            events.append(event)
+    return events
+
+
+class _Socket:
+    """One replayed WebSocket connection, driven straight through the ASGI interface."""
+
+    def __init__(self, replay: "Replay", origin: str):
+        self.replay = replay
+        self.origin = origin
+        self.session_code: str | None = None
+        self.role: str | None = None
+        self._inbox: asyncio.Queue = asyncio.Queue()
+        # Set while the app waits for a message and none is queued
+        self.idle = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+    def open(self) -> None:
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "path": "/ws",
+            "raw_path": b"/ws",
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"replay"), (b"origin", self.origin.encode("latin-1"))],
+            "client": ("127.0.0.1", 0),
+            "server": ("replay", 80),
+            "subprotocols": [],
+        }
+        self._inbox.put_nowait({"type": "websocket.connect"})
+        self.task = asyncio.create_task(self._run(scope))
+
+    async def _run(self, scope) -> None:
+        try:
+            await self.replay.app(scope, self._receive, self._send)
+        except Exception as exc:
+            self.replay.errors.append(f"websocket handler: {type(exc).__name__}: {exc}")
+        finally:
+            self.idle.set()
+
+    async def _receive(self):
+        if self._inbox.empty():
+            self.idle.set()
+        return await self._inbox.get()
+
+    async def _send(self, message) -> None:
+        if message["type"] == "websocket.send":
+            self.replay.outbound(self, message.get("text") or message.get("bytes", b"").decode())
+        elif message["type"] == "websocket.close":
+            self._inbox.put_nowait({"type": "websocket.disconnect", "code": message.get("code", 1000)})
+
+    def deliver(self, message) -> None:
+        self.idle.clear()
+        self._inbox.put_nowait(message)
+
+
+class Replay:
+    def __init__(self, app, events: List[list], speed: float = 0):
+        self.app = app
+        self.events = events
+        self.speed = speed
+        self.codes: Dict[str, str] = {}
+        # Latest reconnect token handed out per (session code, role)
+        self.tokens: Dict[Tuple[str, str], str] = {}
+        self.sockets: Dict[str, _Socket] = {}
+        self.handling: Dict[str, List[float]] = {}
+        self.http_times: Dict[str, List[float]] = {}
+        self.errors: List[str] = []
+        self._tasks: List[asyncio.Task] = []
+        self._finished = asyncio.Event()
+
+    def _map_code(self, code: Any) -> Any:
+        return self.codes.get(code.upper(), code) if isinstance(code, str) else code
+
+    def _map_path(self, path: str) -> Tuple[str, str]:
+        """The path with recorded session codes replaced, and its route for reporting."""
+        parts, route = path.split("/"), path.split("/")
+        for i, part in enumerate(parts):
+            if part.upper() in self.codes:
+                parts[i], route[i] = self.codes[part.upper()], "{code}"
+        return "/".join(parts), "/".join(route)
+
+    def inbound(self, socket: _Socket, text: str) -> Tuple[str, str]:
+        """The recorded message rewritten for this run, and its type."""
+        try:
+            message = json.loads(text)
+        except json.JSONDecodeError:
+            return text, "invalid_json"
+        if not isinstance(message, dict):
+            return text, "unknown"
+        if "session_code" in message:
+            message["session_code"] = self._map_code(message["session_code"])
+        if isinstance(message.get("session_codes"), list):
+            message["session_codes"] = [self._map_code(c) for c in message["session_codes"]]
+        if message.get("type") == "join":
+            socket.session_code = str(message.get("session_code") or "").upper()
+            socket.role = message.get("role")
+            token = self.tokens.get((socket.session_code, socket.role))
+            if message.get("reconnect_token") and token:
+                message["reconnect_token"] = token
+        return json.dumps(message), str(message.get("type"))
+
+    def outbound(self, socket: _Socket, text: str) -> None:
+        if '"join_success"' not in text:
+            return
+        message = json.loads(text)
+        if message.get("type") == "join_success" and message.get("reconnect_token"):
+            self.tokens[(socket.session_code, socket.role)] = message["reconnect_token"]
+
+    async def _message(self, conn_id: str, text: str) -> None:
+        socket = self.sockets.get(conn_id)
+        if socket is None or socket.task.done():
+            return
+        text, message_type = self.inbound(socket, text)
+        started = time.perf_counter()
+        socket.deliver({"type": "websocket.receive", "text": text})
+        if self.speed:
+            asyncio.create_task(self._time_message(socket, message_type, started))
+        else:
+            await socket.idle.wait()
+            self.handling.setdefault(message_type, []).append(time.perf_counter() - started)
+
+    async def _time_message(self, socket: _Socket, message_type: str, started: float) -> None:
+        await socket.idle.wait()
+        self.handling.setdefault(message_type, []).append(time.perf_counter() - started)
+
+    async def _close(self, conn_id: str) -> None:
+        socket = self.sockets.pop(conn_id, None)
+        if socket is None or socket.task.done():
+            return
+        socket.deliver({"type": "websocket.disconnect", "code": 1000})
+        if not self.speed:
+            await socket.task
+
+    async def _http(self, method: str, path: str, query: str, body: str, created: str | None) -> None:
+        path, route = self._map_path(path)
+        payload = body.encode()
+        headers = [(b"host", b"replay")]
+        if payload:
+            headers += [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())]
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode("latin-1"),
+            "root_path": "",
+            "headers": headers,
+            "client": ("127.0.0.1", 0),
+            "server": ("replay", 80),
+        }
+        started = time.perf_counter()
+        response_started = asyncio.Event()
+        chunks: List[bytes] = []
+        sent_body = False
+
+        async def receive():
+            nonlocal sent_body
+            if not sent_body:
+                sent_body = True
+                return {"type": "http.request", "body": payload, "more_body": False}
+            await self._finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                self.http_times.setdefault(f"{method} {route}", []).append(time.perf_counter() - started)
+                response_started.set()
+            elif message["type"] == "http.response.body" and created:
+                chunks.append(message.get("body", b""))
+
+        async def run():
+            try:
+                await self.app(scope, receive, send)
+            except Exception as exc:
+                self.errors.append(f"{method} {route}: {type(exc).__name__}: {exc}")
+            finally:
+                response_started.set()
+
+        task = asyncio.create_task(run())
+        self._tasks.append(task)
+        if created:
+            # Later events refer to this session; learn its new code first
+            await task
+            try:
+                self.codes[created.upper()] = json.loads(b"".join(chunks))["session_code"]
+            except (ValueError, KeyError):
+                self.errors.append(f"{method} {route}: no session code in the response")
+        elif not self.speed:
+            try:
+                await asyncio.wait_for(response_started.wait(), HTTP_START_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _apply(self, event: list) -> None:
+        kind = event[1]
+        if kind == "open":
+            socket = _Socket(self, event[3])
+            self.sockets[event[2]] = socket
+            socket.open()
+            self._tasks.append(socket.task)
+            if not self.speed:
+                await socket.idle.wait()
+        elif kind == "msg":
+            await self._message(event[2], event[3])
+        elif kind == "close":
+            await self._close(event[2])
+        elif kind == "http":
+            await self._http(event[2], event[3], event[4], event[5], event[7])
+
+    async def run(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        for event in self.events:
+            if self.speed:
+                delay = event[0] / 1000 / self.speed - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await self._apply(event)
+        for conn_id in list(self.sockets):
+            await self._close(conn_id)
+        elapsed = time.perf_counter() - started
+
+        # Let whatever is still running wind down
+        self._finished.set()
+        pending = [task for task in self._tasks if not task.done()]
+        if pending:
+            await asyncio.wait(pending, timeout=5)
+        return self.report(elapsed)
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        def summary(samples: List[float]) -> Dict[str, Any]:
+            ordered = sorted(samples)
+            ms = lambda value: round(value * 1000, 3)  # noqa: E731
+            return {
+                "count": len(ordered),
+                "p50_ms": ms(percentile(ordered, 50)),
+                "p99_ms": ms(percentile(ordered, 99)),
+                "max_ms": ms(ordered[-1]),
+            }
+
+        return {
+            "events": len(self.events),
+            "speed": self.speed,
+            "elapsed_s": round(elapsed, 3),
+            "messages": {t: summary(s) for t, s in sorted(self.handling.items())},
+            "http": {r: summary(s) for r, s in sorted(self.http_times.items())},
+            "errors": self.errors[:20],
+        }
+
+
+async def replay(app, events: List[list], speed: float = 0) -> Dict[str, Any]:
+    """
+    Feed recorded `events` into `app`. `speed` 0 replays as fast as possible, 1 in real time.
+
+    Strict ordering at speed 0 only covers broadcasts when the app's batch window is 0.
+    """
+    return await Replay(app, events, speed).run()
+
+
+async def _replay_into_fresh_app(events: List[list], speed: float) -> Dict[str, Any]:
+    # Settings are read when the app is imported
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    os.environ.setdefault("LOOP_LAG_INTERVAL_MS", "0")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("SNAPSHOT_PATH", os.path.join(tempfile.mkdtemp(prefix="iron-verdict-replay-"), "s.json"))
+    os.environ["RECORD_PATH"] = ""
+    if not speed:
+        # Batches are flushed after the handler goes idle, which strict ordering can't wait for
+        os.environ["BATCH_WINDOW_MS"] = "0"
+    from iron_verdict import main as server
+
+    clock = asyncio.create_task(server.timer_wheel.run()) if speed else None
+    try:
+        return await replay(server.app, events, speed)
+    finally:
+        if clock is not None:
+            clock.cancel()
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a recorded Iron Verdict meet in-process")
+    parser.add_argument("recording", help="File written with RECORD_PATH")
+    parser.add_argument(
+        "--speed", type=float, default=0,
+        help="0 (default) replays as fast as possible and in strict order; 1 is real time, 2 double speed",
+    )
+    parser.add_argument("--json", help="Also write the report to this file")
+    parser.add_argument(
+        "--fail-above-ms", type=float,
+        help="Exit 1 if any message type's p99 handling time exceeds this, e.g. for git bisect run",
+    )
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(_replay_into_fresh_app(load(args.recording), args.speed))
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if report["errors"]:
+        return 1
+    if args.fail_above_ms is not None and any(
+        stats["p99_ms"] > args.fail_above_ms for stats in report["messages"].values()
+    ):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
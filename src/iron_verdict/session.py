@@ -6,17 +6,20 @@ import secrets
 import string
 import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Any, Callable, Dict, List
 
 logger = logging.getLogger("iron_verdict")
 
 VALID_LIFT_TYPES = {"squat", "bench", "deadlift"}
+TIMER_DURATION_MS = 60000
 
 
 class SessionManager:
-    def __init__(self):
+    def __init__(self, clock: Callable[[], float] = time.time):
         self.sessions: Dict[str, Dict[str, Any]] = {}
         self._lock = asyncio.Lock()
+        # Epoch clock for the attempt timer; the protocol tests substitute a fake one
+        self._clock = clock
 
     def generate_session_code(self) -> str:
         """Generate a unique 8-character alphanumeric session code."""
@@ -151,8 +154,7 @@ class SessionManager:
                 session["state"] = "showing_results"
                 session["phase"] = "results"
                 if session["timer_started_at"] is not None:
-                    elapsed_ms = (time.time() - session["timer_started_at"]) * 1000
-                    session["timer_frozen_ms"] = max(0, 60000 - elapsed_ms)
+                    session["timer_frozen_ms"] = self.time_remaining_ms(code)
                 session["timer_started_at"] = None
 
             return {"success": True, "all_locked": all_locked}
@@ -178,6 +180,62 @@ class SessionManager:
 
             return {"success": True}
 
+    def start_timer(self, code: str) -> float:
+        """Start the attempt clock now and return the epoch time it expires."""
+        self.sessions[code]["timer_started_at"] = self._clock()
+        return self.timer_deadline(code)
+
+    def time_remaining_ms(self, code: str) -> float | None:
+        """Return what is left on the running attempt clock, or None if not running."""
+        deadline = self.timer_deadline(code)
+        if deadline is None:
+            return None
+        return max(0, (deadline - self._clock()) * 1000)
+
+    def timer_deadline(self, code: str) -> float | None:
+        """Return the epoch time the running attempt clock expires, or None if not running."""
+        session = self.sessions.get(code)
+        if not session or session.get("timer_started_at") is None:
+            return None
+        return session["timer_started_at"] + TIMER_DURATION_MS / 1000
+
+    def running_timers(self) -> Dict[str, float]:
+        """Return {session_code: deadline} for every session with a running clock."""
+        return {
+            code: session["timer_started_at"] + TIMER_DURATION_MS / 1000
+            for code, session in self.sessions.items()
+            if session.get("timer_started_at") is not None
+        }
+
+    def public_state(self, code: str) -> Dict[str, Any] | None:
+        """
+        Return the audience-safe view of a session, or None if it does not exist.
+
+        Votes and reasons are only included once the session is in the results
+        phase, and reconnect tokens are never included.
+        """
+        session = self.sessions.get(code)
+        if not session:
+            return None
+        in_results = session["phase"] == "results"
+        deadline = self.timer_deadline(code)
+        return {
+            "name": session["name"],
+            "phase": session["phase"],
+            "settings": dict(session["settings"]),
+            "judges": {
+                pos: {
+                    "connected": judge["connected"],
+                    "locked": judge["locked"],
+                    "vote": judge["current_vote"] if in_results and judge["locked"] else None,
+                    "reason": judge["current_reason"] if in_results and judge["locked"] else None,
+                }
+                for pos, judge in session["judges"].items()
+            },
+            "timer_deadline_ms": int(deadline * 1000) if deadline is not None else None,
+            "timer_frozen_ms": session.get("timer_frozen_ms"),
+        }
+
     def update_settings(self, code: str, show_explanations: bool, lift_type: str, require_reasons: bool = False) -> Dict[str, Any]:
         """Update head judge display settings."""
         if code not in self.sessions:
@@ -207,11 +265,12 @@ class SessionManager:
         if code in self.sessions:
             del self.sessions[code]
 
-    def cleanup_expired(self, hours: int) -> None:
-        """Delete all sessions inactive for longer than `hours`."""
+    def cleanup_expired(self, hours: int) -> List[str]:
+        """Delete all sessions inactive for longer than `hours`. Returns the deleted codes."""
         expired = self.get_expired_sessions(hours)
         for code in expired:
             self.delete_session(code)
+        return expired
 
     def save_snapshot(self, path: str) -> None:
         """Serialize all sessions to a JSON file."""
@@ -0,0 +1,207 @@
+import asyncio
+import json
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Dict, List, Tuple
+
+KEEPALIVE_FRAME = b": keepalive\n\n"
+
+
+def encode_sse(seq: int, event: str, data: Dict[str, Any]) -> bytes:
+    """Encode one Server-Sent Events frame."""
+    payload = json.dumps(data, separators=(",", ":"))
+    return f"id: {seq}\nevent: {event}\ndata: {payload}\n\n".encode()
+
+
+class BroadcastBuffer:
+    """
+    Ring of pre-encoded SSE frames for one session.
+
+    Every spectator of the session reads from the same ring, so an event is
+    encoded once no matter how many subscribers there are. A subscriber only
+    holds its cursor (the last sequence number it sent).
+    """
+
+    def __init__(self, size: int, seq: int = 0):
+        self.frames: deque = deque(maxlen=size)
+        self.seq = seq
+        self.closed = False
+        self.subscribers = 0
+        self._changed = asyncio.Event()
+
+    def append(self, seq: int, message: Dict[str, Any]) -> None:
+        self.seq = seq
+        self.frames.append((seq, encode_sse(seq, message.get("type", "message"), message)))
+        self._notify()
+
+    def close(self) -> None:
+        self.closed = True
+        self._notify()
+
+    def _notify(self) -> None:
+        # Wake everyone waiting on the current event, then start a fresh one
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def since(self, cursor: int) -> List[Tuple[int, bytes]] | None:
+        """(seq, frame) pairs after `cursor`, or None if some already fell out of the ring."""
+        if cursor >= self.seq:
+            return []
+        if not self.frames or self.frames[0][0] > cursor + 1:
+            return None
+        return [(seq, frame) for seq, frame in self.frames if seq > cursor]
+
+    async def wait(self, cursor: int, timeout: float) -> None:
+        """Return once there is something after `cursor`, the buffer closes, or `timeout` passes."""
+        if cursor < self.seq or self.closed:
+            return
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+class SpectatorHub:
+    """
+    Read-only fan-out tier for passive viewers (livestreams, warm-up room screens).
+
+    Also keeps a per-session version that increases with every published event,
+    so HTTP clients can tell whether the public view of a session has changed,
+    and caches the encoded views per version. Frames are only encoded for
+    sessions that have at least one spectator attached, keeping the judge and
+    display hot path to a counter increment.
+    """
+
+    def __init__(self, buffer_size: int = 256, max_subscribers: int = 5000):
+        self._buffer_size = buffer_size
+        self._max_subscribers = max_subscribers
+        self._versions: Dict[str, int] = {}
+        self._buffers: Dict[str, BroadcastBuffer] = {}
+        # {session_code: {view_name: (version, encoded body)}}
+        self._rendered: Dict[str, Dict[str, Tuple[int, bytes]]] = {}
+        # Long-poll waiters, woken by the next publish
+        self._waiters: Dict[str, asyncio.Event] = {}
+
+    def version(self, session_code: str) -> int:
+        return self._versions.get(session_code, 0)
+
+    def publish(self, session_code: str, message: Dict[str, Any]) -> int:
+        """Record a public session event. Returns the session's new version."""
+        seq = self._versions.get(session_code, 0) + 1
+        self._versions[session_code] = seq
+        buffer = self._buffers.get(session_code)
+        if buffer is not None:
+            buffer.append(seq, message)
+        waiter = self._waiters.pop(session_code, None)
+        if waiter is not None:
+            waiter.set()
+        return seq
+
+    def close(self, session_code: str) -> None:
+        """End every spectator stream of a deleted session and forget its version."""
+        self._versions.pop(session_code, None)
+        self._rendered.pop(session_code, None)
+        buffer = self._buffers.pop(session_code, None)
+        if buffer is not None:
+            buffer.close()
+        waiter = self._waiters.pop(session_code, None)
+        if waiter is not None:
+            waiter.set()
+
+    def render(
+        self, session_code: str, view: str, build: Callable[[], Dict[str, Any] | None]
+    ) -> Tuple[int, bytes | None]:
+        """
+        Return (version, JSON body) of a named view, encoding it at most once per version.
+
+        The body is None if `build()` returns None (session gone).
+        """
+        version = self.version(session_code)
+        cached = self._rendered.get(session_code, {}).get(view)
+        if cached is not None and cached[0] == version:
+            return cached
+        data = build()
+        if data is None:
+            return version, None
+        body = json.dumps(data, separators=(",", ":")).encode()
+        self._rendered.setdefault(session_code, {})[view] = (version, body)
+        return version, body
+
+    async def wait_for_version(self, session_code: str, version: int, timeout: float) -> int:
+        """Wait until the session reaches `version` (or `timeout` passes). Returns the current version."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.version(session_code) < version:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            waiter = self._waiters.get(session_code)
+            if waiter is None:
+                waiter = self._waiters[session_code] = asyncio.Event()
+            try:
+                await asyncio.wait_for(waiter.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if session_code not in self._versions:
+                break  # closed
+        return self.version(session_code)
+
+    def subscriber_count(self, session_code: str) -> int:
+        buffer = self._buffers.get(session_code)
+        return buffer.subscribers if buffer is not None else 0
+
+    def total_subscribers(self) -> int:
+        return sum(buffer.subscribers for buffer in self._buffers.values())
+
+    def has_capacity(self, session_code: str) -> bool:
+        return self.subscriber_count(session_code) < self._max_subscribers
+
+    async def stream(
+        self,
+        session_code: str,
+        snapshot: Callable[[], Dict[str, Any] | None],
+        is_alive: Callable[[], bool],
+        last_event_id: int | None = None,
+        keepalive_seconds: float = 15.0,
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield SSE frames for one spectator until the session ends.
+
+        Starts with a `state` frame built from `snapshot()` unless `last_event_id`
+        can be resumed from the ring. A spectator that falls behind the ring gets
+        a fresh `state` frame instead of the events it missed.
+        """
+        buffer = self._buffers.get(session_code)
+        if buffer is None:
+            buffer = self._buffers[session_code] = BroadcastBuffer(
+                self._buffer_size, seq=self.version(session_code)
+            )
+        buffer.subscribers += 1
+        try:
+            cursor = last_event_id if last_event_id is not None else -1
+            if cursor > buffer.seq:
+                cursor = -1  # id from before a restart; start over from a snapshot
+            while True:
+                frames = buffer.since(cursor) if cursor >= 0 else None
+                if frames is None:
+                    state = snapshot()
+                    if state is None:
+                        return
+                    cursor = buffer.seq
+                    yield encode_sse(cursor, "state", state)
+                    continue
+                if frames:
+                    for seq, frame in frames:
+                        cursor = seq
+                        yield frame
+                    continue
+                if buffer.closed:
+                    return
+                await buffer.wait(cursor, keepalive_seconds)
+                if cursor >= buffer.seq and not buffer.closed:
+                    if not is_alive():
+                        return  # session expired without an explicit end
+                    yield KEEPALIVE_FRAME
+        finally:
+            buffer.subscribers -= 1
+            if buffer.subscribers == 0 and self._buffers.get(session_code) is buffer:
+                del self._buffers[session_code]
@@ -1,5 +1,5 @@
 import { CARD_REASONS } from './constants.js';
-import { startTimerCountdown } from './timer.js';
+import { startTimerCountdown, startTimerUntil } from './timer.js';
 import { createWebSocket } from './websocket.js';
 import { demoMethods } from './demo.js';
 import {
@@ -9,11 +9,14 @@ import {
     handleShowResults,
     handleResetForNextLift,
     handleTimerStart,
+    handleTimerTick,
+    handleTimerExpired,
     handleTimerReset,
     handleSessionEnded,
     handleSettingsUpdate,
     handleServerRestarting,
     handleJudgeStatusUpdate,
+    handleClockSync,
 } from './handlers.js';
 
 export function ironVerdictApp() {
@@ -36,6 +39,8 @@ export function ironVerdictApp() {
         resultsShown: false,
         timerDisplay: '60',
         timerExpired: false,
+        clockOffsetMs: null,
+        _serverDeadlineMs: null,
         displayVotes: { left: null, center: null, right: null },
         displayReasons: { left: null, center: null, right: null },
         displayStatus: '',
@@ -134,22 +139,36 @@ export function ironVerdictApp() {
 
         handleMessage(message) {
             const dispatch = {
-                ping:                (self) => self.wsSend({ type: "pong" }),
+                ping:                (self, msg) => self.sendPong(msg.t0),
+                batch:               (self, msg) => msg.messages.forEach(m => self.handleMessage(m)),
                 join_success:        handleJoinSuccess,
                 join_error:          handleJoinError,
                 error:               handleError,
                 show_results:        handleShowResults,
                 reset_for_next_lift: handleResetForNextLift,
                 timer_start:         handleTimerStart,
+                timer_tick:          handleTimerTick,
+                timer_expired:       handleTimerExpired,
                 timer_reset:         handleTimerReset,
                 session_ended:       handleSessionEnded,
                 settings_update:     handleSettingsUpdate,
                 server_restarting:   handleServerRestarting,
                 judge_status_update: handleJudgeStatusUpdate,
+                clock_sync:          handleClockSync,
             };
             dispatch[message.type]?.(this, message);
         },
 
+        sendPong(t0) {
+            // Echo the server's send time with our receive/send times (NTP-style)
+            const now = Date.now();
+            if (t0 == null) {
+                this.wsSend({ type: "pong" });
+            } else {
+                this.wsSend({ type: "pong", t0, t1: now, t2: Date.now() });
+            }
+        },
+
         selectVote(color) {
             if (!this.voteLocked) {
                 this.selectedVote = color;
@@ -263,11 +282,17 @@ export function ironVerdictApp() {
             this.wsSend({ type: 'timer_reset' });
         },
 
-        startTimerCountdown(timeRemainingMs) {
-            startTimerCountdown(timeRemainingMs, (seconds, expired) => {
+        startTimerCountdown(timeRemainingMs, serverDeadlineMs = null) {
+            const onTick = (seconds, expired) => {
                 this.timerDisplay = seconds;
                 this.timerExpired = expired;
-            });
+            };
+            this._serverDeadlineMs = serverDeadlineMs;
+            if (serverDeadlineMs != null && this.clockOffsetMs != null) {
+                startTimerUntil(serverDeadlineMs + this.clockOffsetMs, onTick);
+            } else {
+                startTimerCountdown(timeRemainingMs, onTick);
+            }
         },
 
         nextLift() {
@@ -329,20 +354,6 @@ export function ironVerdictApp() {
             this.timerExpired = false;
         },
 
-        generateQrCode() {
-            const el = document.getElementById('qrcode');
-            if (!el || !this.sessionCode) return;
-            while (el.firstChild) el.removeChild(el.firstChild);
-            const url = window.location.origin + '/?session=' + this.sessionCode;
-            new QRCode(el, {
-                text: url,
-                width: 200,
-                height: 200,
-                colorDark: '#000000',
-                colorLight: '#ffffff',
-            });
-        },
-
         goToContact() {
             this.contactName = '';
             this.contactEmail = '';
@@ -373,13 +384,8 @@ export function ironVerdictApp() {
 
         init() {
 
-            this.$watch('screen', (value) => {
-                if (value === 'role-select' && this.sessionCode) {
-                    setTimeout(() => this.generateQrCode(), 50);
-                }
-            });
-
-            // QR code entry point: ?session=XXXX navigates to role-select
+            // QR code entry point: ?session=XXXX navigates to role-select,
+            // ?session=XXXX&role=left_judge (per-role QR) joins straight away
             const urlParams = new URLSearchParams(window.location.search);
             const urlSession = urlParams.get('session');
             if (urlSession) {
@@ -388,7 +394,12 @@ export function ironVerdictApp() {
                     history.replaceState({}, '', '/');
                     this.sessionCode = trimmed;
                     this.joinCode = trimmed;
-                    this.screen = 'role-select';
+                    const urlRole = urlParams.get('role');
+                    if (['left_judge', 'center_judge', 'right_judge'].includes(urlRole)) {
+                        this.joinSession(urlRole);
+                    } else {
+                        this.screen = 'role-select';
+                    }
                     return;
                 }
             }
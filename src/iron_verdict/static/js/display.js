@@ -0,0 +1,224 @@
+/**
+ * Display-only client for /display/{code}.
+ *
+ * Framework-free so cheap smart-TV browsers boot fast: messages update a
+ * plain state object and the DOM is patched in at most one
+ * requestAnimationFrame per change, touching only nodes whose value moved.
+ * While the clock runs, a timeout wakes the renderer once per second edge.
+ */
+import { createWebSocket } from './websocket.js';
+import { initI18n, t } from './i18n.js';
+import { registerServiceWorker } from './offline.js';
+
+const POSITIONS = ['left', 'center', 'right'];
+const EMPTY = { left: null, center: null, right: null };
+
+const state = {
+    connection: 'disconnected',
+    serverRestarting: false,
+    sessionName: '',
+    timerText: '60',
+    timerExpired: false,
+    phase: 'idle',
+    votes: { ...EMPTY },
+    reasons: { ...EMPTY },
+    showExplanations: false,
+    status: '',
+};
+
+// Countdown target in local epoch ms, or null when the clock is stopped
+let deadline = null;
+let serverDeadlineMs = null;
+let clockOffsetMs = null;
+let frame = null;
+let wakeTimeout = null;
+let ws = null;
+const rendered = new Map();
+const el = {};
+
+function update(patch) {
+    Object.assign(state, patch);
+    requestRender();
+}
+
+function requestRender() {
+    if (frame === null) frame = requestAnimationFrame(render);
+}
+
+function set(node, key, value, apply) {
+    if (rendered.get(key) === value) return;
+    rendered.set(key, value);
+    apply(node, value);
+}
+
+const setText = (node, value) => { node.textContent = value; };
+
+function render() {
+    frame = null;
+    if (deadline !== null) {
+        const remaining = Math.max(0, deadline - Date.now());
+        const seconds = Math.ceil(remaining / 1000);
+        state.timerText = String(seconds);
+        state.timerExpired = seconds === 0;
+        if (seconds === 0) {
+            deadline = null;
+        } else {
+            clearTimeout(wakeTimeout);
+            wakeTimeout = setTimeout(requestRender, remaining % 1000 || 1000);
+        }
+    }
+
+    set(el.connDot, 'conn', state.connection, (n, v) => { n.className = `conn-dot ${v}`; });
+    set(el.restarting, 'restarting', state.serverRestarting, (n, v) => {
+        n.textContent = v ? t('connection.serverRestarting') : '';
+        n.classList.toggle('hidden', !v);
+    });
+    set(el.sessionName, 'name', state.sessionName, setText);
+    set(el.timer, 'timer', state.timerText, setText);
+    set(el.timer, 'expired', state.timerExpired, (n, v) => n.classList.toggle('expired', v));
+
+    for (const pos of POSITIONS) {
+        const vote = state.votes[pos];
+        set(el.orbs[pos], `orb-${pos}`, vote, (n, v) => { n.className = v ? `display-orb ${v}` : 'display-orb'; });
+        const reason = state.showExplanations && vote && vote !== 'white' && state.reasons[pos]
+            ? t(state.reasons[pos]) : '';
+        set(el.reasons[pos], `reason-${pos}`, reason, (n, v) => {
+            n.textContent = v;
+            n.classList.toggle('hidden', !v);
+        });
+    }
+
+    const whiteCount = POSITIONS.filter(pos => state.votes[pos] === 'white').length;
+    const verdict = state.phase === 'votes' ? (whiteCount >= 2 ? 'valid' : 'invalid') : '';
+    set(el.verdict, 'verdict', verdict, (n, v) => {
+        n.style.visibility = v ? '' : 'hidden';
+        if (!v) return;
+        el.verdictStamp.className = `verdict-stamp ${v}`;
+        el.verdictStamp.textContent = v === 'valid' ? t('verdict.goodLift') : t('verdict.noLift');
+    });
+
+    const status = state.status || (state.phase === 'idle' ? t('display.waiting') : '');
+    set(el.status, 'status', status, setText);
+}
+
+function startCountdown(timeRemainingMs, deadlineMs) {
+    serverDeadlineMs = deadlineMs ?? null;
+    deadline = serverDeadlineMs != null && clockOffsetMs != null
+        ? serverDeadlineMs + clockOffsetMs
+        : Date.now() + timeRemainingMs;
+    update({ timerExpired: false });
+}
+
+function stopCountdown(timerText, timerExpired) {
+    deadline = null;
+    serverDeadlineMs = null;
+    clearTimeout(wakeTimeout);
+    update({ timerText: String(timerText), timerExpired });
+}
+
+function sendPong(t0) {
+    const now = Date.now();
+    ws.send(t0 == null ? { type: 'pong' } : { type: 'pong', t0, t1: now, t2: Date.now() });
+}
+
+const handlers = {
+    ping: (msg) => sendPong(msg.t0),
+    batch: (msg) => msg.messages.forEach(handleMessage),
+    join_success: (msg) => {
+        const session = msg.session_state || {};
+        update({ sessionName: session.name || '', status: '' });
+        if (msg.server_time_ms != null) sendPong(msg.server_time_ms);
+        if (session.time_remaining_ms > 0) {
+            startCountdown(session.time_remaining_ms, session.timer_deadline_ms);
+        } else if (session.time_remaining_ms === 0) {
+            stopCountdown(0, true);
+        }
+    },
+    join_error: (msg) => {
+        ws.close();
+        update({ connection: 'disconnected', status: msg.message });
+    },
+    show_results: (msg) => {
+        if (msg.timer_frozen_ms != null) {
+            stopCountdown(Math.ceil(msg.timer_frozen_ms / 1000), state.timerExpired);
+        } else {
+            stopCountdown(state.timerText, state.timerExpired);
+        }
+        update({
+            votes: { ...EMPTY, ...msg.votes },
+            reasons: { ...EMPTY, ...msg.reasons },
+            showExplanations: msg.showExplanations,
+            phase: 'votes',
+            status: '',
+        });
+    },
+    reset_for_next_lift: () => {
+        stopCountdown('60', false);
+        update({ votes: { ...EMPTY }, reasons: { ...EMPTY }, phase: 'idle', status: '' });
+    },
+    timer_start: (msg) => startCountdown(msg.time_remaining_ms, msg.deadline_ms),
+    timer_tick: (msg) => startCountdown(msg.time_remaining_ms, msg.deadline_ms),
+    timer_expired: () => stopCountdown(0, true),
+    timer_reset: () => stopCountdown('60', false),
+    session_ended: () => {
+        ws.close();
+        stopCountdown(state.timerText, state.timerExpired);
+        update({ connection: 'disconnected', status: t('alerts.sessionEnded') });
+    },
+    server_restarting: () => update({ serverRestarting: true }),
+    clock_sync: (msg) => {
+        clockOffsetMs = msg.offset_ms;
+        // Re-anchor a countdown that started before the first offset estimate arrived
+        if (deadline !== null && serverDeadlineMs != null) {
+            deadline = serverDeadlineMs + clockOffsetMs;
+            requestRender();
+        }
+    },
+};
+
+function handleMessage(message) {
+    handlers[message.type]?.(message);
+}
+
+function connect(code) {
+    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+    ws = createWebSocket(
+        `${protocol}//${window.location.host}/ws`,
+        handleMessage,
+        (error) => console.error('WebSocket error:', error),
+        () => {},
+        () => {
+            update({ connection: 'connected', serverRestarting: false });
+            ws.send({ type: 'join', session_code: code, role: 'display' });
+        },
+        () => update({ connection: 'reconnecting' }),
+    );
+}
+
+function init() {
+    el.connDot = document.getElementById('conn-dot');
+    el.restarting = document.getElementById('restarting');
+    el.sessionName = document.getElementById('session-name');
+    el.timer = document.getElementById('timer');
+    el.verdict = document.getElementById('verdict');
+    el.verdictStamp = document.getElementById('verdict-stamp');
+    el.status = document.getElementById('status');
+    el.orbs = {};
+    el.reasons = {};
+    for (const pos of POSITIONS) {
+        el.orbs[pos] = document.getElementById(`orb-${pos}`);
+        el.reasons[pos] = document.getElementById(`reason-${pos}`);
+    }
+
+    const code = decodeURIComponent(window.location.pathname.split('/').pop() || '').trim().toUpperCase();
+    update({ connection: 'reconnecting' });
+    connect(code);
+    // Translations only affect static labels; re-render them once locales arrive
+    initI18n().then(() => {
+        rendered.clear();
+        requestRender();
+    });
+}
+
+init();
+registerServiceWorker();
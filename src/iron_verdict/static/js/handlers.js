@@ -1,4 +1,4 @@
-import { stopTimer } from './timer.js';
+import { stopTimer, isTimerRunning } from './timer.js';
 
 export function handleJoinSuccess(app, message) {
     app.isHead = message.is_head;
@@ -50,9 +50,15 @@ export function handleJoinSuccess(app, message) {
         // Broadcast the server-restored settings to all currently connected clients.
         app.saveSettings();
     }
+    // join_success doubles as the first clock-sync ping
+    if (message.server_time_ms != null) {
+        app.sendPong(message.server_time_ms);
+    }
     const trms = message.session_state?.time_remaining_ms;
     if (trms > 0) {
-        app.startTimerCountdown(trms);
+        app.startTimerCountdown(trms, message.session_state?.timer_deadline_ms);
+    } else if (trms === 0) {
+        handleTimerExpired(app, message);
     }
 }
 
@@ -122,7 +128,18 @@ export function handleResetForNextLift(app, message) {
 }
 
 export function handleTimerStart(app, message) {
-    app.startTimerCountdown(message.time_remaining_ms);
+    app.startTimerCountdown(message.time_remaining_ms, message.deadline_ms);
+}
+
+export function handleTimerTick(app, message) {
+    // Server-authoritative resync — corrects any local interval drift
+    app.startTimerCountdown(message.time_remaining_ms, message.deadline_ms);
+}
+
+export function handleTimerExpired(app, message) {
+    stopTimer();
+    app.timerDisplay = 0;
+    app.timerExpired = true;
 }
 
 export function handleTimerReset(app, message) {
@@ -158,3 +175,11 @@ export function handleServerRestarting(app, _message) {
 export function handleJudgeStatusUpdate(app, message) {
     app.judgeConnected[message.position] = message.connected;
 }
+
+export function handleClockSync(app, message) {
+    app.clockOffsetMs = message.offset_ms;
+    // Re-anchor a countdown that started before the first offset estimate arrived
+    if (isTimerRunning() && app._serverDeadlineMs != null) {
+        app.startTimerCountdown(null, app._serverDeadlineMs);
+    }
+}
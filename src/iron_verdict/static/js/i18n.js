@@ -11,9 +11,14 @@
 const SUPPORTED_LANGS = ['en', 'de'];
 const DEFAULT_LANG = 'en';
 const STORAGE_KEY = 'iron-verdict-lang';
+// The preference is mirrored into a cookie (also named STORAGE_KEY) so the
+// server can inline the right locale in the page
+const COOKIE_MAX_AGE = 365 * 24 * 60 * 60;
 
 /** Loaded locale data: { en: {...}, de: {...} } */
 const locales = {};
+/** Locale JSON URLs (fingerprinted when the server inlined them) */
+let localeUrls = {};
 
 /**
  * Resolve initial language from localStorage → navigator.language → default.
@@ -36,24 +41,55 @@ function resolve(obj, keyPath) {
     return keyPath.split('.').reduce((acc, part) => acc?.[part], obj);
 }
 
+function storeCookie(lang) {
+    document.cookie = `${STORAGE_KEY}=${lang}; Path=/; Max-Age=${COOKIE_MAX_AGE}; SameSite=Lax`;
+}
+
 /**
- * Load all locale JSON files. Call once at startup.
+ * Fetch a locale unless it is already loaded.
+ */
+function loadLocale(lang) {
+    if (locales[lang]) return Promise.resolve(locales[lang]);
+    const url = localeUrls[lang] || `/static/locales/${lang}.json`;
+    return fetch(url).then(r => r.json()).then(data => { locales[lang] = data; return data; });
+}
+
+/**
+ * Load locales. Call once at startup.
+ *
+ * The server inlines the visitor's locale into the page (#locale-data), so
+ * normally nothing is fetched before first render; the other locales load
+ * in the background for the fallback and the language switcher.
  */
 export async function initI18n() {
-    const results = await Promise.all(
-        SUPPORTED_LANGS.map(lang =>
-            fetch(`/static/locales/${lang}.json`).then(r => r.json())
-        )
-    );
-    SUPPORTED_LANGS.forEach((lang, i) => { locales[lang] = results[i]; });
+    const inline = document.getElementById('locale-data');
+    if (inline) {
+        try {
+            const data = JSON.parse(inline.textContent);
+            locales[data.lang] = data.messages;
+            localeUrls = data.urls || {};
+        } catch (_e) {}
+    }
 
     const lang = resolveLanguage();
+    if (localStorage.getItem(STORAGE_KEY)) storeCookie(lang);
+    await loadLocale(lang);
     document.documentElement.lang = lang;
 
+    SUPPORTED_LANGS.forEach(other => {
+        if (other !== lang) loadLocale(other).then(bumpStore).catch(() => {});
+    });
+
     // Alpine store will be created in init.js after Alpine is ready
     return lang;
 }
 
+function bumpStore() {
+    if (typeof Alpine !== 'undefined' && Alpine.store('i18n')) {
+        Alpine.store('i18n')._v++;
+    }
+}
+
 /**
  * Look up a translation key against the current language.
  * Falls back to English if key is missing in current language.
@@ -71,11 +107,14 @@ export function t(key) {
 export function setLanguage(lang) {
     if (!SUPPORTED_LANGS.includes(lang)) return;
     localStorage.setItem(STORAGE_KEY, lang);
+    storeCookie(lang);
     document.documentElement.lang = lang;
     if (typeof Alpine !== 'undefined' && Alpine.store('i18n')) {
         Alpine.store('i18n').lang = lang;
         Alpine.store('i18n')._v++;
     }
+    // Normally loaded in the background already; re-render once it arrives if not
+    loadLocale(lang).then(bumpStore).catch(() => {});
 }
 
 /**
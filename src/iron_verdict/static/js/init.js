@@ -1,5 +1,6 @@
 import { ironVerdictApp } from './app.js';
 import { initI18n, t, setLanguage, getLanguage } from './i18n.js';
+import { registerServiceWorker } from './offline.js';
 
 // Read demo join params from URL before Alpine loads.
 (function () {
@@ -19,6 +20,8 @@ initI18n().then(lang => {
     }
 });
 
+registerServiceWorker();
+
 // Expose as global so Alpine can call ironVerdictApp()
 window.ironVerdictApp = ironVerdictApp;
 
@@ -0,0 +1,11 @@
+/**
+ * Register the app-shell service worker (see /sw.js). Safe to call from
+ * every entry point; browsers without support, or insecure origins other
+ * than localhost, simply skip it.
+ */
+export function registerServiceWorker() {
+    if (!('serviceWorker' in navigator)) return;
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register('/sw.js').catch(err => console.warn('Service worker registration failed:', err));
+    });
+}
@@ -1,11 +1,19 @@
 let timerInterval = null;
 
 export function startTimerCountdown(ms, onTick) {
+    startTimerUntil(Date.now() + ms, onTick);
+}
+
+/**
+ * Count down to an absolute local deadline (epoch ms). Used when the server's
+ * deadline has been converted with this client's clock offset, so every
+ * screen shows the same second regardless of link latency.
+ */
+export function startTimerUntil(deadline, onTick) {
     stopTimer();
-    const startedAt = Date.now();
 
     timerInterval = setInterval(() => {
-        const remaining = Math.max(0, ms - (Date.now() - startedAt));
+        const remaining = Math.max(0, deadline - Date.now());
         const seconds = Math.ceil(remaining / 1000);
         onTick(seconds, seconds === 0);
 
@@ -16,6 +24,10 @@ export function startTimerCountdown(ms, onTick) {
     }, 100);
 }
 
+export function isTimerRunning() {
+    return timerInterval !== null;
+}
+
 export function stopTimer() {
     if (timerInterval) {
         clearInterval(timerInterval);
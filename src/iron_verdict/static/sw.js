@@ -0,0 +1,78 @@
+/**
+ * Service worker: precaches the versioned app shell so a judge or display
+ * that reloads while offline (or on flaky Wi-Fi) starts instantly from
+ * cache and only needs the network for the WebSocket.
+ *
+ * Served from /sw.js with the placeholders filled in by the server. The
+ * cache name changes with every deploy (APP_VERSION plus a digest of the
+ * shell), which drops the previous version's cache on activation.
+ */
+const CACHE_NAME = '__CACHE_NAME__';
+const CACHE_PREFIX = 'iron-verdict-';
+const PRECACHE = __PRECACHE__;
+// Every /display/{code} navigation is served by one cached page
+const DISPLAY_SHELL = '__DISPLAY_SHELL__';
+// Fingerprinted assets never change under the same URL
+const HASHED = /\.[0-9a-f]{10}\.[a-z0-9]+$/;
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(
+        caches.open(CACHE_NAME)
+            .then(cache => cache.addAll(PRECACHE.map(url => new Request(url, { cache: 'reload' }))))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(
+                keys.filter(key => key.startsWith(CACHE_PREFIX) && key !== CACHE_NAME)
+                    .map(key => caches.delete(key))
+            ))
+            .then(() => self.clients.claim())
+    );
+});
+
+/** Answer from cache and refresh the cached copy in the background. */
+function staleWhileRevalidate(event, cacheKey) {
+    const network = fetch(event.request).then(response => {
+        if (response.ok) {
+            const copy = response.clone();
+            caches.open(CACHE_NAME).then(cache => cache.put(cacheKey, copy));
+        }
+        return response;
+    });
+    event.waitUntil(network.catch(() => {}));
+    return caches.match(cacheKey, { ignoreSearch: true }).then(cached => cached || network);
+}
+
+function cacheFirst(request) {
+    return caches.match(request).then(cached => cached || fetch(request).then(response => {
+        if (response.ok) {
+            const copy = response.clone();
+            caches.open(CACHE_NAME).then(cache => cache.put(request, copy));
+        }
+        return response;
+    }));
+}
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) return;
+
+    if (request.mode === 'navigate') {
+        if (url.pathname === '/') {
+            event.respondWith(staleWhileRevalidate(event, '/'));
+        } else if (url.pathname.startsWith('/display/')) {
+            event.respondWith(staleWhileRevalidate(event, DISPLAY_SHELL));
+        }
+        return;
+    }
+    if (url.pathname.startsWith('/static/')) {
+        event.respondWith(HASHED.test(url.pathname) ? cacheFirst(request) : staleWhileRevalidate(event, request));
+    }
+    // API calls, /ws and /sw.js itself always go to the network
+});
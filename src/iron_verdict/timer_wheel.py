@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import math
+import time
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+logger = logging.getLogger("iron_verdict")
+
+
+class TimerWheel:
+    """
+    Hashed timing wheel that drives every session's attempt clock from one task.
+
+    Each session has at most one entry, keyed by session code. An entry fires
+    ``on_expire`` once its deadline passes and, if ``tick_interval`` is set,
+    ``on_tick`` every ``tick_interval`` seconds before that. Deadlines are
+    wall-clock epoch seconds so they line up with ``timer_started_at``.
+    """
+
+    def __init__(
+        self,
+        on_expire: Callable[[str], Awaitable[None]],
+        on_tick: Callable[[str, int], Awaitable[None]] | None = None,
+        tick_interval: float = 0,
+        resolution: float = 0.1,
+        slots: int = 1024,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._on_expire = on_expire
+        self._on_tick = on_tick
+        self._tick_interval = tick_interval
+        self._resolution = resolution
+        self._clock = clock
+        # Each slot maps session_code -> (deadline, next_tick_at)
+        self._slots: List[Dict[str, Tuple[float, float | None]]] = [{} for _ in range(slots)]
+        self._entries: Dict[str, int] = {}
+        self._current_tick: int | None = None
+        self._wakeup = asyncio.Event()
+
+    def _tick_of(self, t: float) -> int:
+        return math.ceil(t / self._resolution)
+
+    def _place(self, code: str, deadline: float, next_tick_at: float | None) -> None:
+        due = deadline if next_tick_at is None else min(deadline, next_tick_at)
+        if self._current_tick is None:
+            # Idle wheel: start the sweep from now, so an entry due now or already
+            # past is picked up by the next advance instead of a revolution later
+            self._current_tick = self._tick_of(self._clock())
+        tick = max(self._tick_of(due), self._current_tick)
+        slot = tick % len(self._slots)
+        self._slots[slot][code] = (deadline, next_tick_at)
+        self._entries[code] = slot
+
+    def schedule(self, code: str, deadline: float) -> None:
+        """Start (or restart) the clock for a session, expiring at `deadline`."""
+        self.cancel(code)
+        next_tick_at = None
+        if self._on_tick is not None and self._tick_interval > 0:
+            # Ticks land on whole multiples of tick_interval before the deadline
+            ticks_left = math.ceil((deadline - self._clock()) / self._tick_interval) - 1
+            if ticks_left > 0:
+                next_tick_at = deadline - self._tick_interval * ticks_left
+        self._place(code, deadline, next_tick_at)
+        self._wakeup.set()
+
+    def cancel(self, code: str) -> None:
+        """Stop a session's clock without firing any event. No-op if not scheduled."""
+        slot = self._entries.pop(code, None)
+        if slot is not None:
+            self._slots[slot].pop(code, None)
+            self._release(slot)
+
+    def _release(self, slot: int) -> None:
+        # A dict keeps its table after emptying; clear() frees it so idle slots cost nothing
+        if not self._slots[slot]:
+            self._slots[slot].clear()
+
+    def is_scheduled(self, code: str) -> bool:
+        return code in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def advance(self, now: float | None = None) -> None:
+        """Process every slot up to `now`, firing due expiries and ticks."""
+        now = self._clock() if now is None else now
+        target = self._tick_of(now)
+        if self._current_tick is None:
+            self._current_tick = target
+        while self._current_tick <= target:
+            index = self._current_tick % len(self._slots)
+            slot = self._slots[index]
+            for code, entry in list(slot.items()):
+                if slot.get(code) is not entry:
+                    continue  # cancelled or rescheduled by an earlier callback
+                deadline, next_tick_at = entry
+                if deadline <= now:
+                    del slot[code]
+                    del self._entries[code]
+                    await self._fire(self._on_expire, code)
+                elif next_tick_at is not None and next_tick_at <= now:
+                    del slot[code]
+                    remaining_ms = int(round((deadline - next_tick_at) * 1000))
+                    following = next_tick_at + self._tick_interval
+                    self._place(code, deadline, following if following < deadline else None)
+                    await self._fire(self._on_tick, code, remaining_ms)
+            self._release(index)
+            self._current_tick += 1
+        self._current_tick = target
+
+    async def _fire(self, callback, *args) -> None:
+        try:
+            await callback(*args)
+        except Exception:
+            logger.exception("timer_callback_failed", extra={"session_code": args[0]})
+
+    async def run(self) -> None:
+        """Drive the wheel until cancelled. Sleeps indefinitely while no clocks run."""
+        while True:
+            if not self._entries:
+                self._wakeup.clear()
+                self._current_tick = None
+                await self._wakeup.wait()
+            now = self._clock()
+            next_edge = (self._tick_of(now) + 1) * self._resolution
+            await asyncio.sleep(max(0.0, next_edge - now))
+            await self.advance()
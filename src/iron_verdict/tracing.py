@@ -0,0 +1,206 @@
+"""
+In-process tracing for the verdict path.
+
+A trace starts at a root span (``tracer.trace``) and collects the child
+spans (``tracer.span``) opened while it is the current span, across awaits
+and tasks started from it. Finished traces are kept in a fixed-size ring
+buffer for ``/debug/traces`` and can be appended to a file as OTLP/JSON, one
+``ExportTraceServiceRequest`` per line, by a writer thread.
+
+When tracing is disabled ``trace`` and ``span`` return a shared no-op
+context manager, and ``span`` does the same outside a trace, so
+instrumented code costs one attribute check.
+"""
+
+import json
+import queue
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Dict, List
+
+SERVICE_NAME = "iron-verdict"
+
+_current: ContextVar["Span | None"] = ContextVar("iron_verdict_span", default=None)
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes", "start_ns", "end_ns", "trace")
+
+    def __init__(self, name: str, attributes: Dict[str, Any], parent: "Span | None", start_ns: int):
+        self.name = name
+        self.attributes = attributes
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.start_ns = start_ns
+        self.end_ns = 0
+        if parent is None:
+            self.trace_id = f"{random.getrandbits(128):032x}"
+            self.parent_id = None
+            self.trace: List[Span] = []
+        else:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+            self.trace = parent.trace
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self, origin_ns: int) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_offset_ms": round((self.start_ns - origin_ns) / 1e6, 3),
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NOOP = _NoopSpan()
+
+
+class _ActiveSpan:
+    __slots__ = ("_tracer", "_span", "_token")
+
+    def __init__(self, tracer: "Tracer", span: Span):
+        self._tracer = tracer
+        self._span = span
+
+    def __enter__(self) -> Span:
+        self._token = _current.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        span = self._span
+        span.end_ns = time.time_ns()
+        if exc_type is not None:
+            span.attributes["error"] = exc_type.__name__
+        _current.reset(self._token)
+        span.trace.append(span)
+        if span.parent_id is None:
+            self._tracer._finish(span)
+        return False
+
+
+class Tracer:
+    """Span factory and ring buffer of finished traces; configure once at startup."""
+
+    def __init__(self, enabled: bool = False, capacity: int = 200, export_path: str = ""):
+        self.enabled = False
+        self.traces: deque = deque(maxlen=capacity)
+        self._export_queue: queue.Queue | None = None
+        self.configure(enabled, capacity, export_path)
+
+    def configure(self, enabled: bool, capacity: int = 200, export_path: str = "") -> None:
+        self.enabled = enabled
+        if capacity != self.traces.maxlen:
+            self.traces = deque(self.traces, maxlen=capacity)
+        if enabled and export_path and self._export_queue is None:
+            self._export_queue = queue.Queue(maxsize=1000)
+            threading.Thread(
+                target=_write_exports, args=(self._export_queue, export_path), name="trace-export", daemon=True
+            ).start()
+
+    def trace(self, name: str, started_at: float | None = None, **attributes):
+        """Start a new trace. `started_at` is a ``time.perf_counter()`` value to backdate the root to."""
+        if not self.enabled:
+            return NOOP
+        start_ns = time.time_ns()
+        if started_at is not None:
+            start_ns -= int((time.perf_counter() - started_at) * 1e9)
+        return _ActiveSpan(self, Span(name, attributes, None, start_ns))
+
+    def span(self, name: str, **attributes):
+        """Open a child of the current span; a no-op outside a trace."""
+        if not self.enabled:
+            return NOOP
+        parent = _current.get()
+        if parent is None:
+            return NOOP
+        return _ActiveSpan(self, Span(name, attributes, parent, time.time_ns()))
+
+    def _finish(self, root: Span) -> None:
+        self.traces.append(root)
+        if self._export_queue is not None:
+            try:
+                self._export_queue.put_nowait(root)
+            except queue.Full:
+                pass  # the export file is best effort; the ring buffer still has it
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """The newest finished traces, newest first, with span timings relative to the root."""
+        out = []
+        for root in list(self.traces)[-limit:][::-1]:
+            spans = sorted(root.trace, key=lambda s: s.start_ns)
+            out.append({
+                "trace_id": root.trace_id,
+                "name": root.name,
+                "start": root.start_ns / 1e9,
+                "duration_ms": round((root.end_ns - root.start_ns) / 1e6, 3),
+                "spans": [span.to_dict(root.start_ns) for span in spans],
+            })
+        return out
+
+    def to_otlp(self, limit: int | None = None) -> Dict[str, Any]:
+        roots = list(self.traces) if limit is None else list(self.traces)[-limit:]
+        return otlp_request([span for root in roots for span in root.trace])
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def otlp_request(spans: List[Span]) -> Dict[str, Any]:
+    """Spans as an OTLP/JSON ``ExportTraceServiceRequest``."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{
+                "scope": {"name": "iron_verdict"},
+                "spans": [
+                    {
+                        "traceId": span.trace_id,
+                        "spanId": span.span_id,
+                        **({"parentSpanId": span.parent_id} if span.parent_id else {}),
+                        "name": span.name,
+                        "kind": 1,  # SPAN_KIND_INTERNAL
+                        "startTimeUnixNano": str(span.start_ns),
+                        "endTimeUnixNano": str(span.end_ns),
+                        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+                        "status": {"code": 2} if "error" in span.attributes else {},
+                    }
+                    for span in spans
+                ],
+            }],
+        }],
+    }
+
+
+def _write_exports(exports: queue.Queue, path: str) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        while True:
+            root = exports.get()
+            f.write(json.dumps(otlp_request(list(root.trace)), separators=(",", ":")) + "\n")
+            f.flush()
+
+
+tracer = Tracer()
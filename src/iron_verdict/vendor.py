@@ -0,0 +1,115 @@
+"""
+Third-party front-end dependencies that can ship inside ``static/`` for
+venues without a reliable uplink (``OFFLINE_ASSETS=true``).
+
+The files are not committed. Fetch them as a packaging step, after the
+package is installed:
+
+    python -m iron_verdict.vendor
+
+Scripts are verified against the same SRI hashes that index.html pins.
+"""
+
+import argparse
+import base64
+import hashlib
+import os
+import re
+import sys
+import urllib.request
+from typing import Dict, List
+
+VENDOR_DIR = os.path.join(os.path.dirname(__file__), "static", "vendor")
+
+SCRIPTS = [
+    {
+        "url": "https://cdn.jsdelivr.net/npm/alpinejs@3.14.1/dist/cdn.min.js",
+        "path": "alpinejs-3.14.1.min.js",
+        "integrity": "sha384-l8f0VcPi/M1iHPv8egOnY/15TDwqgbOR1anMIJWvU6nLRgZVLTLSaNqi/TOoT5Fh",
+    },
+]
+
+FONTS_URL = "https://fonts.googleapis.com/css2?family=Bebas+Neue&family=Rajdhani:wght@400;600;700&display=swap"
+FONTS_CSS = "fonts.css"
+
+# Google Fonts picks the font format from the User-Agent; ask for woff2
+_FONTS_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+_FONT_URL_RE = re.compile(r"url\((https://fonts\.gstatic\.com/[^)]+)\)")
+
+
+def sri(data: bytes) -> str:
+    return "sha384-" + base64.b64encode(hashlib.sha384(data).digest()).decode()
+
+
+def local_urls(prefix: str = "/static/vendor") -> Dict[str, str]:
+    """Map each CDN URL referenced by index.html to its vendored location."""
+    urls = {script["url"]: f"{prefix}/{script['path']}" for script in SCRIPTS}
+    urls[FONTS_URL] = f"{prefix}/{FONTS_CSS}"
+    return urls
+
+
+def missing_files(directory: str = VENDOR_DIR) -> List[str]:
+    """Vendored files that are absent or don't match their pinned integrity hash."""
+    missing = []
+    for script in SCRIPTS:
+        path = os.path.join(directory, script["path"])
+        if not os.path.isfile(path):
+            missing.append(script["path"])
+            continue
+        with open(path, "rb") as f:
+            if sri(f.read()) != script["integrity"]:
+                missing.append(script["path"])
+    if not os.path.isfile(os.path.join(directory, FONTS_CSS)):
+        missing.append(FONTS_CSS)
+    return missing
+
+
+def _fetch(url: str, headers: Dict[str, str] | None = None) -> bytes:
+    request = urllib.request.Request(url, headers=headers or {})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def _write(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def download(directory: str = VENDOR_DIR) -> None:
+    """Download and verify every vendored file into `directory`."""
+    for script in SCRIPTS:
+        data = _fetch(script["url"])
+        if sri(data) != script["integrity"]:
+            raise ValueError(f"Integrity mismatch for {script['url']}: got {sri(data)}")
+        _write(os.path.join(directory, script["path"]), data)
+        print(f"  {script['path']} ({len(data)} bytes)")
+
+    css = _fetch(FONTS_URL, {"User-Agent": _FONTS_USER_AGENT}).decode("utf-8")
+    for font_url in sorted(set(_FONT_URL_RE.findall(css))):
+        # https://fonts.gstatic.com/s/rajdhani/v15/abc.woff2 -> fonts/rajdhani-v15-abc.woff2
+        name = "-".join(font_url.split("/s/", 1)[1].split("/"))
+        _write(os.path.join(directory, "fonts", name), _fetch(font_url))
+        css = css.replace(font_url, f"fonts/{name}")
+        print(f"  fonts/{name}")
+    _write(os.path.join(directory, FONTS_CSS), css.encode("utf-8"))
+    print(f"  {FONTS_CSS}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Download front-end dependencies for OFFLINE_ASSETS mode")
+    parser.add_argument("--dest", default=VENDOR_DIR, help="Target directory (default: the package's static/vendor)")
+    args = parser.parse_args()
+    print(f"Vendoring into {args.dest}")
+    try:
+        download(args.dest)
+    except Exception as e:
+        print(f"Vendoring failed: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
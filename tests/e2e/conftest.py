@@ -129,6 +129,17 @@ class CompetitionHelper:
         self.pages[role] = page
         return page
 
+    def open_display_page(self):
+        """Open the lightweight /display/{code} page. Returns page."""
+        ctx = self.browser.new_context(locale="en-US")
+        self.contexts.append(ctx)
+        page = ctx.new_page()
+        page.goto(f"{self.url}/display/{self.session_code}")
+        page.locator("#conn-dot.connected").wait_for(state="attached")
+
+        self.pages["display"] = page
+        return page
+
     def join_all_judges(self):
         """Create session + join all 3 judges. Returns (head, left, right)."""
         head = self.create_session_and_join_head()
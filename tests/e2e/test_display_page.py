@@ -0,0 +1,47 @@
+"""Lightweight display page — /display/{code} mirrors the display screen without Alpine."""
+
+import re
+from playwright.sync_api import expect
+
+
+def test_display_page_shows_session_and_waiting(competition):
+    competition.create_session_and_join_head(name="Platform A")
+    display = competition.open_display_page()
+
+    expect(display.locator("#session-name")).to_have_text("Platform A")
+    expect(display.locator("#status")).to_have_text("Waiting for judges...")
+    expect(display.locator("#timer")).to_have_text("60")
+
+
+def test_display_page_shows_results_and_resets(competition):
+    head, left, right = competition.join_all_judges()
+    display = competition.open_display_page()
+
+    competition.vote_and_lock(head, "white")
+    competition.vote_and_lock(left, "red", reason="Depth")
+    competition.vote_and_lock(right, "white")
+
+    expect(display.locator("#verdict-stamp")).to_have_text("Good Lift")
+    expect(display.locator("#orb-left")).to_have_class(re.compile(r"\\bred\\b"))
+
+    head.get_by_role("button", name="Next Lift").click()
+    expect(display.locator("#verdict")).to_have_css("visibility", "hidden")
+    expect(display.locator("#orb-left")).not_to_have_class(re.compile(r"\\bred\\b"))
+
+
+def test_display_page_counts_down(competition):
+    head = competition.create_session_and_join_head()
+    display = competition.open_display_page()
+
+    head.get_by_role("button", name="Start Timer").click()
+    expect(display.locator("#timer")).not_to_have_text("60", timeout=3000)
+
+
+def test_display_page_unknown_session_shows_error(competition):
+    competition.session_code = "NOPE0000"
+    ctx = competition.browser.new_context(locale="en-US")
+    competition.contexts.append(ctx)
+    page = ctx.new_page()
+    page.goto(f"{competition.url}/display/NOPE0000")
+    expect(page.locator("#status")).not_to_be_empty()
+    expect(page.locator("#conn-dot")).to_have_class(re.compile(r"\\bdisconnected\\b"))
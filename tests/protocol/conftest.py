@@ -0,0 +1,313 @@
+"""Protocol test infrastructure — in-process clients, a fake clock, and CompetitionHelper.
+
+The same competition flows as tests/e2e, driven at the WebSocket protocol
+level against the ASGI app in-process: no server thread, no browser. The
+fake clock is installed into the session, connection and timer-wheel
+singletons, so attempt timers and heartbeat timeouts run on demand.
+"""
+
+import asyncio
+import time
+
+import httpx
+import httpx_ws
+import pytest
+from httpx_ws.transport import ASGIWebSocketTransport
+
+from iron_verdict import main
+from iron_verdict.config import settings
+
+RECEIVE_TIMEOUT = 2.0
+SYNC_REPLY = {"type": "error", "message": "Invalid JSON format"}
+
+
+# ---------------------------------------------------------------------------
+# 1. Fake clock
+# ---------------------------------------------------------------------------
+
+class FakeClock:
+    """A clock that only moves when told to. Starts at the current epoch time."""
+
+    def __init__(self, start: float | None = None):
+        self.now = time.time() if start is None else start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture()
+async def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(main.session_manager, "_clock", fake)
+    monkeypatch.setattr(main.connection_manager, "_clock", fake)
+    monkeypatch.setattr(main.timer_wheel, "_clock", fake)
+    # Anchor the wheel at the fake time, as its run loop would on first schedule
+    monkeypatch.setattr(main.timer_wheel, "_current_tick", None)
+    await main.timer_wheel.advance()
+    return fake
+
+
+# ---------------------------------------------------------------------------
+# 2. Per-test cleanup (autouse)
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(autouse=True)
+def _reset_server_state(monkeypatch):
+    main.limiter.reset()
+    # Scenarios send faster than a person taps; the flood limit is not under test here
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    yield
+    for code in list(main.session_manager.sessions):
+        main.timer_wheel.cancel(code)
+    main.session_manager.sessions.clear()
+    main.connection_manager.active_connections.clear()
+
+
+def _asgi_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=ASGIWebSocketTransport(app=main.app), base_url="http://test")
+
+
+# ---------------------------------------------------------------------------
+# 3. Client — one WebSocket connection, as one browser tab
+# ---------------------------------------------------------------------------
+
+class Client:
+    """
+    One WebSocket connection. A reader task keeps every message it receives,
+    so tests can await a message type or inspect what has arrived so far.
+
+    Each client runs in its own task, so clients can close in any order.
+    """
+
+    def __init__(self):
+        self.messages: list[dict] = []
+        self.close_code: int | None = None
+        # The join_success or join_error this connection got, once it has joined
+        self.joined: dict | None = None
+        self._unread: list[dict] = []
+        self._arrived = asyncio.Event()
+        self._ws = None
+        self._task: asyncio.Task | None = None
+
+    async def connect(self) -> "Client":
+        opened = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run(opened))
+        await opened
+        return self
+
+    async def _run(self, opened: asyncio.Future) -> None:
+        try:
+            async with _asgi_client() as http, httpx_ws.aconnect_ws("ws://test/ws", http) as ws:
+                self._ws = ws
+                opened.set_result(None)
+                # Handled inside the client, or the transport reraises it as an ExceptionGroup
+                try:
+                    while True:
+                        frame = await ws.receive_json()
+                        for message in frame["messages"] if frame.get("type") == "batch" else [frame]:
+                            if message != SYNC_REPLY:
+                                self.messages.append(message)
+                            self._unread.append(message)
+                        self._arrived.set()
+                except httpx_ws.WebSocketDisconnect as exc:
+                    self.close_code = exc.code
+                except httpx_ws.WebSocketNetworkError:
+                    pass
+        except Exception as exc:
+            if opened.done():
+                raise
+            opened.set_exception(exc)
+        finally:
+            if self.close_code is None:
+                self.close_code = 1006
+            self._arrived.set()
+
+    @property
+    def closed(self) -> bool:
+        return self._task is None or self._task.done()
+
+    async def send(self, message_type: str, **fields) -> None:
+        await self._ws.send_json({"type": message_type, **fields})
+
+    async def receive(self, message_type: str, timeout: float = RECEIVE_TIMEOUT) -> dict:
+        """Return the oldest unread message of `message_type`, waiting for one if needed."""
+        return await self._take(lambda message: message["type"] == message_type, message_type, timeout)
+
+    async def _take(self, match, description: str, timeout: float) -> dict:
+        async def wait():
+            while True:
+                for message in self._unread:
+                    if match(message):
+                        self._unread.remove(message)
+                        return message
+                if self.closed:
+                    raise AssertionError(f"connection closed ({self.close_code}) before {description!r} arrived")
+                self._arrived.clear()
+                await self._arrived.wait()
+
+        return await asyncio.wait_for(wait(), timeout)
+
+    def received(self, message_type: str) -> list[dict]:
+        """Every message of `message_type` received so far, read or not, except sync replies."""
+        return [message for message in self.messages if message["type"] == message_type]
+
+    async def sync(self) -> None:
+        """
+        Wait until the server has handled everything this client sent.
+
+        Invalid JSON gets an immediate error reply, and the server handles a
+        connection's messages in order, so once that reply is here so is
+        every reply to what was sent before it.
+        """
+        if self.closed:
+            return
+        await self._ws.send_text("sync")
+        try:
+            await self._take(lambda message: message == SYNC_REPLY, "sync", RECEIVE_TIMEOUT)
+        except AssertionError:
+            if not self.closed:
+                raise
+            # Closed by the server meanwhile, which also means it is done with us
+
+    async def wait_closed(self, timeout: float = RECEIVE_TIMEOUT) -> int:
+        await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        return self.close_code
+
+    async def close(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+# ---------------------------------------------------------------------------
+# 4. CompetitionHelper — the e2e helper's flows at protocol level
+# ---------------------------------------------------------------------------
+
+class CompetitionHelper:
+    """Creates a session and joins clients to it; mirrors tests/e2e CompetitionHelper."""
+
+    def __init__(self, clock: FakeClock):
+        self.clock = clock
+        self.session_code: str | None = None
+        self.clients: dict[str, Client] = {}
+        self.tokens: dict[str, str] = {}
+        self._all: list[Client] = []
+
+    async def cleanup(self):
+        for client in self._all:
+            await client.close()
+
+    async def open(self) -> Client:
+        """Open a connection that has not joined anything."""
+        client = await Client().connect()
+        self._all.append(client)
+        return client
+
+    async def create_session(self, name: str = "Test Session") -> str:
+        async with _asgi_client() as http:
+            response = await http.post("/api/sessions", json={"name": name})
+        response.raise_for_status()
+        self.session_code = response.json()["session_code"]
+        return self.session_code
+
+    async def create_session_and_join_head(self, name: str = "Test Session") -> Client:
+        """Create a session and join as head judge. Returns the client."""
+        await self.create_session(name)
+        return await self.join_as("center_judge")
+
+    async def try_join(self, role: str, reconnect_token: str | None = None) -> tuple[Client, dict]:
+        """Join `role` and return the client with join_success or join_error, whichever came."""
+        client = await self.open()
+        join = {"session_code": self.session_code, "role": role}
+        if reconnect_token:
+            join["reconnect_token"] = reconnect_token
+        await client.send("join", **join)
+        reply = await client._take(
+            lambda message: message["type"] in ("join_success", "join_error"), f"join as {role}", RECEIVE_TIMEOUT
+        )
+        client.joined = reply
+        if reply["type"] == "join_success":
+            if role != "display":
+                self.clients[role] = client
+            if reply.get("reconnect_token"):
+                self.tokens[role] = reply["reconnect_token"]
+        return client, reply
+
+    async def join_as(self, role: str, reconnect_token: str | None = None) -> Client:
+        """Join an existing session as `role`. Returns the client."""
+        client, reply = await self.try_join(role, reconnect_token)
+        assert reply["type"] == "join_success", reply
+        return client
+
+    async def open_display(self) -> Client:
+        return await self.join_as("display")
+
+    async def join_all_judges(self) -> tuple[Client, Client, Client]:
+        """Create session + join all 3 judges. Returns (head, left, right)."""
+        head = await self.create_session_and_join_head()
+        left = await self.join_as("left_judge")
+        right = await self.join_as("right_judge")
+        await self.settle()
+        return head, left, right
+
+    async def reconnect(self, role: str) -> Client:
+        """The page for `role` reloads: its socket drops and it rejoins with its token."""
+        await self.drop(role)
+        return await self.join_as(role, self.tokens.get(role))
+
+    async def drop(self, role: str) -> None:
+        """Close the connection for `role` and wait for the server to notice."""
+        client = self.clients.pop(role)
+        await client.close()
+        # The server handles the disconnect on its own schedule; wait for its bookkeeping
+        position = role.replace("_judge", "")
+        for _ in range(100):
+            if await main.connection_manager.get_connection(self.session_code, role) is not client._ws:
+                judges = main.session_manager.sessions.get(self.session_code, {}).get("judges", {})
+                if not judges.get(position, {}).get("connected"):
+                    break
+            await asyncio.sleep(0)
+        await self.settle()
+
+    async def vote_and_lock(self, client: Client, color: str, reason: str | None = None) -> None:
+        """Lock in a vote and wait until the server and every client have seen it."""
+        await client.send("vote_lock", color=color, reason=reason)
+        await self.settle()
+
+    async def vote_all_white(self) -> None:
+        """All 3 judges vote white and lock in."""
+        for role in ("center_judge", "left_judge", "right_judge"):
+            await self.vote_and_lock(self.clients[role], "white")
+
+    async def head_sends(self, message_type: str, **fields) -> None:
+        await self.clients["center_judge"].send(message_type, **fields)
+        await self.settle()
+
+    async def settle(self) -> None:
+        """Wait until every open client's messages are handled and their replies delivered."""
+        for client in self._all:
+            await client.sync()
+
+    async def advance(self, seconds: float) -> None:
+        """Move the fake clock forward and fire any attempt timers now due."""
+        self.clock.advance(seconds)
+        await main.timer_wheel.advance()
+        await self.settle()
+
+    async def heartbeat(self) -> None:
+        """Run one heartbeat round at the fake clock's time."""
+        await main.check_heartbeats(self.clock())
+
+
+# ---------------------------------------------------------------------------
+# 5. Competition fixture
+# ---------------------------------------------------------------------------
+
+@pytest.fixture()
+async def competition(clock):
+    helper = CompetitionHelper(clock)
+    yield helper
+    await helper.cleanup()
@@ -0,0 +1,52 @@
+"""Competition flow — full lift cycles and reasons, at protocol level."""
+
+
+async def test_full_lift_cycle(competition):
+    """Create → 3 judges join → all vote white → results → next lift → vote again."""
+    head, left, right = await competition.join_all_judges()
+    display = await competition.open_display()
+
+    await competition.vote_all_white()
+
+    for judge in (head, left, right, display):
+        results = await judge.receive("show_results")
+        assert results["votes"] == {"left": "white", "center": "white", "right": "white"}
+    # The display learns who voted before the results, never the colour
+    assert [m["position"] for m in display.received("judge_voted")] == ["center", "left", "right"]
+    assert all("color" not in m for m in display.received("judge_voted"))
+
+    await competition.head_sends("next_lift")
+    for client in (head, left, right, display):
+        await client.receive("reset_for_next_lift")
+
+    await competition.vote_and_lock(head, "white")
+    await competition.vote_and_lock(left, "red")
+    await competition.vote_and_lock(right, "white")
+
+    results = await display.receive("show_results")
+    assert results["votes"] == {"left": "red", "center": "white", "right": "white"}
+
+
+async def test_lift_cycle_with_required_reasons(competition):
+    """Head judge enables require_reasons → non-white votes need a reason."""
+    head, left, right = await competition.join_all_judges()
+    display = await competition.open_display()
+
+    await competition.head_sends("settings_update", showExplanations=True, liftType="bench", requireReasons=True)
+    for client in (left, right, display):
+        update = await client.receive("settings_update")
+        assert update["requireReasons"] is True
+
+    await competition.vote_and_lock(head, "white")
+
+    await competition.vote_and_lock(left, "red")
+    assert (await left.receive("error"))["message"] == "Reason required before locking in"
+
+    await competition.vote_and_lock(left, "red", reason="Soft elbows")
+    await competition.vote_and_lock(right, "white")
+
+    results = await display.receive("show_results")
+    assert results["votes"]["left"] == "red"
+    assert results["reasons"]["left"] == "Soft elbows"
+    assert results["showExplanations"] is True
+    assert results["liftType"] == "bench"
@@ -0,0 +1,42 @@
+"""Double-vote prevention — a locked vote cannot be changed or cast twice."""
+
+
+async def test_cannot_vote_twice(competition):
+    """A second vote_lock from the same judge is ignored."""
+    head, left, right = await competition.join_all_judges()
+    display = await competition.open_display()
+
+    await competition.vote_and_lock(left, "white")
+    await competition.vote_and_lock(left, "red")
+
+    assert len(display.received("judge_voted")) == 1
+    await competition.vote_and_lock(head, "white")
+    await competition.vote_and_lock(right, "white")
+    assert (await display.receive("show_results"))["votes"]["left"] == "white"
+
+
+async def test_locked_vote_persists_after_reconnect(competition):
+    """Lock red → reconnect → vote again → the original red vote stands."""
+    head, left, right = await competition.join_all_judges()
+
+    await competition.vote_and_lock(left, "red")
+    left = await competition.reconnect("left_judge")
+    await competition.vote_and_lock(left, "white")
+
+    await competition.vote_and_lock(head, "white")
+    await competition.vote_and_lock(right, "white")
+    assert (await head.receive("show_results"))["votes"]["left"] == "red"
+
+
+async def test_vote_clears_after_next_lift(competition):
+    """Full cycle → next lift → all judges vote fresh."""
+    head, left, right = await competition.join_all_judges()
+
+    await competition.vote_all_white()
+    await competition.head_sends("next_lift")
+
+    for role in ("center_judge", "left_judge", "right_judge"):
+        await competition.vote_and_lock(competition.clients[role], "red")
+    votes = (await head.receive("show_results"))["votes"]
+    assert votes == {"left": "white", "center": "white", "right": "white"}
+    assert (await head.receive("show_results"))["votes"] == {"left": "red", "center": "red", "right": "red"}
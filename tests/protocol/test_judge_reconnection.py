@@ -0,0 +1,68 @@
+"""Judge reconnection — a dropped socket must not break the session."""
+
+
+async def test_reconnect_before_voting(competition):
+    """Judge reconnects before voting → can still vote and results follow."""
+    head, left, right = await competition.join_all_judges()
+
+    left = await competition.reconnect("left_judge")
+    assert [m["connected"] for m in head.received("judge_status_update")][-2:] == [False, True]
+
+    await competition.vote_all_white()
+    for judge in (head, left, right):
+        await judge.receive("show_results")
+
+
+async def test_reconnect_after_voting(competition):
+    """Judge reconnects after locking → join state carries the locked vote."""
+    head, left, right = await competition.join_all_judges()
+
+    await competition.vote_and_lock(left, "white")
+    left = await competition.reconnect("left_judge")
+
+    state = left.joined["session_state"]
+    assert state["judges"]["left"]["locked"] is True
+    assert state["judges"]["left"]["current_vote"] == "white"
+
+
+async def test_reconnect_token_takes_over_open_socket(competition):
+    """A second tab with the token takes the role; the old socket is closed."""
+    head, left, right = await competition.join_all_judges()
+
+    new_left = await competition.join_as("left_judge", competition.tokens["left_judge"])
+
+    assert await left.wait_closed() == 1000
+    await competition.vote_all_white()
+    await new_left.receive("show_results")
+
+
+async def test_all_judges_reconnect_simultaneously(competition):
+    """All 3 judges reconnect → the session continues."""
+    await competition.join_all_judges()
+
+    for role in ("center_judge", "left_judge", "right_judge"):
+        await competition.reconnect(role)
+
+    await competition.vote_all_white()
+    for client in competition.clients.values():
+        await client.receive("show_results")
+
+
+async def test_timer_frozen_after_all_votes_locked_and_rejoin(competition):
+    """A judge rejoining after results sees the frozen timer and the results again."""
+    head, left, right = await competition.join_all_judges()
+
+    await competition.head_sends("timer_start")
+    await competition.advance(12.5)
+    await competition.vote_all_white()
+    assert (await head.receive("show_results"))["timer_frozen_ms"] == 47500
+
+    left = await competition.reconnect("left_judge")
+    joined = left.joined
+    assert joined["session_state"]["timer_frozen_ms"] == 47500
+    assert joined["session_state"]["time_remaining_ms"] is None
+    assert (await left.receive("show_results"))["timer_frozen_ms"] == 47500
+
+    # The clock was cancelled when the votes locked; nothing fires later
+    await competition.advance(60)
+    assert not left.received("timer_expired")
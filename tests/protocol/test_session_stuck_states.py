@@ -0,0 +1,72 @@
+"""Session stuck states — the session must never get stuck mid-competition."""
+
+from iron_verdict.main import session_manager
+
+
+async def test_next_lift_when_not_all_voted(competition):
+    """Only 2/3 vote → head judge sends next_lift → everyone resets."""
+    head, left, right = await competition.join_all_judges()
+
+    await competition.vote_and_lock(head, "white")
+    await competition.vote_and_lock(left, "white")
+    await competition.head_sends("next_lift")
+
+    for judge in (head, left, right):
+        await judge.receive("reset_for_next_lift")
+    judges = session_manager.sessions[competition.session_code]["judges"]
+    assert not any(judge["locked"] for judge in judges.values())
+
+
+async def test_continue_after_judge_disconnect_mid_vote(competition):
+    """Judge disconnects after partial voting → remaining judges still work."""
+    head, left, right = await competition.join_all_judges()
+
+    await competition.vote_and_lock(head, "white")
+    await competition.drop("left_judge")
+    status = head.received("judge_status_update")[-1]
+    assert status == {"type": "judge_status_update", "position": "left", "connected": False}
+
+    await competition.vote_and_lock(right, "white")
+    await competition.head_sends("next_lift")
+    await right.receive("reset_for_next_lift")
+
+
+async def test_results_blocked_when_judge_disconnects_before_voting(competition):
+    """Judge disconnects before voting → other two lock → no results (IPF rule)."""
+    head, left, right = await competition.join_all_judges()
+
+    await competition.drop("left_judge")
+    await competition.vote_and_lock(head, "white")
+    await competition.vote_and_lock(right, "white")
+
+    assert not head.received("show_results")
+    assert not right.received("show_results")
+
+
+async def test_side_judge_cannot_control_the_lift(competition):
+    """Only the head judge may start the clock, advance or end the session."""
+    head, left, right = await competition.join_all_judges()
+
+    for message_type in ("timer_start", "next_lift", "end_session_confirmed"):
+        await left.send(message_type)
+    await competition.settle()
+
+    assert len(left.received("error")) == 3
+    assert competition.session_code in session_manager.sessions
+    assert not head.received("timer_start")
+
+
+async def test_end_session_closes_everyone(competition):
+    """Head judge ends the session → all are told and closed → the code is gone."""
+    head, left, right = await competition.join_all_judges()
+    display = await competition.open_display()
+
+    await head.send("end_session_confirmed")
+
+    for client in (head, left, right, display):
+        assert (await client.receive("session_ended"))["reason"] == "head_judge"
+        await client.wait_closed()
+    assert competition.session_code not in session_manager.sessions
+
+    _, reply = await competition.try_join("left_judge")
+    assert reply["type"] == "join_error"
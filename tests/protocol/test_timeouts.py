@@ -0,0 +1,89 @@
+"""Attempt timer and heartbeat timeouts, driven by the fake clock."""
+
+from iron_verdict.main import PONG_STALE_SECONDS, session_manager
+
+
+async def test_timer_expires_after_sixty_seconds(competition):
+    head, left, right = await competition.join_all_judges()
+
+    await competition.head_sends("timer_start")
+    started = await left.receive("timer_start")
+    assert started["deadline_ms"] == int((competition.clock() + 60) * 1000)
+
+    await competition.advance(59.9)
+    assert not left.received("timer_expired")
+
+    await competition.advance(0.1)
+    for judge in (head, left, right):
+        await judge.receive("timer_expired")
+
+
+async def test_timer_ticks_count_down(competition):
+    head, left, right = await competition.join_all_judges()
+
+    await competition.head_sends("timer_start")
+    for _ in range(6):
+        await competition.advance(10)
+
+    remaining = [m["time_remaining_ms"] for m in left.received("timer_tick")]
+    assert remaining == [50000, 40000, 30000, 20000, 10000]
+    assert len(left.received("timer_expired")) == 1
+
+
+async def test_timer_reset_cancels_expiry(competition):
+    head, left, right = await competition.join_all_judges()
+
+    await competition.head_sends("timer_start")
+    await competition.advance(30)
+    await competition.head_sends("timer_reset")
+    await competition.advance(60)
+
+    await left.receive("timer_reset")
+    assert not left.received("timer_expired")
+
+
+async def test_late_joiner_sees_remaining_time(competition):
+    head = await competition.create_session_and_join_head()
+
+    await competition.head_sends("timer_start")
+    await competition.advance(25)
+    left = await competition.join_as("left_judge")
+
+    state = left.joined["session_state"]
+    assert state["time_remaining_ms"] == 35000
+
+
+async def test_silent_judge_closed_by_heartbeat(competition):
+    """A judge that stops answering pings is closed and shown as disconnected."""
+    head, left, right = await competition.join_all_judges()
+
+    await competition.heartbeat()
+    await head.receive("ping")
+    competition.clock.advance(PONG_STALE_SECONDS)
+    for judge in (head, right):
+        await judge.send("pong")
+    await competition.settle()
+
+    competition.clock.advance(1)
+    await competition.heartbeat()
+
+    assert await left.wait_closed() == 1001
+    status = head.received("judge_status_update")[-1]
+    assert status == {"type": "judge_status_update", "position": "left", "connected": False}
+    assert session_manager.sessions[competition.session_code]["judges"]["left"]["connected"] is False
+    assert not head.closed and not right.closed
+
+
+async def test_rejoin_after_heartbeat_close(competition):
+    """The closed judge's role is free again, and the session carries on."""
+    head, left, right = await competition.join_all_judges()
+
+    competition.clock.advance(PONG_STALE_SECONDS + 1)
+    await competition.heartbeat()
+    for judge in (head, left, right):
+        await judge.wait_closed()
+
+    for role in ("center_judge", "left_judge", "right_judge"):
+        await competition.join_as(role)
+    await competition.vote_all_white()
+    await competition.clients["left_judge"].receive("show_results")
@@ -0,0 +1,139 @@
+import gzip
+import brotli
+import httpx
+import pytest
+from starlette.requests import Request
+from iron_verdict.assets import CompressedAsset, StaticAssets, negotiate_encoding, negotiate_language
+
+
+def make_request(headers: dict) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+BODY = b"<html>" + b"iron verdict " * 200 + b"</html>"
+
+
+def test_negotiate_prefers_brotli():
+    assert negotiate_encoding("gzip, deflate, br") == "br"
+
+
+def test_negotiate_honours_q_values():
+    assert negotiate_encoding("br;q=0.5, gzip") == "gzip"
+    assert negotiate_encoding("br;q=0, gzip;q=0") is None
+    assert negotiate_encoding("*") == "br"
+    assert negotiate_encoding("") is None
+
+
+def test_negotiate_language_matches_primary_subtag_and_q():
+    assert negotiate_language("de-AT,de;q=0.9", ("en", "de"), "en") == "de"
+    assert negotiate_language("fr, de;q=0.3, en;q=0.8", ("en", "de"), "en") == "en"
+    assert negotiate_language("fr", ("en", "de"), "en") == "en"
+    assert negotiate_language("", ("en", "de"), "en") == "en"
+
+
+def test_variants_decompress_to_original():
+    asset = CompressedAsset(BODY, "text/html")
+    assert brotli.decompress(asset.variants["br"][0]) == BODY
+    assert gzip.decompress(asset.variants["gzip"][0]) == BODY
+
+
+def test_response_serves_precompressed_variant():
+    asset = CompressedAsset(BODY, "text/html")
+    response = asset.response(make_request({"Accept-Encoding": "gzip"}))
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.body == asset.variants["gzip"][0]
+
+
+def test_each_variant_has_its_own_etag():
+    asset = CompressedAsset(BODY, "text/html")
+    etags = {etag for _, etag in asset.variants.values()}
+    assert len(etags) == 3
+
+
+def test_if_none_match_returns_304():
+    asset = CompressedAsset(BODY, "text/html")
+    etag = asset.variants[None][1]
+    response = asset.response(make_request({"If-None-Match": etag}))
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == etag
+
+
+def test_if_none_match_for_other_encoding_is_not_304():
+    asset = CompressedAsset(BODY, "text/html")
+    br_etag = asset.variants["br"][1]
+    response = asset.response(make_request({"If-None-Match": br_etag, "Accept-Encoding": "gzip"}))
+    assert response.status_code == 200
+
+
+def test_incompressible_body_is_served_uncompressed():
+    asset = CompressedAsset(b"x", "text/plain")
+    response = asset.response(make_request({"Accept-Encoding": "br, gzip"}))
+    assert "content-encoding" not in response.headers
+    assert response.body == b"x"
+
+
+@pytest.fixture
+def static_tree(tmp_path):
+    (tmp_path / "js").mkdir()
+    (tmp_path / "css").mkdir()
+    (tmp_path / "js" / "util.js").write_text("export const x = 1;\n")
+    (tmp_path / "js" / "main.js").write_text("import { x } from './util.js';\nconsole.log(x);\n")
+    (tmp_path / "css" / "site.css").write_text("body { color: red; }\n")
+    (tmp_path / "index.html").write_text(
+        '<link rel="stylesheet" href="/static/css/site.css">\n'
+        '<script type="module" src="/static/js/main.js"></script>\n'
+        "__VERSION__\n"
+    )
+    return tmp_path
+
+
+def test_static_assets_rewrite_imports_to_hashed_names(static_tree):
+    assets = StaticAssets(str(static_tree))
+    util_hashed = assets.url_for("/static/js/util.js").rsplit("/", 1)[1]
+    main_body = assets._routes["js/main.js"][0].variants[None][0].decode()
+    assert f"from './{util_hashed}'" in main_body
+
+
+def test_static_assets_hash_changes_with_dependency(static_tree):
+    before = StaticAssets(str(static_tree)).url_for("/static/js/main.js")
+    (static_tree / "js" / "util.js").write_text("export const x = 2;\n")
+    after = StaticAssets(str(static_tree)).url_for("/static/js/main.js")
+    assert before != after
+
+
+def test_static_assets_circular_import_fails_loudly(static_tree):
+    (static_tree / "js" / "util.js").write_text("import './main.js';\n")
+    with pytest.raises(ValueError, match="Circular import"):
+        StaticAssets(str(static_tree))
+
+
+def test_render_page_fingerprints_references_and_preloads_modules(static_tree):
+    assets = StaticAssets(str(static_tree))
+    page = assets.render_page(str(static_tree / "index.html"), {"__VERSION__": "1.2.3"}, "text/html")
+    html = page.variants[None][0].decode()
+    assert assets.url_for("/static/css/site.css") in html
+    assert f'<script type="module" src="{assets.url_for("/static/js/main.js")}">' in html
+    assert f'<link rel="modulepreload" href="{assets.url_for("/static/js/util.js")}">' in html
+    assert "/static/js/main.js\"" not in html
+    assert "1.2.3" in html
+
+
+@pytest.mark.asyncio
+async def test_static_assets_cache_headers(static_tree):
+    assets = StaticAssets(str(static_tree))
+    hashed = assets.url_for("/static/css/site.css")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=assets), base_url="http://test") as ac:
+        immutable = await ac.get(hashed[len("/static"):])
+        plain = await ac.get("/css/site.css")
+        missing = await ac.get("/index.html")
+        post = await ac.post("/css/site.css")
+    assert immutable.status_code == 200
+    assert "immutable" in immutable.headers["cache-control"]
+    assert immutable.headers["content-type"].startswith("text/css")
+    assert plain.headers["cache-control"] == "no-cache"
+    assert plain.headers["etag"]
+    assert missing.status_code == 404
+    assert post.status_code == 405
@@ -238,6 +238,86 @@ async def test_broadcast_to_others_failure_logs_warning(caplog):
     assert len(records) == 1
 
 
+@pytest.mark.asyncio
+async def test_failed_send_evicts_connection_and_closes_it():
+    manager = ConnectionManager()
+    broken_ws = AsyncMock()
+    broken_ws.send_json.side_effect = RuntimeError("connection lost")
+    healthy_ws = AsyncMock()
+    await manager.add_connection("SESS", "display_abc", broken_ws)
+    await manager.add_connection("SESS", "left_judge", healthy_ws)
+
+    await manager.broadcast_to_session("SESS", {"type": "one"})
+    await manager.broadcast_to_session("SESS", {"type": "two"})
+
+    assert broken_ws.send_json.await_count == 1
+    broken_ws.close.assert_awaited_once()
+    assert await manager.get_connection("SESS", "display_abc") is None
+    assert healthy_ws.send_json.await_count == 2
+    assert await manager.pop_evicted(broken_ws) is True
+    assert await manager.pop_evicted(broken_ws) is False
+
+
+@pytest.mark.asyncio
+async def test_evicting_unregistered_socket_is_not_remembered():
+    manager = ConnectionManager()
+    stray_ws = AsyncMock()
+
+    assert await manager._evict(stray_ws) == ("", "")
+
+    stray_ws.close.assert_awaited_once()
+    assert manager._evicted == {}
+
+
+@pytest.mark.asyncio
+async def test_repeated_failures_are_summarized_without_tracebacks(caplog):
+    manager = ConnectionManager(failure_summary_seconds=3600)
+    broken_ws = AsyncMock()
+    started = asyncio.Event()
+
+    async def slow_failure(message):
+        await started.wait()
+        raise RuntimeError("connection lost")
+
+    broken_ws.send_json.side_effect = slow_failure
+    await manager.add_connection("SESS", "left_judge", broken_ws)
+
+    with caplog.at_level(logging.WARNING, logger="iron_verdict"):
+        # Three sends already in flight when the socket dies
+        sends = [
+            asyncio.create_task(manager.send_to_role("SESS", "left_judge", {"type": "t", "n": n}))
+            for n in range(3)
+        ]
+        await asyncio.sleep(0)
+        started.set()
+        await asyncio.gather(*sends)
+        manager.summarize_failures()
+
+    failures = [r for r in caplog.records if r.getMessage() == "send_to_role_failed"]
+    assert len(failures) == 1
+    assert failures[0].exc_info is None
+    assert failures[0].reason == "RuntimeError: connection lost"
+    summaries = [r for r in caplog.records if r.getMessage() == "send_failures_summary"]
+    assert len(summaries) == 1
+    assert (summaries[0].session_code, summaries[0].role, summaries[0].error, summaries[0].count) == (
+        "SESS", "left_judge", "RuntimeError", 2
+    )
+    manager._summary_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_failed_subscriber_is_unsubscribed():
+    manager = ConnectionManager()
+    broken_ws = AsyncMock()
+    broken_ws.send_json.side_effect = RuntimeError("connection lost")
+    await manager.subscribe(broken_ws, ["SESS"])
+
+    await manager.broadcast_to_session("SESS", {"type": "one"})
+
+    assert manager.count_by_role()["subscriber"] == 0
+    assert await manager.pop_evicted(broken_ws) is True
+
+
 
 @pytest.mark.asyncio
 async def test_add_connection_initializes_last_pong():
@@ -314,3 +394,192 @@ async def test_get_all_connections_returns_empty_when_none():
     manager = ConnectionManager()
     result = await manager.get_all_connections()
     assert result == []
+
+
+def test_clock_estimate_symmetric_link():
+    from iron_verdict.connection import ClockEstimate
+    estimate = ClockEstimate()
+    # Client clock runs 500 ms ahead; 50 ms each way, 10 ms client processing
+    estimate.add_sample(t0=1000, t1=1550, t2=1560, t3=1110)
+    assert estimate.rtt_ms == 100
+    assert estimate.offset_ms == 500
+
+
+def test_clock_estimate_trusts_lowest_rtt_sample():
+    from iron_verdict.connection import ClockEstimate
+    estimate = ClockEstimate()
+    estimate.add_sample(t0=1000, t1=1550, t2=1550, t3=1100)   # rtt 100, offset 500
+    estimate.add_sample(t0=2000, t1=2900, t2=2900, t3=2500)   # rtt 500, skewed by queueing
+    assert estimate.rtt_ms == 100
+    assert estimate.offset_ms == 500
+
+
+@pytest.mark.asyncio
+async def test_record_clock_sample_ignores_unknown_connection():
+    manager = ConnectionManager()
+    assert await manager.record_clock_sample(AsyncMock(), 0, 0, 0, 0) is None
+
+
+@pytest.mark.asyncio
+async def test_record_clock_sample_observes_rtt_by_role():
+    from iron_verdict import metrics
+    manager = ConnectionManager()
+    ws = AsyncMock()
+    await manager.add_connection("ABC123", "display_1", ws)
+    before = metrics.WS_RTT_SECONDS.value_count("display")
+    await manager.record_clock_sample(ws, 1000, 1050, 1050, 1100, role="display_1")
+    assert metrics.WS_RTT_SECONDS.value_count("display") == before + 1
+    assert 'iron_verdict_ws_rtt_seconds_bucket{role="display",le="0.1"}' in metrics.REGISTRY.render().decode()
+
+
+@pytest.mark.asyncio
+async def test_remove_connection_drops_clock_estimate():
+    manager = ConnectionManager()
+    ws = AsyncMock()
+    await manager.add_connection("ABC123", "display_1", ws)
+    await manager.record_clock_sample(ws, 1000, 1050, 1050, 1100)
+    assert await manager.get_clock_estimate(ws) is not None
+
+    await manager.remove_connection("ABC123", "display_1")
+    assert await manager.get_clock_estimate(ws) is None
+
+
+@pytest.mark.asyncio
+async def test_batching_packs_queued_messages_into_one_frame_per_recipient():
+    manager = ConnectionManager(batch_window_ms=20)
+    display = AsyncMock()
+    judge = AsyncMock()
+    await manager.add_connection("ABC123", "display_1", display)
+    await manager.add_connection("ABC123", "left_judge", judge)
+
+    await manager.send_to_displays("ABC123", {"type": "judge_voted", "position": "left"})
+    await manager.send_to_displays("ABC123", {"type": "judge_voted", "position": "right"})
+    await manager.broadcast_to_session("ABC123", {"type": "show_results"})
+    display.send_json.assert_not_called()
+
+    await asyncio.sleep(0.05)
+
+    display.send_json.assert_called_once_with({"type": "batch", "messages": [
+        {"type": "judge_voted", "position": "left"},
+        {"type": "judge_voted", "position": "right"},
+        {"type": "show_results"},
+    ]})
+    # A lone message is sent unwrapped
+    judge.send_json.assert_called_once_with({"type": "show_results"})
+
+
+@pytest.mark.asyncio
+async def test_batching_flushes_immediately_when_queue_is_full():
+    manager = ConnectionManager(batch_window_ms=10_000, batch_max_messages=2)
+    ws = AsyncMock()
+    await manager.add_connection("ABC123", "display_1", ws)
+
+    await manager.broadcast_to_session("ABC123", {"type": "a"})
+    ws.send_json.assert_not_called()
+    await manager.broadcast_to_session("ABC123", {"type": "b"})
+
+    ws.send_json.assert_called_once_with({"type": "batch", "messages": [{"type": "a"}, {"type": "b"}]})
+
+
+@pytest.mark.asyncio
+async def test_flush_sends_pending_before_window_elapses():
+    manager = ConnectionManager(batch_window_ms=10_000)
+    ws = AsyncMock()
+    await manager.add_connection("ABC123", "display_1", ws)
+
+    await manager.broadcast_to_session("ABC123", {"type": "session_ended"})
+    await manager.flush("ABC123")
+
+    ws.send_json.assert_called_once_with({"type": "session_ended"})
+    assert manager._flush_tasks == {}
+
+
+@pytest.mark.asyncio
+async def test_batching_drops_pending_for_removed_connection():
+    manager = ConnectionManager(batch_window_ms=10_000)
+    ws = AsyncMock()
+    await manager.add_connection("ABC123", "display_1", ws)
+
+    await manager.broadcast_to_session("ABC123", {"type": "a"})
+    await manager.remove_connection("ABC123", "display_1")
+    await manager.flush("ABC123")
+
+    ws.send_json.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_reply_goes_out_after_events_already_queued_for_the_socket():
+    manager = ConnectionManager(batch_window_ms=10_000)
+    ws = AsyncMock()
+    await manager.add_connection("ABC123", "center_judge", ws)
+
+    await manager.broadcast_to_session("ABC123", {"type": "a"})
+    await manager.broadcast_to_session("ABC123", {"type": "b"})
+    await manager.send_personal(ws, {"type": "reply"})
+    await manager.flush("ABC123")
+
+    assert [c.args[0] for c in ws.send_json.call_args_list] == [
+        {"type": "batch", "messages": [{"type": "a"}, {"type": "b"}]},
+        {"type": "reply"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_flushes_send_to_a_socket_one_at_a_time_in_order():
+    manager = ConnectionManager(batch_window_ms=10_000)
+    sends = []
+    release = asyncio.Event()
+
+    async def slow_send(message):
+        sends.append(("start", message["type"]))
+        if message["type"] == "a":
+            await release.wait()
+        sends.append(("end", message["type"]))
+
+    ws = AsyncMock()
+    ws.send_json.side_effect = slow_send
+    await manager.add_connection("ABC123", "display_1", ws)
+
+    await manager.broadcast_to_session("ABC123", {"type": "a"})
+    first = asyncio.create_task(manager.flush("ABC123"))
+    await asyncio.sleep(0)
+    await manager.broadcast_to_session("ABC123", {"type": "b"})
+    second = asyncio.create_task(manager.flush("ABC123"))
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(first, second)
+
+    assert sends == [("start", "a"), ("end", "a"), ("start", "b"), ("end", "b")]
+    assert manager._outboxes == {}
+
+
+@pytest.mark.asyncio
+async def test_subscriber_receives_tagged_session_events():
+    manager = ConnectionManager()
+    watcher = AsyncMock()
+    await manager.subscribe(watcher, ["AAA", "BBB"])
+
+    await manager.send_to_displays("AAA", {"type": "judge_voted", "position": "left"})
+    await manager.broadcast_to_session("BBB", {"type": "timer_reset"})
+    await manager.send_to_role("AAA", "left_judge", {"type": "private"})
+
+    assert [c.args[0] for c in watcher.send_json.call_args_list] == [
+        {"type": "judge_voted", "position": "left", "session_code": "AAA"},
+        {"type": "timer_reset", "session_code": "BBB"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unsubscribe_all_clears_subscriber_state():
+    manager = ConnectionManager()
+    watcher = AsyncMock()
+    await manager.subscribe(watcher, ["AAA", "BBB"])
+    assert ("*", "subscriber", watcher) in await manager.get_all_connections()
+
+    assert await manager.unsubscribe(watcher, ["AAA"]) == {"BBB"}
+    await manager.unsubscribe(watcher)
+
+    assert await manager.get_all_connections() == []
+    assert await manager.get_last_pong(watcher) is None
+    await manager.broadcast_to_session("BBB", {"type": "timer_reset"})
+    watcher.send_json.assert_not_called()
@@ -0,0 +1,25 @@
+import json
+from iron_verdict import loadgen
+
+
+def test_percentile_nearest_rank():
+    values = [float(n) for n in range(1, 101)]
+    assert loadgen.percentile(values, 50) == 50.0
+    assert loadgen.percentile(values, 99) == 99.0
+    assert loadgen.percentile(values, 99.9) == 100.0
+    assert loadgen.percentile([], 50) is None
+    assert loadgen.percentile([7.0], 99.9) == 7.0
+
+
+def test_small_meet_against_a_started_server(tmp_path, capsys):
+    report_path = tmp_path / "load.json"
+    code = loadgen.main([
+        "--sessions", "2", "--displays", "2", "--lifts", "3",
+        "--stagger-ms", "20", "--churn", "0.5", "--seed", "7", "--json", str(report_path),
+    ])
+    report = json.loads(report_path.read_text())
+    assert code == 0, report
+    assert report["lifts_completed"] == 6
+    assert report["results_latency_ms"]["samples"] == 12
+    assert 0 < report["results_latency_ms"]["p50"] <= report["results_latency_ms"]["p999"]
+    assert report["display_timeouts"] == 0 and report["errors"] == []
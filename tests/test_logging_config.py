@@ -1,6 +1,17 @@
 import json
 import logging
-from iron_verdict.logging_config import JsonFormatter
+import queue
+import threading
+from iron_verdict import logging_config
+from iron_verdict.logging_config import (
+    LOG_RECORDS_DROPPED,
+    DroppingQueueHandler,
+    JsonFormatter,
+    RateLimitFilter,
+    parse_rate_limits,
+    setup_logging,
+    shutdown_logging,
+)
 
 
 def test_json_formatter_produces_valid_json():
@@ -40,3 +51,93 @@ def test_json_formatter_includes_conn_id():
     output = formatter.format(record)
     parsed = json.loads(output)
     assert parsed["conn_id"] == "abc12345def67890"
+
+
+def _record(msg="event"):
+    return logging.LogRecord(
+        name="iron_verdict", level=logging.WARNING, pathname="", lineno=0,
+        msg=msg, args=(), exc_info=None
+    )
+
+
+def test_parse_rate_limits():
+    assert parse_rate_limits("heartbeat_*=20, vote_locked=5,") == {"heartbeat_*": 20.0, "vote_locked": 5.0}
+    assert parse_rate_limits("") == {}
+
+
+def test_rate_limit_filter_limits_per_event_per_second():
+    now = [100.0]
+    limiter = RateLimitFilter({"heartbeat_*": 2}, clock=lambda: now[0])
+    dropped_before = LOG_RECORDS_DROPPED.value("rate_limited")
+
+    results = [limiter.filter(_record("heartbeat_send_failed")) for _ in range(4)]
+    assert results == [True, True, False, False]
+    # Other events and other matching events have their own budget
+    assert limiter.filter(_record("vote_locked"))
+    assert limiter.filter(_record("heartbeat_stale_close"))
+    assert LOG_RECORDS_DROPPED.value("rate_limited") == dropped_before + 2
+
+    now[0] += 1.0
+    assert limiter.filter(_record("heartbeat_send_failed"))
+
+
+def test_queue_handler_drops_instead_of_blocking():
+    records = queue.Queue(maxsize=1)
+    handler = DroppingQueueHandler(records)
+    dropped_before = LOG_RECORDS_DROPPED.value("queue_full")
+    handler.handle(_record("first"))
+    handler.handle(_record("second"))
+    assert records.qsize() == 1
+    assert records.get_nowait().getMessage() == "first"
+    assert LOG_RECORDS_DROPPED.value("queue_full") == dropped_before + 1
+
+
+def test_queue_handler_formats_message_before_handing_off():
+    records = queue.Queue()
+    handler = DroppingQueueHandler(records)
+    record = logging.LogRecord(
+        name="iron_verdict", level=logging.INFO, pathname="", lineno=0,
+        msg="joined %s", args=("left",), exc_info=None
+    )
+    record.session_code = "ABC12345"
+    handler.handle(record)
+    queued = records.get_nowait()
+    assert queued.msg == "joined left" and queued.args is None
+    assert json.loads(JsonFormatter().format(queued))["session_code"] == "ABC12345"
+
+
+def test_setup_logging_writes_from_background_thread(capsys):
+    logger = logging.getLogger("iron_verdict")
+    saved = logger.handlers[:]
+    logger.handlers.clear()
+    try:
+        setup_logging("INFO")
+        logger.info("background_write", extra={"session_code": "XYZ"})
+        shutdown_logging()
+        line = capsys.readouterr().out.strip().splitlines()[-1]
+        assert json.loads(line)["message"] == "background_write"
+        assert not logger.handlers
+    finally:
+        logger.handlers[:] = saved
+
+
+def test_shutdown_gives_up_on_a_stuck_writer(monkeypatch, capsys):
+    monkeypatch.setattr(logging_config, "STOP_TIMEOUT", 0.01)
+    records: queue.Queue = queue.Queue(maxsize=2)
+    release = threading.Event()
+
+    class StuckOutput(logging.Handler):
+        def emit(self, record):
+            release.wait()
+
+    listener = logging_config._Listener(records, StuckOutput())
+    listener.start()
+    for i in range(3):
+        records.put(logging.makeLogRecord({"msg": f"r{i}"}))
+    dropped = LOG_RECORDS_DROPPED.value("shutdown")
+    try:
+        listener.stop()
+        assert LOG_RECORDS_DROPPED.value("shutdown") == dropped + 2
+        assert "2 records dropped" in capsys.readouterr().err
+    finally:
+        release.set()
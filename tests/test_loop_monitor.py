@@ -0,0 +1,51 @@
+import asyncio
+import os
+import sys
+import time
+import pytest
+from iron_verdict import loop_monitor as loop_monitor_module
+from iron_verdict.loop_monitor import LoopMonitor
+
+
+def blocking_handler(seconds):
+    time.sleep(seconds)
+
+
+async def test_blocking_call_is_recorded_with_its_stack(monkeypatch):
+    # Attribute frames in this test module as if it were part of the package
+    monkeypatch.setattr(loop_monitor_module, "_PACKAGE_DIR", os.path.dirname(os.path.abspath(__file__)))
+    monitor = LoopMonitor(interval=0.02, slow_threshold=0.05)
+    task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.05)
+    blocking_handler(0.3)
+    await asyncio.sleep(0.1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert monitor.lag_max >= 0.25
+    assert len(monitor.slow_callbacks) == 1
+    entry = monitor.slow_callbacks[0]
+    assert entry["duration_ms"] >= 250
+    assert entry["handler"] == "test_loop_monitor.test_blocking_call_is_recorded_with_its_stack"
+    assert entry["stack"][-1].startswith("test_loop_monitor.blocking_handler:")
+
+
+def test_short_lag_is_not_a_slow_callback():
+    monitor = LoopMonitor(interval=0.1, slow_threshold=0.1)
+    monitor.record(0.01)
+    assert monitor.lag_last == 0.01
+    assert list(monitor.slow_callbacks) == []
+
+
+def test_slow_callback_without_stack_is_unknown():
+    monitor = LoopMonitor(interval=0.1, slow_threshold=0.1)
+    monitor.record(0.5)
+    assert monitor.slow_callbacks[0]["handler"] == "unknown"
+    assert monitor.details()["lag_max_ms"] == 500.0
+
+
+def test_package_stack_keeps_only_package_frames(monkeypatch):
+    monkeypatch.setattr(loop_monitor_module, "_PACKAGE_DIR", os.path.dirname(os.path.abspath(__file__)))
+    stack = loop_monitor_module._package_stack(sys._getframe())
+    assert stack == [f"test_loop_monitor.test_package_stack_keeps_only_package_frames:{sys._getframe().f_lineno - 1}"]
@@ -1,4 +1,5 @@
 import asyncio
+import json
 import logging
 import time
 import pytest
@@ -351,6 +352,119 @@ def test_security_headers_on_root():
     assert "fonts.gstatic.com" in csp
 
 
+def test_root_serves_cached_index_with_etag():
+    first = client.get("/", headers={"Accept-Encoding": "br"})
+    assert first.status_code == 200
+    assert first.headers["content-encoding"] == "br"
+    assert "Accept-Encoding" in first.headers["vary"]
+    assert "__APP_VERSION__" not in first.text
+    assert settings.APP_VERSION in first.text
+
+    again = client.get("/", headers={"Accept-Encoding": "br", "If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert "Content-Security-Policy" in again.headers
+
+
+def test_index_references_fingerprinted_assets():
+    from iron_verdict.main import static_assets
+    html = client.get("/").text
+    hashed = static_assets.url_for("/static/js/init.js")
+    assert hashed != "/static/js/init.js"
+    assert hashed in html
+    response = client.get(hashed)
+    assert response.status_code == 200
+    assert "immutable" in response.headers["cache-control"]
+
+
+def _inlined_locale(html: str) -> dict:
+    block = html.split('<script id="locale-data" type="application/json">', 1)[1].split("</script>", 1)[0]
+    return json.loads(block)
+
+
+def test_index_inlines_locale_from_accept_language():
+    response = client.get("/", headers={"Accept-Language": "de-AT,de;q=0.9,en;q=0.5"})
+    assert '<html lang="de">' in response.text
+    data = _inlined_locale(response.text)
+    assert data["lang"] == "de"
+    assert data["messages"]["privacy"]["link"] == "Datenschutz"
+    assert "Accept-Language" in response.headers["vary"]
+    # Locale URLs for switching are fingerprinted like every other asset
+    from iron_verdict.main import static_assets
+    assert data["urls"]["en"] == static_assets.url_for("/static/locales/en.json")
+
+
+def test_locale_cookie_overrides_accept_language():
+    response = client.get("/", headers={"Accept-Language": "de", "Cookie": "iron-verdict-lang=en"})
+    assert _inlined_locale(response.text)["lang"] == "en"
+
+
+def test_unsupported_language_falls_back_to_english():
+    response = client.get("/", headers={"Accept-Language": "fr-FR", "Cookie": "iron-verdict-lang=xx"})
+    assert _inlined_locale(response.text)["lang"] == "en"
+
+
+def test_locale_variants_have_distinct_etags():
+    en = client.get("/", headers={"Accept-Language": "en"})
+    de = client.get("/", headers={"Accept-Language": "de", "If-None-Match": en.headers["etag"]})
+    assert de.status_code == 200
+    assert de.headers["etag"] != en.headers["etag"]
+
+
+def test_display_page_is_a_lightweight_bundle():
+    from iron_verdict.main import static_assets
+    response = client.get("/display/ABCD1234")
+    assert response.status_code == 200
+    html = response.text
+    assert static_assets.url_for("/static/js/display.js") in html
+    assert "alpinejs" not in html
+    assert static_assets.url_for("/static/js/app.js") not in html
+    assert "Content-Security-Policy" in response.headers
+    # Served from one cached render regardless of the code in the URL
+    again = client.get("/display/OTHER999", headers={"If-None-Match": response.headers["etag"]})
+    assert again.status_code == 304
+
+
+def test_offline_index_has_no_third_party_assets():
+    from iron_verdict.main import render_page
+    html = render_page("index.html", offline=True).variants[None][0].decode()
+    assert "cdn.jsdelivr.net" not in html
+    assert "fonts.googleapis.com" not in html
+    assert "umami" not in html
+    assert "/static/vendor/alpinejs-3.14.1.min.js" in html
+    assert 'integrity="sha384-' in html
+
+
+def test_offline_csp_allows_only_self_for_assets():
+    from iron_verdict.main import _CSP_OFFLINE
+    assert "cdn.jsdelivr.net" not in _CSP_OFFLINE
+    assert "fonts.g" not in _CSP_OFFLINE
+    assert "font-src 'self'" in _CSP_OFFLINE
+    assert "'unsafe-eval'" in _CSP_OFFLINE  # Alpine.js still evaluates expressions
+
+
+def test_security_headers_on_static_assets():
+    response = client.get("/static/css/base.css")
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert "Content-Security-Policy" in response.headers
+
+
+@pytest.mark.asyncio
+async def test_security_headers_replace_route_headers_instead_of_duplicating():
+    from iron_verdict.main import SecurityHeadersMiddleware
+
+    async def inner(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"x-frame-options", b"SAMEORIGIN"), (b"content-type", b"text/plain")]})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    wrapped = SecurityHeadersMiddleware(inner, csp="default-src 'none'")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=wrapped), base_url="http://test") as ac:
+        response = await ac.get("/")
+    assert response.headers.get_list("x-frame-options") == ["DENY"]
+    assert response.headers["content-security-policy"] == "default-src 'none'"
+    assert response.headers["content-type"] == "text/plain"
+
+
 def test_security_headers_on_api():
     response = client.post("/api/sessions", json={"name": "Test"})
     assert response.headers["X-Content-Type-Options"] == "nosniff"
@@ -944,3 +1058,555 @@ async def test_pong_message_updates_last_pong(session_code):
     assert before is not None
     assert after is not None
     assert after > before
+
+
+@pytest.mark.asyncio
+async def test_timer_start_schedules_and_reset_cancels_server_clock(session_code):
+    from iron_verdict.main import timer_wheel
+    async with httpx.AsyncClient(
+        transport=ASGIWebSocketTransport(app=app), base_url="http://test"
+    ) as ac:
+        async with httpx_ws.aconnect_ws("ws://test/ws", ac) as ws:
+            await ws.send_json({"type": "join", "session_code": session_code, "role": "center_judge"})
+            await ws.receive_json()
+            await ws.send_json({"type": "timer_start"})
+            await ws.receive_json()
+            assert timer_wheel.is_scheduled(session_code)
+
+            await ws.send_json({"type": "timer_reset"})
+            await ws.receive_json()
+            assert not timer_wheel.is_scheduled(session_code)
+
+
+@pytest.mark.asyncio
+async def test_all_locked_freezes_server_clock(session_code):
+    from iron_verdict.main import timer_wheel
+    async with httpx.AsyncClient(transport=ASGIWebSocketTransport(app=app), base_url="http://test") as ac:
+        async with httpx_ws.aconnect_ws("ws://test/ws", ac) as left_ws, \
+                   httpx_ws.aconnect_ws("ws://test/ws", ac) as center_ws, \
+                   httpx_ws.aconnect_ws("ws://test/ws", ac) as right_ws:
+            for ws, role in ((left_ws, "left_judge"), (center_ws, "center_judge"), (right_ws, "right_judge")):
+                await ws.send_json({"type": "join", "session_code": session_code, "role": role})
+                await ws.receive_json()
+            await center_ws.send_json({"type": "timer_start"})
+            await asyncio.sleep(0.05)
+            assert timer_wheel.is_scheduled(session_code)
+
+            for ws in (left_ws, center_ws, right_ws):
+                await ws.send_json({"type": "vote_lock", "color": "white"})
+            await asyncio.sleep(0.1)
+            assert not timer_wheel.is_scheduled(session_code)
+
+
+@pytest.mark.asyncio
+async def test_timer_expired_broadcast_to_session(session_code):
+    from iron_verdict.main import timer_wheel
+    async with httpx.AsyncClient(
+        transport=ASGIWebSocketTransport(app=app), base_url="http://test"
+    ) as ac:
+        async with httpx_ws.aconnect_ws("ws://test/ws", ac) as ws:
+            await ws.send_json({"type": "join", "session_code": session_code, "role": "display"})
+            await ws.receive_json()
+            session_manager.sessions[session_code]["timer_started_at"] = time.time() - 61
+            timer_wheel.schedule(session_code, session_manager.timer_deadline(session_code))
+            await timer_wheel.advance()
+            msg = await asyncio.wait_for(ws.receive_json(), timeout=1.0)
+    assert msg == {"type": "timer_expired"}
+
+
+@pytest.mark.asyncio
+async def test_timer_start_includes_absolute_deadline(session_code):
+    async with httpx.AsyncClient(
+        transport=ASGIWebSocketTransport(app=app), base_url="http://test"
+    ) as ac:
+        async with httpx_ws.aconnect_ws("ws://test/ws", ac) as ws:
+            await ws.send_json({"type": "join", "session_code": session_code, "role": "center_judge"})
+            await ws.receive_json()
+            await ws.send_json({"type": "timer_start"})
+            msg = await ws.receive_json()
+
+    started_at = session_manager.sessions[session_code]["timer_started_at"]
+    assert msg["deadline_ms"] == int((started_at + 60) * 1000)
+
+
+@pytest.mark.asyncio
+async def test_pong_with_timestamps_returns_clock_sync(session_code):
+    async with httpx.AsyncClient(
+        transport=ASGIWebSocketTransport(app=app), base_url="http://test"
+    ) as ac:
+        async with httpx_ws.aconnect_ws("ws://test/ws", ac) as ws:
+            await ws.send_json({"type": "join", "session_code": session_code, "role": "display"})
+            join = await ws.receive_json()
+            t0 = join["server_time_ms"]
+            # Pretend the client clock is 5 s ahead of the server
+            await ws.send_json({"type": "pong", "t0": t0, "t1": t0 + 5000, "t2": t0 + 5000})
+            msg = await asyncio.wait_for(ws.receive_json(), timeout=1.0)
+
+    assert msg["type"] == "clock_sync"
+    assert 4000 < msg["offset_ms"] <= 5000
+    assert msg["rtt_ms"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_subscribe_receives_tagged_events_from_many_sessions(monkeypatch):
+    """One multiplexed socket watches several sessions and bypasses DISPLAY_CAP."""
+    monkeypatch.setattr(settings, "DISPLAY_CAP", 0)
+    code_a = await session_manager.create_session("Platform A")
+    code_b = await session_manager.create_session("Platform B")
+    try:
+        async with httpx.AsyncClient(
+            transport=ASGIWebSocketTransport(app=app), base_url="http://test"
+        ) as ac:
+            async with httpx_ws.aconnect_ws("ws://test/ws", ac) as watcher, \
+                       httpx_ws.aconnect_ws("ws://test/ws", ac) as head_a, \
+                       httpx_ws.aconnect_ws("ws://test/ws", ac) as head_b:
+                await watcher.send_json({
+                    "type": "subscribe",
+                    "session_codes": [code_a, code_b.lower(), "NOPE0000"],
+                })
+                ack = await watcher.receive_json()
+                assert ack["type"] == "subscribe_success"
+                assert set(ack["sessions"]) == {code_a, code_b}
+                assert ack["sessions"][code_a]["name"] == "Platform A"
+                assert ack["unknown"] == ["NOPE0000"]
+
+                await head_a.send_json({"type": "join", "session_code": code_a, "role": "center_judge"})
+                await head_a.receive_json()
+                msg = await asyncio.wait_for(watcher.receive_json(), timeout=1.0)
+                assert msg == {"type": "judge_status_update", "position": "center",
+                               "connected": True, "session_code": code_a}
+
+                await head_b.send_json({"type": "join", "session_code": code_b, "role": "center_judge"})
+                await head_b.receive_json()
+                await asyncio.wait_for(watcher.receive_json(), timeout=1.0)
+                await head_b.send_json({"type": "timer_start"})
+                msg = await asyncio.wait_for(watcher.receive_json(), timeout=1.0)
+                assert msg["type"] == "timer_start"
+                assert msg["session_code"] == code_b
+    finally:
+        session_manager.delete_session(code_a)
+        session_manager.delete_session(code_b)
+
+
+@pytest.mark.asyncio
+async def test_subscriber_cannot_join_or_act(session_code):
+    async with httpx.AsyncClient(
+        transport=ASGIWebSocketTransport(app=app), base_url="http://test"
+    ) as ac:
+        async with httpx_ws.aconnect_ws("ws://test/ws", ac) as ws:
+            await ws.send_json({"type": "subscribe", "session_codes": [session_code]})
+            await ws.receive_json()
+            await ws.send_json({"type": "join", "session_code": session_code, "role": "center_judge"})
+            msg = await asyncio.wait_for(ws.receive_json(), timeout=1.0)
+    assert msg == {"type": "error", "message": "Subscribers are read-only"}
+    assert session_manager.sessions[session_code]["judges"]["center"]["connected"] is False
+
+
+@pytest.mark.asyncio
+async def test_subscribe_rejects_too_many_sessions(monkeypatch, session_code):
+    monkeypatch.setattr(settings, "SUBSCRIBE_MAX_SESSIONS", 0)
+    async with httpx.AsyncClient(
+        transport=ASGIWebSocketTransport(app=app), base_url="http://test"
+    ) as ac:
+        async with httpx_ws.aconnect_ws("ws://test/ws", ac) as ws:
+            await ws.send_json({"type": "subscribe", "session_codes": [session_code]})
+            msg = await ws.receive_json()
+    assert msg == {"type": "error", "message": "Too many subscriptions"}
+
+
+def test_session_events_unknown_session_returns_404():
+    response = client.get("/api/sessions/NOPE0000/events")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_session_events_streams_public_events_until_session_ends(session_code):
+    from iron_verdict.main import spectator_hub
+
+    async def read_stream():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+            return await ac.get(f"/api/sessions/{session_code}/events")
+
+    reader = asyncio.create_task(read_stream())
+    for _ in range(100):
+        if spectator_hub.subscriber_count(session_code):
+            break
+        await asyncio.sleep(0.01)
+
+    async with httpx.AsyncClient(
+        transport=ASGIWebSocketTransport(app=app), base_url="http://test"
+    ) as ac:
+        async with httpx_ws.aconnect_ws("ws://test/ws", ac) as ws:
+            await ws.send_json({"type": "join", "session_code": session_code, "role": "center_judge"})
+            await ws.receive_json()
+            await ws.send_json({"type": "end_session_confirmed"})
+            await asyncio.sleep(0.1)
+
+    response = await asyncio.wait_for(reader, timeout=2.0)
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [line.split(": ", 1)[1] for line in response.text.splitlines() if line.startswith("event: ")]
+    assert events == ["state", "judge_status_update", "session_ended"]
+
+
+@pytest.mark.asyncio
+async def test_state_endpoint_etag_and_conditional_request(session_code):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+        first = await ac.get(f"/api/sessions/{session_code}/state")
+        assert first.status_code == 200
+        assert first.json()["name"] == "Test Session"
+        etag = first.headers["etag"]
+        assert etag.startswith('"') and not etag.startswith('W/')
+
+        again = await ac.get(f"/api/sessions/{session_code}/state", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.headers["etag"] == etag
+        assert again.content == b""
+
+        session_manager.update_settings(session_code, True, "bench")
+        from iron_verdict.main import connection_manager
+        await connection_manager.broadcast_to_session(session_code, {"type": "settings_update"})
+
+        changed = await ac.get(f"/api/sessions/{session_code}/state", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert changed.json()["settings"]["lift_type"] == "bench"
+
+
+def test_state_endpoint_unknown_session_returns_404():
+    assert client.get("/api/sessions/NOPE0000/state").status_code == 404
+    assert client.get("/api/sessions/NOPE0000/results").status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_results_endpoint_hides_votes_until_all_locked(session_code):
+    await session_manager.lock_vote(session_code, "left", "red")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+        pending = (await ac.get(f"/api/sessions/{session_code}/results")).json()
+        assert pending["votes"] is None
+
+        await session_manager.lock_vote(session_code, "center", "white")
+        await session_manager.lock_vote(session_code, "right", "white")
+        from iron_verdict.main import connection_manager
+        await connection_manager.broadcast_to_session(session_code, {"type": "show_results"})
+
+        done = (await ac.get(f"/api/sessions/{session_code}/results")).json()
+    assert done["phase"] == "results"
+    assert done["votes"] == {"left": "red", "center": "white", "right": "white"}
+
+
+@pytest.mark.asyncio
+async def test_state_endpoint_long_poll_returns_on_next_version(session_code):
+    from iron_verdict.main import spectator_hub, connection_manager
+    current = spectator_hub.version(session_code)
+
+    async def poll():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+            return await ac.get(f"/api/sessions/{session_code}/state?wait_for_version={current + 1}")
+
+    poller = asyncio.create_task(poll())
+    await asyncio.sleep(0.05)
+    assert not poller.done()
+    await connection_manager.broadcast_to_session(session_code, {"type": "timer_reset"})
+
+    response = await asyncio.wait_for(poller, timeout=1.0)
+    assert response.status_code == 200
+    assert response.headers["x-session-version"] == str(current + 1)
+
+
+@pytest.mark.asyncio
+async def test_state_endpoint_long_poll_times_out_with_current_state(monkeypatch, session_code):
+    monkeypatch.setattr(settings, "LONG_POLL_TIMEOUT_SECONDS", 0.05)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get(f"/api/sessions/{session_code}/state?wait_for_version=999")
+    assert response.status_code == 200
+
+
+def test_qr_endpoint_serves_svg_and_png(monkeypatch, session_code):
+    monkeypatch.setattr(settings, "ALLOWED_ORIGIN", "https://verdict.example")
+    svg = client.get(f"/api/sessions/{session_code.lower()}/qr.svg")
+    assert svg.status_code == 200
+    assert svg.headers["content-type"] == "image/svg+xml"
+    assert "immutable" in svg.headers["cache-control"]
+    assert svg.text.startswith("<svg")
+
+    png = client.get(f"/api/sessions/{session_code}/qr.png?role=left_judge")
+    assert png.status_code == 200
+    assert png.content.startswith(b"\x89PNG")
+
+
+def test_qr_join_link_uses_allowed_origin_not_host_header(monkeypatch, session_code):
+    from iron_verdict.main import qr_cache
+    monkeypatch.setattr(settings, "ALLOWED_ORIGIN", "https://verdict.example")
+    for host in ("internal:8000", "attacker.example"):
+        response = client.get(f"/api/sessions/{session_code}/qr.svg", headers={"Host": host})
+        assert response.status_code == 200
+    assert list(qr_cache._entries[session_code]) == [(f"https://verdict.example/?session={session_code}", "svg")]
+
+
+def test_qr_with_wildcard_origin_is_neither_cached_nor_cacheable(monkeypatch, session_code):
+    from iron_verdict.main import qr_cache
+    monkeypatch.setattr(settings, "ALLOWED_ORIGIN", "*")
+    response = client.get(f"/api/sessions/{session_code}/qr.svg", headers={"Host": "attacker.example"})
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-store"
+    assert response.text.startswith("<svg")
+    assert session_code not in qr_cache
+
+
+def test_qr_endpoint_rejects_unknown_session_format_and_role(session_code):
+    assert client.get("/api/sessions/NOPE0000/qr.svg").status_code == 404
+    assert client.get(f"/api/sessions/{session_code}/qr.gif").status_code == 404
+    assert client.get(f"/api/sessions/{session_code}/qr.svg?role=admin").status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_qr_cache_evicted_when_session_ends(monkeypatch, session_code):
+    from iron_verdict.main import qr_cache
+    monkeypatch.setattr(settings, "ALLOWED_ORIGIN", "https://verdict.example")
+    client.get(f"/api/sessions/{session_code}/qr.svg")
+    assert session_code in qr_cache
+
+    async with httpx.AsyncClient(transport=ASGIWebSocketTransport(app=app), base_url="http://test") as ac:
+        async with httpx_ws.aconnect_ws("/ws", ac, headers={"origin": "https://verdict.example"}) as ws:
+            await ws.send_json({"type": "join", "session_code": session_code, "role": "center_judge"})
+            await ws.receive_json()
+            await ws.send_json({"type": "end_session_confirmed"})
+            try:
+                while True:
+                    await asyncio.wait_for(ws.receive_json(), timeout=1.0)
+            except Exception:
+                pass
+    assert session_code not in qr_cache
+
+
+@pytest.mark.asyncio
+async def test_expire_sessions_drops_per_session_state(monkeypatch, session_code):
+    from datetime import datetime, timedelta
+    monkeypatch.setattr(settings, "ALLOWED_ORIGIN", "https://verdict.example")
+    from unittest.mock import AsyncMock
+    from iron_verdict.main import connection_manager, expire_sessions, qr_cache, spectator_hub, timer_wheel
+    async with httpx.AsyncClient(transport=ASGIWebSocketTransport(app=app), base_url="http://test") as http:
+        await http.get(f"/api/sessions/{session_code}/qr.svg")
+        await http.get(f"/api/sessions/{session_code}/state")
+    timer_wheel.schedule(session_code, time.time() + 60)
+    watcher = AsyncMock()
+    await connection_manager.subscribe(watcher, [session_code, "OTHER1"])
+    session_manager.sessions[session_code]["last_activity"] = datetime.now() - timedelta(days=1)
+
+    try:
+        assert session_code in await expire_sessions()
+        assert session_code not in session_manager.sessions
+        assert session_code not in qr_cache
+        assert not timer_wheel.is_scheduled(session_code)
+        assert spectator_hub.version(session_code) == 0
+        assert session_code not in connection_manager._subscribers
+        assert connection_manager._subscriptions[watcher] == {"OTHER1"}
+    finally:
+        await connection_manager.unsubscribe(watcher)
+
+
+def test_service_worker_precaches_versioned_shell():
+    from iron_verdict.main import static_assets, DISPLAY_SHELL
+    response = client.get("/sw.js")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/javascript")
+    assert response.headers["cache-control"] == "no-cache"
+    body = response.text
+    assert f"const CACHE_NAME = 'iron-verdict-{settings.APP_VERSION}-" in body
+    precache = json.loads(body.split("const PRECACHE = ", 1)[1].split(";\n", 1)[0])
+    assert "/" in precache
+    assert DISPLAY_SHELL in precache
+    assert static_assets.url_for("/static/js/app.js") in precache
+    assert "__CACHE_NAME__" not in body and "__PRECACHE__" not in body
+
+
+def test_display_shell_url_is_servable():
+    from iron_verdict.main import DISPLAY_SHELL
+    assert client.get(DISPLAY_SHELL).status_code == 200
+
+
+def test_service_worker_cache_name_changes_with_version(monkeypatch):
+    from iron_verdict.main import render_service_worker
+    before = render_service_worker().digest
+    monkeypatch.setattr(settings, "APP_VERSION", "9.9.9")
+    assert render_service_worker().digest != before
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert "# TYPE iron_verdict_sessions_active gauge" in body
+    assert 'iron_verdict_connections{role="center_judge"}' in body
+    assert 'iron_verdict_messages_received_total{message_type="vote_lock"}' in body
+    assert "# TYPE iron_verdict_vote_to_results_seconds histogram" in body
+
+
+async def test_metrics_record_messages_and_vote_to_results(session_code):
+    from iron_verdict import metrics
+    results_before = metrics.VOTE_TO_RESULTS_SECONDS.count
+    votes_before = metrics.MESSAGES_RECEIVED.value("vote_lock")
+    invalid_before = metrics.MESSAGES_RECEIVED.value("invalid_json")
+
+    async with httpx.AsyncClient(transport=ASGIWebSocketTransport(app=app), base_url="http://test") as http:
+        async with httpx_ws.aconnect_ws("ws://test/ws", http) as left_ws, \
+                   httpx_ws.aconnect_ws("ws://test/ws", http) as center_ws, \
+                   httpx_ws.aconnect_ws("ws://test/ws", http) as right_ws:
+            for ws, role in ((left_ws, "left_judge"), (center_ws, "center_judge"), (right_ws, "right_judge")):
+                await ws.send_json({"type": "join", "session_code": session_code, "role": role})
+                await ws.receive_json()
+
+            scrape = (await http.get("/metrics")).text
+            assert 'iron_verdict_connections{role="left_judge"} 0' not in scrape
+
+            await left_ws.send_text("{not json")
+            for _ in range(5):
+                if (await asyncio.wait_for(left_ws.receive_json(), timeout=1.0))["type"] == "error":
+                    break
+            for ws in (left_ws, center_ws, right_ws):
+                await ws.send_json({"type": "vote_lock", "color": "white"})
+            for _ in range(5):
+                message = await asyncio.wait_for(center_ws.receive_json(), timeout=1.0)
+                if message["type"] == "show_results":
+                    break
+
+    assert metrics.MESSAGES_RECEIVED.value("vote_lock") == votes_before + 3
+    assert metrics.MESSAGES_RECEIVED.value("invalid_json") == invalid_before + 1
+    assert metrics.VOTE_TO_RESULTS_SECONDS.count == results_before + 1
+
+
+def test_health_details_include_event_loop_lag(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    assert client.get("/health").json() == {"status": "ok"}
+    body = client.get("/health?details=1", headers={"Authorization": "Bearer s3cret"}).json()
+    assert body["status"] == "ok"
+    assert {"lag_ms", "lag_max_ms", "slow_threshold_ms", "slow_callbacks"} <= set(body["event_loop"])
+
+
+def test_health_details_require_admin_token(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+    assert client.get("/health?details=1").status_code == 404
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    assert client.get("/health?details=1").status_code == 401
+    # The plain probe stays public
+    assert client.get("/health").json() == {"status": "ok"}
+
+
+async def test_judge_evicted_after_failed_send_is_marked_disconnected(session_code):
+    from iron_verdict.main import connection_manager
+    async with httpx.AsyncClient(transport=ASGIWebSocketTransport(app=app), base_url="http://test") as http:
+        async with httpx_ws.aconnect_ws("ws://test/ws", http) as left_ws:
+            await left_ws.send_json({"type": "join", "session_code": session_code, "role": "left_judge"})
+            await left_ws.receive_json()
+            server_ws = await connection_manager.get_connection(session_code, "left_judge")
+
+            async def broken(message):
+                raise RuntimeError("connection lost")
+
+            server_ws.send_json = broken
+            await connection_manager.broadcast_to_session(session_code, {"type": "judge_status_update"})
+            assert await connection_manager.get_connection(session_code, "left_judge") is None
+        await asyncio.sleep(0.05)
+
+    assert session_manager.sessions[session_code]["judges"]["left"]["connected"] is False
+    assert await connection_manager.pop_evicted(server_ws) is False
+
+
+async def test_judge_evicted_by_its_own_broadcast_is_marked_disconnected(session_code):
+    """The eviction closes the socket mid-handler; the next receive must still count as a disconnect."""
+    from iron_verdict.main import connection_manager
+    async with httpx.AsyncClient(transport=ASGIWebSocketTransport(app=app), base_url="http://test") as http:
+        async with httpx_ws.aconnect_ws("ws://test/ws", http) as left_ws, \
+                   httpx_ws.aconnect_ws("ws://test/ws", http) as center_ws:
+            for ws, role in ((left_ws, "left_judge"), (center_ws, "center_judge")):
+                await ws.send_json({"type": "join", "session_code": session_code, "role": role})
+                assert (await ws.receive_json())["type"] == "join_success"
+            assert (await left_ws.receive_json())["connected"] is True
+            server_ws = await connection_manager.get_connection(session_code, "center_judge")
+
+            async def broken(message):
+                raise RuntimeError("connection lost")
+
+            server_ws.send_json = broken
+            await center_ws.send_json({"type": "settings_update", "showExplanations": True, "liftType": "bench"})
+
+            assert (await asyncio.wait_for(left_ws.receive_json(), 1.0))["type"] == "settings_update"
+            status = await asyncio.wait_for(left_ws.receive_json(), 1.0)
+            assert status == {"type": "judge_status_update", "position": "center", "connected": False}
+
+    assert session_manager.sessions[session_code]["judges"]["center"]["connected"] is False
+
+
+def test_debug_traces_requires_admin_token(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+    assert client.get("/debug/traces").status_code == 404
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    assert client.get("/debug/traces").status_code == 401
+    assert client.get("/debug/traces", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/debug/traces", headers={"Authorization": "Bearer s3cret"}).status_code == 200
+
+
+async def test_verdict_is_traced_end_to_end(monkeypatch, session_code):
+    from iron_verdict import tracing
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    monkeypatch.setattr(tracing.tracer, "enabled", True)
+    async with httpx.AsyncClient(transport=ASGIWebSocketTransport(app=app), base_url="http://test") as http:
+        async with httpx_ws.aconnect_ws("ws://test/ws", http) as left_ws, \
+                   httpx_ws.aconnect_ws("ws://test/ws", http) as center_ws, \
+                   httpx_ws.aconnect_ws("ws://test/ws", http) as right_ws, \
+                   httpx_ws.aconnect_ws("ws://test/ws", http) as display_ws:
+            for ws, role in ((left_ws, "left_judge"), (center_ws, "center_judge"),
+                             (right_ws, "right_judge"), (display_ws, "display")):
+                await ws.send_json({"type": "join", "session_code": session_code, "role": role})
+                await ws.receive_json()
+            for ws in (left_ws, center_ws, right_ws):
+                await ws.send_json({"type": "vote_lock", "color": "white"})
+            for _ in range(10):
+                message = await asyncio.wait_for(display_ws.receive_json(), timeout=1.0)
+                if message["type"] == "show_results":
+                    break
+
+        response = await http.get("/debug/traces?limit=3", headers={"Authorization": "Bearer s3cret"})
+
+    traces = [t for t in response.json()["traces"] if t["spans"][0]["attributes"]["session_code"] == session_code]
+    assert len(traces) == 3
+    deciding = next(t for t in traces if t["spans"][0]["attributes"]["all_locked"])
+    names = [span["name"] for span in deciding["spans"]]
+    assert "session.lock_vote" in names
+    delivers = [s["attributes"]["message_type"] for s in deciding["spans"] if s["name"] == "deliver"]
+    assert "judge_voted" in delivers and "show_results" in delivers
+    # show_results went to three judges and the display
+    assert sum(1 for s in deciding["spans"] if s["name"] == "ws.send" and s["attributes"]["message_type"] == "show_results") == 4
+
+
+async def test_debug_profile_returns_collapsed_stacks_and_pstats(monkeypatch, tmp_path):
+    import pstats
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    auth = {"Authorization": "Bearer s3cret"}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+        assert (await http.get("/debug/profile?seconds=0.1")).status_code == 401
+        assert (await http.get("/debug/profile?seconds=120", headers=auth)).status_code == 422
+
+        response = await http.get("/debug/profile?seconds=0.1&interval_ms=2", headers=auth)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        lines = response.text.splitlines()
+        assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        assert any("base_events.py:run_forever" in line for line in lines)
+
+        response = await http.get("/debug/profile?seconds=0.05&format=pstats", headers=auth)
+        assert response.status_code == 200
+        path = tmp_path / "loop.pstats"
+        path.write_bytes(response.content)
+        assert pstats.Stats(str(path)).total_calls > 0
+
+
+async def test_debug_profile_runs_one_at_a_time(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "s3cret")
+    auth = {"Authorization": "Bearer s3cret"}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+        first = asyncio.create_task(http.get("/debug/profile?seconds=0.3", headers=auth))
+        await asyncio.sleep(0.1)
+        assert (await http.get("/debug/profile?seconds=0.1", headers=auth)).status_code == 409
+        assert (await first).status_code == 200
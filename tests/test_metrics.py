@@ -0,0 +1,81 @@
+import pytest
+from iron_verdict.metrics import Counter, Gauge, Histogram, Registry, message_type_label
+
+
+def test_counter_renders_preseeded_label_values():
+    counter = Counter("msgs_total", "Messages", label="message_type", values=("join", "pong"))
+    counter.inc("join")
+    counter.inc("join")
+    lines = counter.collect()
+    assert lines[:2] == ["# HELP msgs_total Messages", "# TYPE msgs_total counter"]
+    assert 'msgs_total{message_type="join"} 2' in lines
+    assert 'msgs_total{message_type="pong"} 0' in lines
+
+
+def test_unlabelled_counter():
+    counter = Counter("closes_total", "Closes")
+    assert counter.collect()[-1] == "closes_total 0"
+    counter.inc()
+    assert counter.value() == 1
+
+
+def test_label_values_are_escaped():
+    counter = Counter("x_total", "X", label="event")
+    counter.inc('a"b\\c')
+    assert 'x_total{event="a\\"b\\\\c"} 1' in counter.collect()
+
+
+def test_histogram_buckets_are_cumulative():
+    hist = Histogram("lat_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        hist.observe(value)
+    lines = hist.collect()
+    assert 'lat_seconds_bucket{le="0.1"} 2' in lines
+    assert 'lat_seconds_bucket{le="1.0"} 3' in lines
+    assert 'lat_seconds_bucket{le="+Inf"} 4' in lines
+    assert "lat_seconds_count 4" in lines
+    assert "lat_seconds_sum 3.65" in lines
+
+
+def test_histogram_time_observes_even_on_error():
+    hist = Histogram("op_seconds", "Op")
+    with pytest.raises(RuntimeError):
+        with hist.time():
+            raise RuntimeError
+    assert hist.count == 1
+
+
+def test_labelled_histogram_keeps_a_series_per_value():
+    hist = Histogram("rtt_seconds", "RTT", buckets=(0.1,), label="role", values=("display", "left_judge"))
+    hist.observe(0.05, "display")
+    hist.observe(0.5, "display")
+    lines = hist.collect()
+    assert 'rtt_seconds_bucket{role="display",le="0.1"} 1' in lines
+    assert 'rtt_seconds_count{role="display"} 2' in lines
+    assert 'rtt_seconds_count{role="left_judge"} 0' in lines
+    assert hist.count == 2
+
+
+def test_gauge_reads_callback_at_scrape():
+    state = {"n": 1}
+    gauge = Gauge("n", "N", lambda: state["n"])
+    state["n"] = 5
+    assert gauge.collect()[-1] == "n 5"
+    labelled = Gauge("conns", "Conns", lambda: {"b": 2, "a": 1}, label="role")
+    assert labelled.collect()[2:] == ['conns{role="a"} 1', 'conns{role="b"} 2']
+
+
+def test_registry_render_and_unregister():
+    registry = Registry()
+    registry.register(Counter("a_total", "A"))
+    registry.register(Counter("b_total", "B"))
+    registry.unregister("a_total")
+    body = registry.render().decode()
+    assert "a_total" not in body
+    assert body.endswith("b_total 0\n")
+
+
+def test_unknown_message_types_share_one_label():
+    assert message_type_label("vote_lock") == "vote_lock"
+    assert message_type_label("anything-else") == "other"
+    assert message_type_label(None) == "other"
@@ -0,0 +1,48 @@
+import marshal
+import pstats
+import threading
+import time
+from iron_verdict import profiler
+
+
+def busy_work(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sample_collects_collapsed_stacks_of_another_thread():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_work, args=(stop,))
+    worker.start()
+    try:
+        counts = profiler.sample(worker.ident, seconds=0.1, interval=0.002)
+    finally:
+        stop.set()
+        worker.join()
+    assert sum(counts.values()) > 5
+    heaviest = profiler.collapsed(counts).splitlines()[0]
+    stack, n = heaviest.rsplit(" ", 1)
+    assert "test_profiler.py:busy_work" in stack.split(";")
+    assert stack.split(";")[0].startswith("threading.py:")
+    assert int(n) > 0
+
+
+def test_sample_stops_when_thread_is_gone():
+    assert profiler.sample(-1, seconds=5) == {}
+
+
+def test_profile_session_produces_loadable_pstats(tmp_path):
+    with profiler.ProfileSession() as session:
+        sum(range(10000))
+    path = tmp_path / "out.pstats"
+    path.write_bytes(session.pstats_bytes())
+    assert pstats.Stats(str(path)).total_calls > 0
+
+
+def test_startup_profile_is_written_once(tmp_path):
+    path = tmp_path / "startup.pstats"
+    profiler.start_startup_profile()
+    time.sleep(0.001)
+    assert profiler.finish_startup_profile(str(path)) is True
+    assert pstats.Stats(str(path)).total_calls > 0
+    assert profiler.finish_startup_profile(str(path)) is False
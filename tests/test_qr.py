@@ -0,0 +1,39 @@
+from iron_verdict.qr import QrCache, render_qr, render_uncached
+
+
+def test_render_svg_scales_with_viewbox():
+    svg = render_qr("http://test/?session=ABCD1234", "svg").decode()
+    assert svg.startswith("<svg")
+    assert "viewBox" in svg
+    assert "width=" not in svg.split(">", 1)[0]
+
+
+def test_render_png_signature():
+    assert render_qr("http://test/?session=ABCD1234", "png").startswith(b"\x89PNG")
+
+
+async def test_cache_renders_once_per_variant():
+    cache = QrCache()
+    first = await cache.get("ABCD1234", "http://test/?session=ABCD1234", "svg")
+    assert await cache.get("ABCD1234", "http://test/?session=ABCD1234", "svg") is first
+    assert await cache.get("ABCD1234", "http://test/?session=ABCD1234", "png") is not first
+
+
+async def test_evict_drops_session_entries():
+    cache = QrCache()
+    await cache.get("ABCD1234", "http://test/?session=ABCD1234", "svg")
+    cache.evict("ABCD1234")
+    assert "ABCD1234" not in cache
+
+
+async def test_variants_per_session_are_bounded():
+    cache = QrCache(max_variants_per_session=2)
+    for host in ("a", "b", "c"):
+        await cache.get("ABCD1234", f"http://{host}/?session=ABCD1234", "svg")
+    assert len(cache._entries["ABCD1234"]) == 2
+    assert ("http://a/?session=ABCD1234", "svg") not in cache._entries["ABCD1234"]
+
+
+async def test_render_uncached_is_not_cacheable():
+    asset = await render_uncached("http://test/?session=ABCD1234", "svg")
+    assert asset.cache_control == "no-store"
@@ -0,0 +1,91 @@
+import json
+import queue
+import threading
+import httpx
+import httpx_ws
+import pytest
+from httpx_ws.transport import ASGIWebSocketTransport
+from iron_verdict import main
+from iron_verdict import recorder as recorder_module
+from iron_verdict.recorder import EVENTS_DROPPED, FORMAT_VERSION, Recorder
+
+
+def read(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_writes_header_and_compact_events(tmp_path):
+    path = tmp_path / "meet.jsonl"
+    recorder = Recorder(str(path))
+    recorder.ws_open("c1", "https://example.org")
+    recorder.ws_message("c1", '{"type":"join"}')
+    recorder.ws_close("c1")
+    recorder.stop()
+
+    header, *events = read(path)
+    assert header["format"] == "iron-verdict-recording"
+    assert header["version"] == FORMAT_VERSION
+    assert [event[1:] for event in events] == [
+        ["open", "c1", "https://example.org"],
+        ["msg", "c1", '{"type":"join"}'],
+        ["close", "c1"],
+    ]
+    assert events[0][0] <= events[1][0] <= events[2][0]
+    assert b", " not in path.read_bytes().splitlines()[1]
+
+
+def test_stop_gives_up_on_a_stuck_writer(monkeypatch):
+    monkeypatch.setattr(recorder_module, "STOP_TIMEOUT", 0.01)
+    recorder = Recorder()
+    recorder.enabled = True
+    # A writer that never drains its full queue, as on a hung disk
+    recorder._queue = queue.Queue(maxsize=2)
+    recorder._queue.put(["event"])
+    recorder._queue.put(["event"])
+    recorder._thread = threading.Thread(target=lambda: None)
+    dropped = EVENTS_DROPPED.value()
+
+    recorder.stop()
+
+    assert not recorder.enabled
+    assert EVENTS_DROPPED.value() == dropped + 2
+
+
+def test_disabled_recorder_writes_nothing(tmp_path):
+    recorder = Recorder()
+    recorder.ws_message("c1", "{}")
+    recorder.stop()
+    assert not recorder.enabled
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.fixture
+def recording(tmp_path, monkeypatch):
+    monkeypatch.setattr(main.limiter, "enabled", False)
+    path = tmp_path / "meet.jsonl"
+    main.recorder.start(str(path))
+    yield path
+    main.recorder.stop()
+
+
+async def test_app_records_http_calls_and_websocket_traffic(recording):
+    async with httpx.AsyncClient(transport=ASGIWebSocketTransport(app=main.app), base_url="http://test") as ac:
+        created = await ac.post("/api/sessions", json={"name": "Recorded"})
+        code = created.json()["session_code"]
+        async with httpx_ws.aconnect_ws("/ws", ac) as ws:
+            await ws.send_json({"type": "join", "session_code": code, "role": "left_judge"})
+            await ws.receive_json()
+    main.recorder.stop()
+    main.session_manager.delete_session(code)
+
+    _, *events = read(recording)
+    kinds = [event[1] for event in events]
+    assert kinds == ["http", "open", "msg", "close"]
+    http = events[0]
+    assert http[2:5] == ["POST", "/api/sessions", ""]
+    assert json.loads(http[5]) == {"name": "Recorded"}
+    assert http[6] == 200
+    assert http[7] == code
+    assert events[1][2] == events[2][2] == events[3][2]
+    assert json.loads(events[2][3])["session_code"] == code
@@ -0,0 +1,98 @@
+import json
+from contextlib import AsyncExitStack
+import httpx
+import httpx_ws
+import pytest
+from httpx_ws.transport import ASGIWebSocketTransport
+from iron_verdict import main
+from iron_verdict.replay import Replay, _Socket, load, replay
+
+JUDGES = ("left_judge", "center_judge", "right_judge")
+
+
+async def record_meet(path):
+    """Record one lift: three judges and a display join, the judges vote, then everyone leaves."""
+    main.recorder.start(str(path))
+    try:
+        async with httpx.AsyncClient(transport=ASGIWebSocketTransport(app=main.app), base_url="http://test") as ac:
+            code = (await ac.post("/api/sessions", json={"name": "Recorded"})).json()["session_code"]
+            await ac.get(f"/api/sessions/{code}/state")
+            async with AsyncExitStack() as stack:
+                display = await stack.enter_async_context(httpx_ws.aconnect_ws("/ws", ac))
+                await display.send_json({"type": "join", "session_code": code, "role": "display"})
+                await display.receive_json()
+                judges = []
+                for role in JUDGES:
+                    ws = await stack.enter_async_context(httpx_ws.aconnect_ws("/ws", ac))
+                    await ws.send_json({"type": "join", "session_code": code, "role": role})
+                    await ws.receive_json()
+                    judges.append(ws)
+                for ws, color in zip(judges, ("white", "white", "red")):
+                    await ws.send_json({"type": "vote_lock", "color": color})
+                while (await display.receive_json())["type"] != "show_results":
+                    pass
+    finally:
+        main.recorder.stop()
+    main.session_manager.delete_session(code)
+    return code
+
+
+@pytest.fixture
+def meet(tmp_path, monkeypatch):
+    monkeypatch.setattr(main.limiter, "enabled", False)
+    return tmp_path / "meet.jsonl"
+
+
+async def test_replay_reproduces_the_meet_under_new_codes(meet):
+    recorded_code = await record_meet(meet)
+    events = load(str(meet))
+
+    run = Replay(main.app, events)
+    report = await run.run()
+
+    assert report["errors"] == []
+    assert report["events"] == len(events)
+    assert report["messages"]["vote_lock"]["count"] == 3
+    assert report["messages"]["join"]["count"] == 4
+    assert report["http"]["POST /api/sessions"]["count"] == 1
+    assert "GET /api/sessions/{code}/state" in report["http"]
+
+    new_code = run.codes[recorded_code]
+    assert new_code != recorded_code
+    session = main.session_manager.sessions.pop(new_code)
+    assert session["phase"] == "results"
+    assert [judge["current_vote"] for judge in session["judges"].values()] == ["white", "white", "red"]
+
+
+async def test_replay_in_real_time_follows_recorded_timing(meet):
+    events = [
+        [0.0, "open", "c1", ""],
+        [0.1, "msg", "c1", json.dumps({"type": "join", "session_code": "NOPE0000", "role": "display"})],
+        [80.0, "close", "c1"],
+    ]
+    report = await replay(main.app, events, speed=1)
+    assert report["elapsed_s"] >= 0.08
+    assert report["messages"]["join"]["count"] == 1
+
+
+def test_reconnect_tokens_and_codes_are_mapped_to_this_run():
+    run = Replay(app=None, events=[])
+    run.codes["OLD12345"] = "NEW67890"
+    socket = _Socket(run, origin="")
+    text, message_type = run.inbound(socket, json.dumps(
+        {"type": "join", "session_code": "old12345", "role": "left_judge", "reconnect_token": "recorded"}
+    ))
+    # No token handed out in this run yet: the recorded one is passed through
+    assert json.loads(text)["reconnect_token"] == "recorded"
+    assert json.loads(text)["session_code"] == "NEW67890"
+    assert message_type == "join"
+
+    run.outbound(socket, json.dumps({"type": "join_success", "reconnect_token": "fresh"}))
+    text, _ = run.inbound(socket, json.dumps(
+        {"type": "join", "session_code": "OLD12345", "role": "left_judge", "reconnect_token": "recorded"}
+    ))
+    assert json.loads(text)["reconnect_token"] == "fresh"
+
+    assert run._map_path("/api/sessions/OLD12345/qr.svg") == (
+        "/api/sessions/NEW67890/qr.svg", "/api/sessions/{code}/qr.svg"
+    )
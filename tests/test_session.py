@@ -441,3 +441,48 @@ async def test_disconnected_judge_without_vote_blocks_results():
 
     assert result["all_locked"] is False
     assert manager.sessions[code]["state"] != "showing_results"
+
+
+@pytest.mark.asyncio
+async def test_running_timers_excludes_idle_and_frozen_sessions():
+    manager = SessionManager()
+    running = await manager.create_session("Running")
+    idle = await manager.create_session("Idle")
+    manager.sessions[running]["timer_started_at"] = 1000.0
+
+    assert manager.running_timers() == {running: 1060.0}
+    assert manager.timer_deadline(running) == 1060.0
+    assert manager.timer_deadline(idle) is None
+
+
+@pytest.mark.asyncio
+async def test_start_timer_and_time_remaining_follow_injected_clock():
+    now = [1000.0]
+    manager = SessionManager(clock=lambda: now[0])
+    code = await manager.create_session("Test")
+
+    assert manager.time_remaining_ms(code) is None
+    assert manager.start_timer(code) == 1060.0
+    now[0] = 1025.0
+    assert manager.time_remaining_ms(code) == 35000
+    now[0] = 1075.0
+    assert manager.time_remaining_ms(code) == 0
+
+
+@pytest.mark.asyncio
+async def test_public_state_hides_votes_until_results():
+    manager = SessionManager()
+    code = await manager.create_session("Public")
+    await manager.lock_vote(code, "left", "red", reason="reasons.squat.red.depth")
+
+    state = manager.public_state(code)
+    assert state["judges"]["left"] == {"connected": False, "locked": True, "vote": None, "reason": None}
+    assert "reconnect_token" not in str(state)
+
+    await manager.lock_vote(code, "center", "white")
+    await manager.lock_vote(code, "right", "white")
+    state = manager.public_state(code)
+    assert state["phase"] == "results"
+    assert state["judges"]["left"]["vote"] == "red"
+    assert state["judges"]["left"]["reason"] == "reasons.squat.red.depth"
+    assert manager.public_state("MISSING") is None
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import pytest
+from iron_verdict.spectator import SpectatorHub, KEEPALIVE_FRAME
+
+
+def parse(frame: bytes) -> dict:
+    fields = dict(line.split(": ", 1) for line in frame.decode().strip().split("\n"))
+    return {"id": int(fields["id"]), "event": fields["event"], "data": json.loads(fields["data"])}
+
+
+async def take(stream, n):
+    return [parse(await asyncio.wait_for(stream.__anext__(), timeout=1.0)) for _ in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_publish_without_spectators_only_bumps_version():
+    hub = SpectatorHub()
+    assert hub.publish("ABC", {"type": "judge_voted"}) == 1
+    assert hub.publish("ABC", {"type": "show_results"}) == 2
+    assert hub.version("ABC") == 2
+    assert hub._buffers == {}
+
+
+@pytest.mark.asyncio
+async def test_stream_starts_with_state_then_follows_events():
+    hub = SpectatorHub()
+    hub.publish("ABC", {"type": "timer_start"})
+    stream = hub.stream("ABC", snapshot=lambda: {"phase": "voting"}, is_alive=lambda: True)
+
+    [state] = await take(stream, 1)
+    assert state == {"id": 1, "event": "state", "data": {"phase": "voting"}}
+
+    hub.publish("ABC", {"type": "judge_voted", "position": "left"})
+    [event] = await take(stream, 1)
+    assert event == {"id": 2, "event": "judge_voted", "data": {"type": "judge_voted", "position": "left"}}
+    await stream.aclose()
+    assert hub.subscriber_count("ABC") == 0
+
+
+@pytest.mark.asyncio
+async def test_many_spectators_share_one_encoded_frame():
+    hub = SpectatorHub()
+    streams = [hub.stream("ABC", snapshot=lambda: {}, is_alive=lambda: True) for _ in range(100)]
+    for stream in streams:
+        await stream.__anext__()  # state
+    assert hub.subscriber_count("ABC") == 100
+
+    hub.publish("ABC", {"type": "show_results"})
+    frames = [await asyncio.wait_for(stream.__anext__(), timeout=1.0) for stream in streams]
+    assert all(frame is frames[0] for frame in frames)
+    for stream in streams:
+        await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_lagging_spectator_gets_fresh_state():
+    hub = SpectatorHub(buffer_size=2)
+    stream = hub.stream("ABC", snapshot=lambda: {"phase": "results"}, is_alive=lambda: True)
+    await stream.__anext__()
+    for i in range(5):
+        hub.publish("ABC", {"type": "judge_voted", "n": i})
+
+    [event] = await take(stream, 1)
+    assert event == {"id": 5, "event": "state", "data": {"phase": "results"}}
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_resume_from_last_event_id():
+    hub = SpectatorHub()
+    first = hub.stream("ABC", snapshot=lambda: {}, is_alive=lambda: True)
+    await first.__anext__()  # keeps the ring alive
+    hub.publish("ABC", {"type": "a"})
+    hub.publish("ABC", {"type": "b"})
+
+    resumed = hub.stream("ABC", snapshot=lambda: {}, is_alive=lambda: True, last_event_id=1)
+    [event] = await take(resumed, 1)
+    assert (event["id"], event["event"]) == (2, "b")
+    await first.aclose()
+    await resumed.aclose()
+
+
+@pytest.mark.asyncio
+async def test_close_drains_then_ends_stream():
+    hub = SpectatorHub()
+    stream = hub.stream("ABC", snapshot=lambda: {}, is_alive=lambda: True)
+    await stream.__anext__()
+    hub.publish("ABC", {"type": "session_ended"})
+    hub.close("ABC")
+
+    [event] = await take(stream, 1)
+    assert event["event"] == "session_ended"
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+    assert hub.version("ABC") == 0
+
+
+@pytest.mark.asyncio
+async def test_idle_stream_sends_keepalive_and_stops_when_session_gone():
+    hub = SpectatorHub()
+    alive = {"value": True}
+    stream = hub.stream("ABC", snapshot=lambda: {}, is_alive=lambda: alive["value"], keepalive_seconds=0.01)
+    await stream.__anext__()
+    assert await stream.__anext__() == KEEPALIVE_FRAME
+
+    alive["value"] = False
+    with pytest.raises(StopAsyncIteration):
+        await asyncio.wait_for(stream.__anext__(), timeout=1.0)
+
+
+def test_render_encodes_once_per_version():
+    hub = SpectatorHub()
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {"phase": "voting"}
+
+    assert hub.render("ABC", "state", build) == (0, b'{"phase":"voting"}')
+    hub.render("ABC", "state", build)
+    assert len(calls) == 1
+
+    hub.publish("ABC", {"type": "timer_start"})
+    assert hub.render("ABC", "state", build)[0] == 1
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_wait_for_version_wakes_on_close():
+    hub = SpectatorHub()
+    waiter = asyncio.create_task(hub.wait_for_version("ABC", 5, timeout=5))
+    await asyncio.sleep(0.01)
+    hub.close("ABC")
+    assert await asyncio.wait_for(waiter, timeout=1.0) == 0
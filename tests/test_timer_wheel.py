@@ -0,0 +1,187 @@
+import asyncio
+import sys
+import time
+import pytest
+from iron_verdict.timer_wheel import TimerWheel
+
+
+class FakeClock:
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_wheel(clock, tick_interval=0):
+    events = []
+
+    async def on_expire(code):
+        events.append(("expired", code))
+
+    async def on_tick(code, remaining_ms):
+        events.append(("tick", code, remaining_ms))
+
+    wheel = TimerWheel(on_expire, on_tick, tick_interval=tick_interval, clock=clock)
+    return wheel, events
+
+
+@pytest.mark.asyncio
+async def test_expiry_fires_once_after_deadline():
+    clock = FakeClock()
+    wheel, events = make_wheel(clock)
+    wheel.schedule("ABC", clock.now + 60)
+
+    clock.now += 59.9
+    await wheel.advance()
+    assert events == []
+
+    clock.now += 0.2
+    await wheel.advance()
+    assert events == [("expired", "ABC")]
+    assert not wheel.is_scheduled("ABC")
+
+    clock.now += 60
+    await wheel.advance()
+    assert events == [("expired", "ABC")]
+
+
+@pytest.mark.asyncio
+async def test_cancel_prevents_expiry():
+    clock = FakeClock()
+    wheel, events = make_wheel(clock)
+    wheel.schedule("ABC", clock.now + 60)
+    wheel.cancel("ABC")
+
+    clock.now += 61
+    await wheel.advance()
+    assert events == []
+    assert len(wheel) == 0
+
+
+@pytest.mark.asyncio
+async def test_reschedule_replaces_previous_deadline():
+    clock = FakeClock()
+    wheel, events = make_wheel(clock)
+    wheel.schedule("ABC", clock.now + 60)
+    clock.now += 30
+    await wheel.advance()
+    wheel.schedule("ABC", clock.now + 60)
+
+    clock.now += 31
+    await wheel.advance()
+    assert events == []
+
+    clock.now += 30
+    await wheel.advance()
+    assert events == [("expired", "ABC")]
+
+
+@pytest.mark.asyncio
+async def test_ticks_fire_on_whole_intervals_before_expiry():
+    clock = FakeClock()
+    wheel, events = make_wheel(clock, tick_interval=10)
+    wheel.schedule("ABC", clock.now + 60)
+
+    for _ in range(61):
+        clock.now += 1
+        await wheel.advance()
+
+    assert events == [
+        ("tick", "ABC", 50000),
+        ("tick", "ABC", 40000),
+        ("tick", "ABC", 30000),
+        ("tick", "ABC", 20000),
+        ("tick", "ABC", 10000),
+        ("expired", "ABC"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_past_deadline_expires_on_next_advance():
+    """A clock restored from a snapshot after its deadline expires immediately."""
+    clock = FakeClock()
+    wheel, events = make_wheel(clock)
+    wheel.schedule("ABC", clock.now - 5)
+    await wheel.advance()
+    assert events == [("expired", "ABC")]
+
+
+@pytest.mark.asyncio
+async def test_deadline_beyond_one_revolution_waits_full_duration():
+    clock = FakeClock()
+    events = []
+
+    async def on_expire(code):
+        events.append(code)
+
+    wheel = TimerWheel(on_expire, resolution=0.1, slots=8, clock=clock)
+    wheel.schedule("ABC", clock.now + 5)
+
+    for _ in range(49):
+        clock.now += 0.1
+        await wheel.advance()
+    assert events == []
+
+    clock.now += 0.2
+    await wheel.advance()
+    assert events == ["ABC"]
+
+
+@pytest.mark.asyncio
+async def test_run_drives_many_sessions_from_one_task():
+    events = []
+
+    async def on_expire(code):
+        events.append(code)
+
+    wheel = TimerWheel(on_expire, resolution=0.01)
+    task = asyncio.create_task(wheel.run())
+    try:
+        for i in range(50):
+            wheel.schedule(f"S{i}", time.time() + 0.05)
+        await asyncio.sleep(0.2)
+    finally:
+        task.cancel()
+    assert sorted(events) == sorted(f"S{i}" for i in range(50))
+
+
+@pytest.mark.parametrize("started", ["before", "after"])
+@pytest.mark.asyncio
+async def test_run_fires_past_due_deadline_promptly(started):
+    """A clock restored from a snapshot after its deadline must fire at once, not a revolution later."""
+    events = []
+
+    async def on_expire(code):
+        events.append(code)
+
+    wheel = TimerWheel(on_expire, resolution=0.1)
+    task = None
+    if started == "after":
+        task = asyncio.create_task(wheel.run())
+        await asyncio.sleep(0)  # let it go idle first
+    wheel.schedule("PAST", time.time() - 5)
+    wheel.schedule("NOW", time.time())
+    if task is None:
+        task = asyncio.create_task(wheel.run())
+    try:
+        await asyncio.sleep(0.3)
+    finally:
+        task.cancel()
+    assert sorted(events) == ["NOW", "PAST"]
+
+
+@pytest.mark.asyncio
+async def test_emptied_slots_do_not_keep_their_tables():
+    clock = FakeClock()
+    wheel, events = make_wheel(clock)
+    await wheel.advance()
+    for i in range(200):
+        wheel.schedule(f"S{i}", clock.now + i * 0.1 + 1)
+    for i in range(100):
+        wheel.cancel(f"S{i}")
+    clock.now += 30
+    await wheel.advance()
+
+    assert len(events) == 100
+    assert all(slot == {} and sys.getsizeof(slot) == sys.getsizeof({}) for slot in wheel._slots)
@@ -0,0 +1,90 @@
+import asyncio
+import json
+import time
+import pytest
+from iron_verdict.tracing import NOOP, Tracer
+
+
+def test_disabled_tracer_returns_noop():
+    tracer = Tracer(enabled=False)
+    assert tracer.trace("root") is NOOP
+    assert tracer.span("child") is NOOP
+
+
+def test_span_outside_a_trace_is_noop():
+    tracer = Tracer(enabled=True)
+    assert tracer.span("child") is NOOP
+
+
+async def test_children_across_awaits_and_tasks_join_the_trace():
+    tracer = Tracer(enabled=True)
+
+    async def send(n):
+        with tracer.span("ws.send", n=n):
+            await asyncio.sleep(0)
+
+    with tracer.trace("vote_lock", session_code="ABC") as root:
+        with tracer.span("session.lock_vote"):
+            await asyncio.sleep(0)
+        await asyncio.gather(send(1), send(2))
+        root.set("all_locked", True)
+
+    [trace] = tracer.recent()
+    assert trace["name"] == "vote_lock"
+    names = [span["name"] for span in trace["spans"]]
+    assert names[0] == "vote_lock"
+    assert sorted(names[1:]) == ["session.lock_vote", "ws.send", "ws.send"]
+    root_span = trace["spans"][0]
+    assert root_span["attributes"] == {"session_code": "ABC", "all_locked": True}
+    assert all(span["parent_id"] == root_span["span_id"] for span in trace["spans"][1:])
+
+
+def test_root_can_be_backdated_to_receive_time():
+    tracer = Tracer(enabled=True)
+    received = time.perf_counter() - 0.05
+    with tracer.trace("vote_lock", started_at=received):
+        pass
+    assert tracer.recent()[0]["duration_ms"] >= 50
+
+
+def test_errors_are_recorded_and_ring_buffer_is_bounded():
+    tracer = Tracer(enabled=True, capacity=2)
+    for n in range(3):
+        with tracer.trace(f"t{n}"):
+            pass
+    with pytest.raises(ValueError):
+        with tracer.trace("failing"):
+            raise ValueError
+    traces = tracer.recent()
+    assert [t["name"] for t in traces] == ["failing", "t2"]
+    assert traces[0]["spans"][0]["attributes"]["error"] == "ValueError"
+
+
+def test_otlp_export_shape():
+    tracer = Tracer(enabled=True)
+    with tracer.trace("vote_lock", targets=3):
+        with tracer.span("deliver"):
+            pass
+    [resource] = tracer.to_otlp()["resourceSpans"]
+    spans = resource["scopeSpans"][0]["spans"]
+    assert len(spans) == 2
+    root = next(s for s in spans if s["name"] == "vote_lock")
+    child = next(s for s in spans if s["name"] == "deliver")
+    assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+    assert "parentSpanId" not in root
+    assert child["parentSpanId"] == root["spanId"]
+    assert root["attributes"] == [{"key": "targets", "value": {"intValue": "3"}}]
+    assert int(root["endTimeUnixNano"]) >= int(root["startTimeUnixNano"])
+
+
+def test_export_file_gets_one_request_per_trace(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(enabled=True, export_path=str(path))
+    with tracer.trace("vote_lock"):
+        pass
+    for _ in range(100):
+        if path.exists() and path.read_text():
+            break
+        time.sleep(0.01)
+    [line] = path.read_text().splitlines()
+    assert json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"][0]["name"] == "vote_lock"
@@ -0,0 +1,24 @@
+from iron_verdict import vendor
+
+
+def test_sri_matches_browser_format():
+    # echo -n "abc" | openssl dgst -sha384 -binary | openssl base64 -A
+    assert vendor.sri(b"abc") == "sha384-ywB1P0WjXou1oD1pmsZQBycsMqsO3tFjGotgWkP/W+2AhgcroefMI1i67KE0yCWn"
+
+
+def test_missing_files_reports_absent_and_corrupt(tmp_path):
+    assert set(vendor.missing_files(str(tmp_path))) == {
+        "alpinejs-3.14.1.min.js",
+        "fonts.css",
+    }
+    (tmp_path / "alpinejs-3.14.1.min.js").write_text("tampered")
+    (tmp_path / "fonts.css").write_text("")
+    assert set(vendor.missing_files(str(tmp_path))) == {"alpinejs-3.14.1.min.js"}
+
+
+def test_local_urls_cover_every_cdn_reference_in_index():
+    from iron_verdict.main import static_dir
+    with open(f"{static_dir}/index.html", encoding="utf-8") as f:
+        html = f.read()
+    for url in vendor.local_urls():
+        assert url in html